@@ -14,6 +14,7 @@ try:
     from .reqif_parser import ReqIFParser
     from .reqif_comparator import ReqIFComparator
     from .folder_comparator import FolderComparator
+    from .reqif_writer import ReqIFWriter
     from .comparison_gui import ComparisonResultsGUI
     from .folder_comparison_gui import FolderComparisonResultsGUI
     from .visualizer_gui import VisualizerGUI
@@ -50,6 +51,7 @@ __all__ = [
     'ReqIFParser',
     'ReqIFComparator', 
     'FolderComparator',
+    'ReqIFWriter',
     'ReqIFToolNative',
     
     # GUI components
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Comparator Benchmark
+Times ReqIFComparator.compare_requirements on a synthetic baseline pair
+(default: 200k requirements, 2% content changes).
+
+Usage:
+    python benchmarks/bench_comparator.py [count] [change_fraction]
+    python benchmarks/bench_comparator.py --memory [count]
+    python benchmarks/bench_comparator.py --partitioned [count] [processes]
+    python benchmarks/bench_comparator.py --streaming [count] [budget_mb]
+    python benchmarks/bench_comparator.py --stats-only [count] [change_fraction]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reqif_comparator import ReqIFComparator
+from partitioned_comparator import PartitionedComparator
+from streaming_comparator import StreamingComparator
+
+
+WORDS = ("shall system signal brake sensor value limit time speed user data "
+         "monitor report fault state mode request response interface").split()
+
+
+def make_requirement(index: int, rng: random.Random) -> dict:
+    """Build a requirement dict shaped like ReqIFParser output"""
+    text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(12, 40)))
+    priority = rng.randint(1, 5)
+    modified = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randint(0, 5000))
+    return {
+        'id': f"_SO-{index:07d}",
+        'attributes': {
+            'ReqID': f"REQ-{index}",
+            'Object Text': text,
+            'Status': rng.choice(('Draft', 'Approved', 'Released')),
+            'Priority': str(priority),
+            'LastModifiedOn': modified.isoformat()
+        },
+        'raw_attributes': {
+            'AD-ID': f"REQ-{index}",
+            'AD-T': text,
+        },
+        'typed_attributes': {
+            'Priority': priority,
+            'LastModifiedOn': modified
+        },
+        'type': 'Requirement Type'
+    }
+
+
+def make_baseline_pair(count: int, change_fraction: float, seed: int = 7):
+    """Create two requirement lists where change_fraction of the second differs"""
+    rng = random.Random(seed)
+    file1 = [make_requirement(i, rng) for i in range(count)]
+    file2 = []
+    for req in file1:
+        copy = {key: (value.copy() if isinstance(value, dict) else value) for key, value in req.items()}
+        if rng.random() < change_fraction:
+            copy['attributes']['Object Text'] += ' ' + rng.choice(WORDS)
+        file2.append(copy)
+    return file1, file2
+
+
+def time_compare(comparator: ReqIFComparator, file1, file2) -> float:
+    """Run one comparison and return elapsed seconds"""
+    start = time.perf_counter()
+    results = comparator.compare_requirements(file1, file2)
+    elapsed = time.perf_counter() - start
+    stats = results['statistics']
+    print(f"    modified={stats['content_modified_count']} unchanged={stats['unchanged_count']}")
+    return elapsed
+
+
+def measure_result_memory(count: int):
+    """Report traced memory held by comparison results per changed requirement"""
+    print(f"Building {count} requirement pairs with every requirement changed...")
+    file1, file2 = make_baseline_pair(count, 1.0)
+
+    comparator = ReqIFComparator()
+    comparator.detect_moved = False
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = comparator.compare_requirements(file1, file2)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    changed = results['statistics']['content_modified_count']
+    print(f"  {changed} changed requirements, {held / 1024 / 1024:.1f} MiB held by results")
+    print(f"  {held / max(changed, 1):.0f} bytes per changed requirement")
+
+
+def compare_partitioned(count: int, processes: int):
+    """Time in-process against partitioned comparison and check both agree"""
+    print(f"Building {count} requirement pairs with 2% changes...")
+    file1, file2 = make_baseline_pair(count, 0.02)
+
+    print("In-process:")
+    start = time.perf_counter()
+    single = ReqIFComparator().compare_requirements(file1, file2)
+    print(f"  {time.perf_counter() - start:.2f}s")
+
+    print(f"Partitioned on {processes} processes:")
+    partitioned = PartitionedComparator(processes=processes, min_requirements=0)
+    start = time.perf_counter()
+    merged = partitioned.compare_requirements(file1, file2)
+    print(f"  {time.perf_counter() - start:.2f}s")
+
+    same = all(sorted(req['id'] for req in single[category]) == [req['id'] for req in merged[category]]
+               for category in ('added', 'deleted', 'content_modified', 'structural_only', 'unchanged'))
+    print(f"  Categories identical: {same}")
+
+
+def iter_requirements(count: int, change_fraction: float, seed: int, changed: bool):
+    """Generate one side of a baseline pair lazily, in shuffled-ish order"""
+    rng = random.Random(seed)
+    change_rng = random.Random(seed + 1)
+    # Stride through the ID space so the stream is not already sorted
+    stride = 7919 if count % 7919 else 7907
+    for step in range(count):
+        req = make_requirement((step * stride) % count, rng)
+        if changed and change_rng.random() < change_fraction:
+            req['attributes']['Object Text'] += ' ' + change_rng.choice(WORDS)
+        yield req
+
+
+def compare_streaming(count: int, budget_mb: int):
+    """Measure peak traced memory of an out-of-core comparison against its budget"""
+    print(f"Streaming {count} requirement pairs with 2% changes, {budget_mb} MiB budget...")
+    counts = {}
+
+    def sink(category, entry):
+        counts[category] = counts.get(category, 0) + 1
+
+    comparator = StreamingComparator(memory_budget_mb=budget_mb)
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = comparator.compare_streams(iter_requirements(count, 0.02, 11, False),
+                                         iter_requirements(count, 0.02, 11, True), sink)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    stats = results['statistics']
+    print(f"  {elapsed:.2f}s, modified={stats['content_modified_count']} unchanged={stats['unchanged_count']}")
+    print(f"  peak traced memory {peak / 1024 / 1024:.1f} MiB, "
+          f"spilled {comparator.last_run_stats['spilled_bytes'] / 1024 / 1024:.1f} MiB in "
+          f"{comparator.last_run_stats['file1_runs'] + comparator.last_run_stats['file2_runs']} runs")
+
+
+def compare_stats_only(count: int, change_fraction: float):
+    """Time and memory of a full comparison against the counts-only mode, each on freshly built inputs"""
+    print(f"Building {count} requirement pairs with {change_fraction:.0%} changes per mode...")
+
+    for label, stats_only in (("Full", False), ("Stats only", True)):
+        # Same seed, new objects: neither mode sees anything the other one computed
+        file1, file2 = make_baseline_pair(count, change_fraction)
+        comparator = ReqIFComparator()
+        comparator.detect_moved = False
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = comparator.compare_requirements(file1, file2, stats_only=stats_only)
+        elapsed = time.perf_counter() - start
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"  {label}: {elapsed:.2f}s (traced), peak {peak / 1024 / 1024:.1f} MiB, "
+              f"held by result {held / 1024 / 1024:.1f} MiB, "
+              f"modified={results['statistics']['content_modified_count']}")
+        del results, file1, file2
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--memory':
+        measure_result_memory(int(sys.argv[2]) if len(sys.argv) > 2 else 50000)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == '--partitioned':
+        compare_partitioned(int(sys.argv[2]) if len(sys.argv) > 2 else 400000,
+                            int(sys.argv[3]) if len(sys.argv) > 3 else 4)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == '--streaming':
+        compare_streaming(int(sys.argv[2]) if len(sys.argv) > 2 else 200000,
+                          int(sys.argv[3]) if len(sys.argv) > 3 else 64)
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == '--stats-only':
+        compare_stats_only(int(sys.argv[2]) if len(sys.argv) > 2 else 200000,
+                           float(sys.argv[3]) if len(sys.argv) > 3 else 0.02)
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    change_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    print(f"Building {count} requirement pairs with {change_fraction:.0%} changes...")
+    file1, file2 = make_baseline_pair(count, change_fraction)
+
+    comparator = ReqIFComparator()
+
+    comparator.use_digest_fast_path = False
+    print("Field-by-field analysis (lazy diffs):")
+    baseline = time_compare(comparator, file1, file2)
+    print(f"  {baseline:.2f}s")
+
+    # Digests are computed in every comparison; nothing is cached on the inputs
+    comparator.use_digest_fast_path = True
+    print("Digest fast path:")
+    digested = time_compare(comparator, file1, file2)
+    print(f"  {digested:.2f}s ({baseline / max(digested, 1e-9):.1f}x)")
+
+    comparator.eager_diffs = True
+    print("Digest fast path with eager diffs, as used for exports:")
+    eager = time_compare(comparator, file1, file2)
+    print(f"  {eager:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+File Matching Benchmark
+Times FolderComparator._match_files on synthetic folder listings (default:
+50k files per side). Two layouts are measured: a revision of the same tree
+(most paths unchanged, some files renamed, moved, added or deleted) and a
+re-rooted tree where no relative path matches exactly.
+
+Usage:
+    python benchmarks/bench_file_matching.py [count] [rename_fraction]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from folder_comparator import FolderComparator
+
+
+SUBSYSTEMS = ("brake", "engine", "door", "hvac", "lighting", "infotainment", "chassis", "battery",
+              "charging", "steering", "seat", "mirror", "wiper", "airbag", "telematics", "gateway")
+DOCUMENTS = ("requirements", "interface_spec", "safety_goals", "test_spec", "system_spec",
+             "component_spec", "diagnostics", "calibration", "hmi_spec", "network_spec")
+
+
+def file_info(relative_path: str) -> dict:
+    """File dict shaped like FolderComparator._scan_folder output (no disk access)"""
+    directory, filename = os.path.split(relative_path)
+    return {
+        'full_path': relative_path,
+        'relative_path': relative_path,
+        'filename': filename,
+        'extension': os.path.splitext(filename)[1].lower(),
+        'size': 0,
+        'parent_dir': directory,
+        'modified_time': 0.0
+    }
+
+
+def make_tree(count: int, rng: random.Random) -> list:
+    """Unique relative paths like 'brake/ecu_12/brake_requirements_v3_0042.reqif'"""
+    paths = set()
+    while len(paths) < count:
+        subsystem = rng.choice(SUBSYSTEMS)
+        directory = os.path.join(subsystem, f"ecu_{rng.randint(1, 40)}")
+        name = f"{subsystem}_{rng.choice(DOCUMENTS)}_v{rng.randint(1, 5)}_{rng.randint(0, 9999):04d}"
+        paths.add(os.path.join(directory, name + rng.choice(('.reqif', '.reqif', '.reqif', '.reqifz'))))
+    return sorted(paths)
+
+
+def rename(path: str, rng: random.Random) -> str:
+    """Small edit of a path: version bump, suffix, typo fix or move to another ECU folder"""
+    directory, filename = os.path.split(path)
+    stem, extension = os.path.splitext(filename)
+    action = rng.randrange(4)
+    if action == 0:
+        stem = stem.replace('_v', '_rev', 1)
+    elif action == 1:
+        stem = stem + '_updated'
+    elif action == 2:
+        position = rng.randrange(len(stem))
+        stem = stem[:position] + stem[position + 1:]
+    else:
+        directory = os.path.join(os.path.dirname(directory), f"ecu_{rng.randint(41, 60)}")
+    return os.path.join(directory, stem + extension)
+
+
+def make_revision(paths: list, rename_fraction: float, rng: random.Random) -> list:
+    """Second tree: renamed files, 2% deleted, 2% added, the rest unchanged"""
+    revised = set()
+    for path in paths:
+        roll = rng.random()
+        if roll < 0.02:
+            continue
+        revised.add(rename(path, rng) if roll < 0.02 + rename_fraction else path)
+    revised.update(make_tree(len(paths) // 50, random.Random(rng.random())))
+    return sorted(revised)
+
+
+def run(label: str, comparator: FolderComparator, files1: list, files2: list):
+    start = time.perf_counter()
+    matches = comparator._match_files(files1, files2)
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: {elapsed:.2f}s - {len(matches['exact_matches'])} exact, "
+          f"{len(matches['fuzzy_matches'])} fuzzy, {len(matches['deleted_files'])} deleted, "
+          f"{len(matches['added_files'])} added")
+    return matches
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rename_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    rng = random.Random(11)
+
+    paths1 = make_tree(count, rng)
+    paths2 = make_revision(paths1, rename_fraction, rng)
+    files1 = [file_info(path) for path in paths1]
+    files2 = [file_info(path) for path in paths2]
+    rerooted = [file_info(os.path.join('baseline_2', path)) for path in paths2]
+
+    comparator = FolderComparator(max_files=0)
+    print(f"Matching {len(files1)} against {len(files2)} files ({rename_fraction:.0%} renamed):")
+    run("revision", comparator, files1, files2)
+    run("re-rooted tree (no exact paths)", comparator, files1, rerooted)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Folder Comparison Benchmark
+Times FolderComparator.compare_folders on generated folders (default: 400
+file pairs with 500 requirements each, 5% of them edited) and reports the
+peak RSS. The pipelined mode is compared with the in-memory mode that keeps
+every matched file result; each mode runs in its own process so the peaks
+do not mix.
+
+Usage:
+    python benchmarks/bench_folder_compare.py [pairs] [requirements_per_file] [window]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import folder_comparator
+from folder_comparator import FolderComparator
+
+
+WORDS = ("shall system signal brake sensor value limit time speed user data "
+         "monitor report fault state mode request response interface").split()
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<REQ-IF xmlns="http://www.omg.org/spec/ReqIF/20110401/reqif.xsd" xmlns:xhtml="http://www.w3.org/1999/xhtml">
+<THE-HEADER><REQ-IF-HEADER IDENTIFIER="hdr"><TITLE>Benchmark</TITLE></REQ-IF-HEADER></THE-HEADER>
+<CORE-CONTENT><REQ-IF-CONTENT>
+<DATATYPES><DATATYPE-DEFINITION-STRING IDENTIFIER="DT-S" LONG-NAME="T_String" MAX-LENGTH="1000"/></DATATYPES>
+<SPEC-TYPES><SPEC-OBJECT-TYPE IDENTIFIER="SOT-1" LONG-NAME="Requirement"><SPEC-ATTRIBUTES>
+<ATTRIBUTE-DEFINITION-XHTML IDENTIFIER="AD-T" LONG-NAME="Object Text"/>
+<ATTRIBUTE-DEFINITION-STRING IDENTIFIER="AD-ID" LONG-NAME="ReqID"/>
+</SPEC-ATTRIBUTES></SPEC-OBJECT-TYPE></SPEC-TYPES>
+<SPEC-OBJECTS>
+"""
+
+SPEC_OBJECT = """<SPEC-OBJECT IDENTIFIER="{id}" LAST-CHANGE="2024-01-01T00:00:00Z"><TYPE><SPEC-OBJECT-TYPE-REF>SOT-1</SPEC-OBJECT-TYPE-REF></TYPE><VALUES>\
+<ATTRIBUTE-VALUE-XHTML><DEFINITION><ATTRIBUTE-DEFINITION-XHTML-REF>AD-T</ATTRIBUTE-DEFINITION-XHTML-REF></DEFINITION><THE-VALUE><xhtml:div>{text}</xhtml:div></THE-VALUE></ATTRIBUTE-VALUE-XHTML>\
+<ATTRIBUTE-VALUE-STRING THE-VALUE="{id}"><DEFINITION><ATTRIBUTE-DEFINITION-STRING-REF>AD-ID</ATTRIBUTE-DEFINITION-STRING-REF></DEFINITION></ATTRIBUTE-VALUE-STRING>\
+</VALUES></SPEC-OBJECT>
+"""
+
+FOOTER = """</SPEC-OBJECTS>
+</REQ-IF-CONTENT></CORE-CONTENT>
+</REQ-IF>
+"""
+
+
+def write_reqif(path: str, texts: list, file_index: int):
+    """ReqIF file with one requirement per text"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        for index, text in enumerate(texts):
+            f.write(SPEC_OBJECT.format(id=f"REQ-{file_index:04d}-{index:05d}", text=text))
+        f.write(FOOTER)
+
+
+def make_folders(root: str, pairs: int, requirements: int, rng: random.Random):
+    """Baseline and revision folders with pairs files each; every revision file has 5% edited requirements"""
+    for side in ('old', 'new'):
+        os.makedirs(os.path.join(root, side), exist_ok=True)
+    for file_index in range(pairs):
+        texts = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))) for _ in range(requirements)]
+        name = f"spec_{file_index:04d}.reqif"
+        write_reqif(os.path.join(root, 'old', name), texts, file_index)
+        for index in rng.sample(range(requirements), max(1, requirements // 20)):
+            texts[index] += ' updated'
+        write_reqif(os.path.join(root, 'new', name), texts, file_index)
+
+
+def measure(root: str, mode: str, window: int):
+    """Run one comparison in this process and print its time and peak RSS"""
+    comparator = FolderComparator()
+    start = time.perf_counter()
+    results = comparator.compare_folders(os.path.join(root, 'old'), os.path.join(root, 'new'),
+                                         use_threading=True, pipelined=(mode == 'pipelined'),
+                                         pipeline_window=window)
+    elapsed = time.perf_counter() - start
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    stats = results['aggregated_statistics']
+    print(f"  {mode}: {elapsed:.2f}s, peak RSS {peak_mib:.0f} MiB - "
+          f"{stats['total_requirements_content_modified']} modified, "
+          f"{stats['total_requirements_unchanged']} unchanged")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    requirements = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    window = int(sys.argv[3]) if len(sys.argv) > 3 else folder_comparator.DEFAULT_PIPELINE_WINDOW
+
+    with tempfile.TemporaryDirectory(prefix='bench_folder_') as root:
+        make_folders(root, pairs, requirements, random.Random(5))
+        print(f"Comparing {pairs} file pairs with {requirements} requirements each:")
+        for mode in ('in-memory', 'pipelined'):
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', root, mode, str(window)],
+                           check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Result Snapshot Benchmark
+Saves and reloads a synthetic comparison result (default: 100k requirements,
+10% content changes) as a result snapshot and as indented JSON, and times
+random access by requirement ID.
+
+Usage:
+    python benchmarks/bench_snapshot.py [count] [change_fraction]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_comparator import make_baseline_pair
+from reqif_comparator import ReqIFComparator
+from result_snapshot import SnapshotReader, save_results, load_results, RESULT_CATEGORIES
+
+
+def json_ready(entry):
+    """Plain dict of a result entry, as the JSON export writes it"""
+    if isinstance(entry, Mapping):
+        return {key: json_ready(value) for key, value in entry.items() if not key.startswith('_')}
+    return entry
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    change_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    print(f"Comparing {count} requirement pairs with {change_fraction:.0%} changes...")
+    file1, file2 = make_baseline_pair(count, change_fraction)
+    comparator = ReqIFComparator()
+    comparator.detect_moved = False
+    results = comparator.compare_requirements(file1, file2)
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'results.json')
+        snapshot_path = os.path.join(directory, 'results.rqsnap')
+
+        start = time.perf_counter()
+        export = {category: [json_ready(entry) for entry in results[category]] for category in RESULT_CATEGORIES}
+        export['statistics'] = results['statistics']
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(export, f, indent=2, default=str)
+        json_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(json_path, 'r', encoding='utf-8') as f:
+            json.load(f)
+        json_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        save_results(snapshot_path, results)
+        snapshot_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = load_results(snapshot_path)
+        snapshot_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reader = SnapshotReader(snapshot_path)
+        snapshot_open = time.perf_counter() - start
+
+        ids = [req['id'] for req in file2]
+        random.Random(5).shuffle(ids)
+        lookups = ids[:1000]
+        start = time.perf_counter()
+        for req_id in lookups:
+            reader.get(req_id)
+        lookup_time = time.perf_counter() - start
+        reader.close()
+
+        print(f"  JSON (indent=2): {os.path.getsize(json_path) / 1024 / 1024:8.1f} MiB, "
+              f"write {json_write:.2f}s, read {json_read:.2f}s")
+        print(f"  Snapshot:        {os.path.getsize(snapshot_path) / 1024 / 1024:8.1f} MiB, "
+              f"write {snapshot_write:.2f}s, full load {snapshot_read:.2f}s, open {snapshot_open * 1000:.1f} ms")
+        print(f"  Random access:   {lookup_time / len(lookups) * 1000:.2f} ms per lookup "
+              f"(includes building the ID index on the first one)")
+        same = all(len(loaded[category]) == len(results[category]) for category in RESULT_CATEGORIES)
+        print(f"  Category sizes identical after reload: {same}")
+
+
+if __name__ == "__main__":
+    main()
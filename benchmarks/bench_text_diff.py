@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Text Diff Benchmark
+Times text_diff.word_diff against difflib on long synthetic requirement
+texts (default: 10, 25, 50 and 100 KB with 1% of the words edited).
+
+Usage:
+    python benchmarks/bench_text_diff.py [edit_fraction] [size_kb ...]
+"""
+
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_diff import tokenize, diff_tokens, word_diff
+
+
+WORDS = ("shall system signal brake sensor value limit time speed user data "
+         "monitor report fault state mode request response interface the a of "
+         "to within when if and or not ms").split()
+
+
+def make_text(size_bytes: int, rng: random.Random) -> str:
+    """Build prose-like text of roughly size_bytes with sentences and line breaks"""
+    parts = []
+    length = 0
+    while length < size_bytes:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+        sentence = sentence.capitalize() + ('.\n' if rng.random() < 0.2 else '. ')
+        parts.append(sentence)
+        length += len(sentence)
+    return ''.join(parts)
+
+
+def edit_text(text: str, edit_fraction: float, rng: random.Random) -> str:
+    """Replace, insert or delete edit_fraction of the words"""
+    tokens = tokenize(text)
+    edited = []
+    for token in tokens:
+        if token.isalnum() and rng.random() < edit_fraction:
+            action = rng.randrange(3)
+            if action == 0:
+                edited.append(rng.choice(WORDS))
+            elif action == 1:
+                edited.extend((token, ' ', rng.choice(WORDS)))
+            continue
+        edited.append(token)
+    return ''.join(edited)
+
+
+def timed(function, *args):
+    """Return (result, elapsed seconds) of one call"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+# difflib without its popularity heuristic is quadratic on prose; skip it above this size
+EXACT_DIFFLIB_MAX_KB = 25
+
+
+def difflib_words(text1: str, text2: str, autojunk: bool = True):
+    """Word-token diff with difflib's SequenceMatcher"""
+    return difflib.SequenceMatcher(None, tokenize(text1), tokenize(text2), autojunk=autojunk).get_opcodes()
+
+
+def difflib_lines(text1: str, text2: str):
+    """Line-based unified diff with difflib"""
+    return list(difflib.unified_diff(text1.splitlines(), text2.splitlines(), lineterm=''))
+
+
+def changed_tokens(opcodes) -> int:
+    """Number of original plus modified tokens outside 'equal' opcodes"""
+    return sum((i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != 'equal')
+
+
+def main():
+    edit_fraction = float(sys.argv[1]) if len(sys.argv) > 1 else 0.01
+    sizes = [int(size) for size in sys.argv[2:]] or [10, 25, 50, 100]
+    rng = random.Random(3)
+
+    for size_kb in sizes:
+        text1 = make_text(size_kb * 1024, rng)
+        text2 = edit_text(text1, edit_fraction, rng)
+        tokens1, tokens2 = tokenize(text1), tokenize(text2)
+        print(f"{size_kb} KB ({len(tokens1)} tokens), {edit_fraction:.0%} of words edited:")
+
+        (opcodes, complete), elapsed = timed(diff_tokens, tokens1, tokens2)
+        print(f"  text_diff (Myers + anchors): {elapsed * 1000:8.1f} ms, "
+              f"{changed_tokens(opcodes)} changed tokens, complete={complete}")
+
+        _, elapsed = timed(word_diff, text1, text2)
+        print(f"  text_diff.word_diff (incl. tokenize): {elapsed * 1000:8.1f} ms")
+
+        opcodes, elapsed = timed(difflib_words, text1, text2)
+        print(f"  difflib SequenceMatcher on words (autojunk): {elapsed * 1000:8.1f} ms, "
+              f"{changed_tokens(opcodes)} changed tokens")
+
+        if size_kb <= EXACT_DIFFLIB_MAX_KB:
+            opcodes, elapsed = timed(difflib_words, text1, text2, False)
+            print(f"  difflib SequenceMatcher on words (no autojunk): {elapsed * 1000:8.1f} ms, "
+                  f"{changed_tokens(opcodes)} changed tokens")
+
+        _, elapsed = timed(difflib_lines, text1, text2)
+        print(f"  difflib unified_diff on lines: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
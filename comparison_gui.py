@@ -9,14 +9,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import csv
 import os
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Set, Optional
 import difflib
 import re
 import threading
+from collections.abc import Mapping
 from datetime import datetime
 
-from reqif_parser import ReqIFParser
+from reqif_parser import ReqIFParser, raw_value
 from reqif_comparator import ReqIFComparator
+from text_diff import word_diff
+from result_snapshot import save_results, load_results
 
 
 class ComparisonGUI:
@@ -117,9 +120,15 @@ class ComparisonGUI:
                                    command=self._export_results,
                                    font=('Arial', 11), relief='raised', bd=2,
                                    padx=20, pady=6, cursor='hand2')
-        self.export_btn.pack(side=tk.LEFT)
+        self.export_btn.pack(side=tk.LEFT, padx=(0, 15))
         self.export_btn.config(state=tk.DISABLED)
         
+        self.load_btn = tk.Button(button_frame, text="📂 Load Results", 
+                                 command=self._load_results,
+                                 font=('Arial', 11), relief='raised', bd=2,
+                                 padx=20, pady=6, cursor='hand2')
+        self.load_btn.pack(side=tk.LEFT)
+        
     def _create_progress_section(self, parent):
         """Create progress section"""
         progress_frame = tk.LabelFrame(parent, text="Progress", 
@@ -220,10 +229,10 @@ class ComparisonGUI:
         """Run comparison in background thread"""
         try:
             self._update_progress(10, "Parsing original file...")
-            file1_reqs = self.reqif_parser.parse_file(file1)
+            file1_reqs = self.reqif_parser.parse_file(file1, record_spans=True)
             
             self._update_progress(30, "Parsing modified file...")
-            file2_reqs = self.reqif_parser.parse_file(file2)
+            file2_reqs = self.reqif_parser.parse_file(file2, record_spans=True)
             
             self._update_progress(60, "Comparing requirements...")
             comparison_result = self.reqif_comparator.compare_requirements(file1_reqs, file2_reqs)
@@ -280,6 +289,71 @@ class ComparisonGUI:
         messagebox.showerror("Comparison Error", 
                            f"An error occurred during comparison:\n\n{error_msg}")
         
+    def _export_results(self):
+        """Save the results as a result snapshot (reloadable) or a text summary"""
+        if not self.comparison_result:
+            messagebox.showwarning("Export", "No comparison results to export")
+            return
+            
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".rqsnap",
+            filetypes=[
+                ("Result snapshots", "*.rqsnap"),
+                ("Text files", "*.txt"),
+                ("All files", "*.*")
+            ],
+            title="Export Comparison Results"
+        )
+        
+        if not filename:
+            return
+            
+        try:
+            if filename.endswith('.txt'):
+                with open(filename, 'w', encoding='utf-8') as f:
+                    self.reqif_comparator.write_comparison_summary(self.comparison_result, f)
+            else:
+                save_results(filename, self.comparison_result, {
+                    'export_time': datetime.now().isoformat(),
+                    'file1': self.file1_var.get(),
+                    'file2': self.file2_var.get()
+                })
+            self._update_status(f"Results exported to {os.path.basename(filename)}")
+            
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export results:\n{str(e)}")
+            
+    def _load_results(self):
+        """Show results from a result snapshot without comparing again"""
+        if self.is_comparing:
+            return
+            
+        filename = filedialog.askopenfilename(
+            title="Load Comparison Results",
+            filetypes=[("Result snapshots", "*.rqsnap"), ("All files", "*.*")]
+        )
+        
+        if not filename:
+            return
+            
+        try:
+            comparison_result = load_results(filename)
+        except Exception as e:
+            messagebox.showerror("Load Error", f"Failed to load results:\n{str(e)}")
+            return
+            
+        metadata = comparison_result.get('snapshot_metadata', {})
+        self.file1_var.set(metadata.get('file1', ''))
+        self.file2_var.set(metadata.get('file2', ''))
+        
+        self.comparison_result = comparison_result
+        self.export_btn.config(state=tk.NORMAL)
+        self.progress_var.set(100)
+        self.progress_label.set(f"Loaded {os.path.basename(filename)}")
+        
+        self._display_results()
+        self._update_status(f"Results loaded from {os.path.basename(filename)}")
+        
     def _display_results(self):
         """Display comparison results in notebook tabs"""
         if not self.comparison_result:
@@ -293,6 +367,7 @@ class ComparisonGUI:
         categories = [
             ('added', 'Added', 'Requirements only in modified file'),
             ('deleted', 'Deleted', 'Requirements only in original file'),
+            ('moved', 'Moved/Renamed', 'Requirements whose ID changed but content matched'),
             ('content_modified', 'Content Modified', 'Requirements with content changes'),
             ('structural_only', 'Structural Only', 'Requirements with structural changes only'),
             ('unchanged', 'Unchanged', 'Identical requirements')
@@ -362,9 +437,9 @@ class ComparisonGUI:
             
         all_fields = set()
         for req in requirements:
-            if isinstance(req, dict):
+            if isinstance(req, Mapping):
                 for field_name in req.keys():
-                    if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes']:
+                    if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes', 'typed_attributes']:
                         all_fields.add(field_name)
                 
                 attributes = req.get('attributes', {})
@@ -402,7 +477,7 @@ class ComparisonGUI:
         other_columns = columns[1:] if len(columns) > 1 else []
         
         for req in requirements:
-            if not isinstance(req, dict):
+            if not isinstance(req, Mapping):
                 continue
                 
             tree_value = self._get_field_value(req, tree_column)
@@ -450,16 +525,18 @@ class ComparisonGUI:
                 
                 if category == 'content_modified':
                     self._show_content_modified_details(req)
+                elif category == 'moved':
+                    self._show_content_modified_details(req, title="Moved/Renamed")
                 else:
                     self._show_standard_requirement_details(req, category)
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to show requirement details:\n{str(e)}")
             
-    def _show_content_modified_details(self, req: Dict):
+    def _show_content_modified_details(self, req: Dict, title: str = "Content Modified"):
         """Show details for content modified requirement with diff view"""
         details_window = tk.Toplevel(self.parent)
-        details_window.title(f"Content Modified - {req.get('id', 'Unknown')}")
+        details_window.title(f"{title} - {req.get('id', 'Unknown')}")
         details_window.geometry("900x700")
         details_window.transient(self.parent)
         
@@ -478,7 +555,8 @@ class ComparisonGUI:
         
         comparison_data = req.get('_comparison_data')
         if comparison_data and comparison_data.get('changes'):
-            self._create_diff_view(main_frame, comparison_data['changes'])
+            self._create_diff_view(main_frame, comparison_data['changes'],
+                                   comparison_data.get('old'), comparison_data.get('new'))
         else:
             text_frame = tk.Frame(main_frame)
             text_frame.pack(fill=tk.BOTH, expand=True)
@@ -497,7 +575,8 @@ class ComparisonGUI:
                  font=('Arial', 11), relief='raised', bd=2, padx=20, pady=6,
                  cursor='hand2').pack(pady=(20, 0))
                  
-    def _create_diff_view(self, parent, changes: List[Dict]):
+    def _create_diff_view(self, parent, changes: List[Dict], old_req: Optional[Dict] = None,
+                          new_req: Optional[Dict] = None):
         """Create a diff view for content changes"""
         diff_notebook = ttk.Notebook(parent)
         diff_notebook.pack(fill=tk.BOTH, expand=True)
@@ -506,29 +585,61 @@ class ComparisonGUI:
             field_name = change.get('field', 'Unknown Field')
             old_value = change.get('old_value', '')
             new_value = change.get('new_value', '')
-            
-            tab_frame = tk.Frame(diff_notebook)
-            diff_notebook.add(tab_frame, text=field_name)
-            
-            paned = ttk.PanedWindow(tab_frame, orient=tk.HORIZONTAL)
-            paned.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-            left_frame = tk.LabelFrame(paned, text="Original", font=('Arial', 11, 'bold'))
-            paned.add(left_frame, weight=1)
-            
-            left_text = tk.Text(left_frame, wrap=tk.WORD, font=('Consolas', 10))
-            left_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            left_text.insert(1.0, old_value)
-            left_text.config(state=tk.DISABLED)
-            
-            right_frame = tk.LabelFrame(paned, text="Modified", font=('Arial', 11, 'bold'))
-            paned.add(right_frame, weight=1)
-            
-            right_text = tk.Text(right_frame, wrap=tk.WORD, font=('Consolas', 10))
-            right_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            right_text.insert(1.0, new_value)
-            right_text.config(state=tk.DISABLED)
-            
+            self._add_diff_tab(diff_notebook, field_name, old_value, new_value)
+            
+            # Show the exact source markup when the parser recorded spans
+            if field_name.startswith('attribute.') and old_req and new_req:
+                attr_name = field_name[10:]
+                old_markup = raw_value(old_req, attr_name)
+                new_markup = raw_value(new_req, attr_name)
+                if old_markup is not None and new_markup is not None:
+                    self._add_diff_tab(diff_notebook, f"{field_name} (markup)",
+                                       str(old_markup, 'utf-8', 'replace'),
+                                       str(new_markup, 'utf-8', 'replace'))
+    
+    def _add_diff_tab(self, diff_notebook, title: str, old_value: str, new_value: str):
+        """Add a side-by-side original/modified tab to the diff notebook"""
+        tab_frame = tk.Frame(diff_notebook)
+        diff_notebook.add(tab_frame, text=title)
+        
+        paned = ttk.PanedWindow(tab_frame, orient=tk.HORIZONTAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        left_frame = tk.LabelFrame(paned, text="Original", font=('Arial', 11, 'bold'))
+        paned.add(left_frame, weight=1)
+        
+        left_text = tk.Text(left_frame, wrap=tk.WORD, font=('Consolas', 10))
+        left_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        left_text.tag_configure('deleted', background='#ffd6d6', overstrike=True)
+        
+        right_frame = tk.LabelFrame(paned, text="Modified", font=('Arial', 11, 'bold'))
+        paned.add(right_frame, weight=1)
+        
+        right_text = tk.Text(right_frame, wrap=tk.WORD, font=('Consolas', 10))
+        right_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        right_text.tag_configure('inserted', background='#d6f5d6')
+        
+        # Highlight changed words on both sides
+        old_value = str(old_value) if old_value is not None else ''
+        new_value = str(new_value) if new_value is not None else ''
+        try:
+            segments = word_diff(old_value, new_value)
+        except Exception as e:
+            print(f"Error generating word diff: {e}")
+            segments = [('delete', old_value), ('insert', new_value)]
+        
+        for operation, text in segments:
+            if operation == 'equal':
+                left_text.insert(tk.END, text)
+                right_text.insert(tk.END, text)
+            elif operation == 'delete':
+                left_text.insert(tk.END, text, 'deleted')
+            else:
+                right_text.insert(tk.END, text, 'inserted')
+        
+        left_text.config(state=tk.DISABLED)
+        right_text.config(state=tk.DISABLED)
+        
     def _show_standard_requirement_details(self, req: Dict, category: str):
         """Show standard requirement details"""
         details_window = tk.Toplevel(self.parent)
@@ -565,7 +676,7 @@ class ComparisonGUI:
                  
     def _populate_basic_details(self, text_widget, req: Dict):
         """Populate basic requirement details"""
-        excluded_fields = {'attributes', 'raw_attributes', 'content', '_comparison_data'}
+        excluded_fields = {'attributes', 'raw_attributes', 'typed_attributes', 'content', '_comparison_data'}
         
         for field_name, field_value in req.items():
             if field_name not in excluded_fields and not field_name.startswith('_'):
@@ -605,6 +716,7 @@ class ComparisonGUI:
             "CHANGES DETECTED:",
             f"  Added Requirements: {stats.get('added_count', 0)}",
             f"  Deleted Requirements: {stats.get('deleted_count', 0)}",
+            f"  Moved/Renamed Requirements: {stats.get('moved_count', 0)}",
             f"  Content Modified: {stats.get('content_modified_count', 0)}",
             f"  Structural Changes Only: {stats.get('structural_only_count', 0)}",
             f"  Unchanged Requirements: {stats.get('unchanged_count', 0)}",
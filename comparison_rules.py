@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Comparison Rules Module
+Declarative rules for differences a comparison should not report: attributes
+left out entirely (e.g. LastModifiedOn), an optional list of the only
+attributes to compare, top-level fields to skip and value normalisers per
+attribute datatype (whitespace, case, XHTML markup). Rules are compiled once
+into a single normalisation function that ReqIFComparator applies when it
+builds requirement digests and comparison profiles, so ignored differences
+never reach field-level comparison.
+
+Rules file (JSON):
+    {
+        "ignore_attributes": ["LastModifiedOn", "ReqIF.ChapterName"],
+        "compare_attributes": [],
+        "ignore_fields": ["identifier"],
+        "normalize": {
+            "xhtml": ["strip_markup", "collapse_whitespace"],
+            "*": ["collapse_whitespace"]
+        }
+    }
+
+Attribute names may use shell wildcards ("ReqIF.*"). Normaliser keys are
+datatypes (string, xhtml, enumeration, integer, real, date, boolean) or "*"
+for attributes without a more specific entry.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Callable, Tuple
+from collections.abc import Mapping
+import fnmatch
+import hashlib
+import html
+import json
+import re
+
+
+DATATYPES = ('string', 'xhtml', 'enumeration', 'integer', 'real', 'date', 'boolean')
+
+# Fields that are never compared as plain fields (attributes are normalised one by one)
+_NON_FIELD_KEYS = frozenset({'content', 'raw_attributes', 'typed_attributes', 'attributes', '_comparison_data'})
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_MARKUP_PATTERN = re.compile(r'<[^<>]*>')
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Runs of whitespace (including line breaks) become one space"""
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def _strip_markup(text: str) -> str:
+    """Drop XHTML tags left in a value and decode entities"""
+    return html.unescape(_MARKUP_PATTERN.sub(' ', text)) if '<' in text or '&' in text else text
+
+
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    'strip': str.strip,
+    'collapse_whitespace': _collapse_whitespace,
+    'casefold': str.casefold,
+    'strip_markup': _strip_markup,
+    'unescape': html.unescape
+}
+
+# Normalised content of a requirement: (field, value) pairs and (attribute name, value) pairs
+NormalizedRequirement = Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]
+
+
+class ComparisonRules:
+    """
+    What a comparison ignores and how attribute values are normalised
+
+    Instances are immutable once created; fingerprint identifies the rule set
+    so digests computed under different rules are never mixed up.
+    """
+
+    def __init__(self, ignore_attributes: Iterable[str] = (), compare_attributes: Iterable[str] = (),
+                 ignore_fields: Iterable[str] = (), normalize: Optional[Dict[str, Iterable[str]]] = None):
+        self.ignore_attributes = tuple(ignore_attributes)
+        self.compare_attributes = tuple(compare_attributes)
+        self.ignore_fields = tuple(ignore_fields)
+        self.normalize = {datatype: tuple(names) for datatype, names in (normalize or {}).items()}
+
+        for datatype, names in self.normalize.items():
+            if datatype != '*' and datatype not in DATATYPES:
+                raise ValueError(f"Unknown datatype in normalize: {datatype}")
+            for name in names:
+                if name not in NORMALIZERS:
+                    raise ValueError(f"Unknown normaliser '{name}' (available: {', '.join(NORMALIZERS)})")
+
+        canonical = json.dumps(self.to_dict(), sort_keys=True)
+        self.fingerprint = hashlib.blake2b(canonical.encode('utf-8'), digest_size=6).hexdigest()
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'ComparisonRules':
+        """
+        Create rules from a dictionary (the JSON file layout)
+
+        Args:
+            data: Dictionary with any of ignore_attributes, compare_attributes,
+                ignore_fields and normalize
+
+        Returns:
+            ComparisonRules instance
+        """
+        if not isinstance(data, Mapping):
+            raise ValueError("Comparison rules must be a JSON object")
+        unknown = set(data) - {'ignore_attributes', 'compare_attributes', 'ignore_fields', 'normalize'}
+        if unknown:
+            raise ValueError(f"Unknown comparison rule keys: {', '.join(sorted(unknown))}")
+        return cls(data.get('ignore_attributes', ()), data.get('compare_attributes', ()),
+                   data.get('ignore_fields', ()), data.get('normalize'))
+
+    @classmethod
+    def from_json_file(cls, file_path: str) -> 'ComparisonRules':
+        """Load rules from a JSON file"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary in the JSON file layout"""
+        return {
+            'ignore_attributes': list(self.ignore_attributes),
+            'compare_attributes': list(self.compare_attributes),
+            'ignore_fields': list(self.ignore_fields),
+            'normalize': {datatype: list(names) for datatype, names in self.normalize.items()}
+        }
+
+    @property
+    def is_empty(self) -> bool:
+        """True when the rules change nothing"""
+        return not (self.ignore_attributes or self.compare_attributes or self.ignore_fields or
+                    any(self.normalize.values()))
+
+    def includes_attribute(self, name: str) -> bool:
+        """Whether an attribute takes part in the comparison"""
+        if self.compare_attributes and not _matches_any(name, self.compare_attributes):
+            return False
+        return not _matches_any(name, self.ignore_attributes)
+
+    def compile(self) -> Callable[[Mapping], NormalizedRequirement]:
+        """
+        Compile the rules into one normalisation function
+
+        The returned function maps a requirement to its comparable content:
+        a list of (field, value) for top-level fields and a list of
+        (attribute name, value) for attributes, in requirement order, with
+        ignored entries removed and values normalised. Attribute decisions
+        are memoised per name; normalisers are chained once per datatype.
+
+        Returns:
+            Function requirement -> (fields, attributes)
+        """
+        ignored_fields = frozenset(self.ignore_fields)
+        default_normalizer = _chain(self.normalize.get('*', ()))
+        normalizers = {datatype: _chain(names) for datatype, names in self.normalize.items() if datatype != '*'}
+        included = {}
+
+        def normalize_requirement(req: Mapping) -> NormalizedRequirement:
+            fields = []
+            for field, value in req.items():
+                if field in _NON_FIELD_KEYS or field[:1] == '_' or field in ignored_fields:
+                    continue
+                fields.append((field, str(value).strip() if value is not None else ''))
+
+            attributes = []
+            values = req.get('attributes')
+            if isinstance(values, dict):
+                datatypes = req.get('_datatypes') or {}
+                for name, value in values.items():
+                    keep = included.get(name)
+                    if keep is None:
+                        keep = included[name] = self.includes_attribute(name)
+                    if not keep:
+                        continue
+                    text = str(value) if value is not None else ''
+                    normalizer = normalizers.get(datatypes.get(name), default_normalizer)
+                    if normalizer is not None:
+                        text = normalizer(text)
+                    attributes.append((name, text))
+            return fields, attributes
+
+        return normalize_requirement
+
+
+def _matches_any(name: str, patterns: Tuple[str, ...]) -> bool:
+    """Exact or wildcard match against any pattern"""
+    for pattern in patterns:
+        if name == pattern or (any(char in pattern for char in '*?[') and fnmatch.fnmatchcase(name, pattern)):
+            return True
+    return False
+
+
+def _chain(names: Iterable[str]) -> Optional[Callable[[str], str]]:
+    """Compose named normalisers left to right (None when there are none)"""
+    functions = [NORMALIZERS[name] for name in names]
+    if not functions:
+        return None
+    if len(functions) == 1:
+        return functions[0]
+
+    def normalize_value(text: str) -> str:
+        for function in functions:
+            text = function(text)
+        return text
+    return normalize_value
+
+
+# Example usage
+if __name__ == "__main__":
+    rules = ComparisonRules.from_dict({
+        'ignore_attributes': ['LastModifiedOn', 'ReqIF.ChapterName'],
+        'normalize': {'xhtml': ['strip_markup', 'collapse_whitespace'], '*': ['collapse_whitespace']}
+    })
+    normalize_requirement = rules.compile()
+    print(normalize_requirement({
+        'id': 'REQ-1',
+        'attributes': {'Text': 'The  system\nshall <b>stop</b>', 'LastModifiedOn': '2024-01-01'},
+        '_datatypes': {'Text': 'xhtml', 'LastModifiedOn': 'date'}
+    }))
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+File Hash Cache Module
+Content digests of files, cached persistently by (path, size, mtime_ns) so a
+file that did not change between runs is never read again. Folder comparison
+uses the digests to recognise byte-identical file pairs without parsing them;
+the requirement count from a quick scan, and other values derived from a
+file's content (value()), are cached next to the digest.
+
+Cache file (JSON, '<cache_dir>/file_hashes.json'):
+    {"version": 2, "algorithm": "md5",
+     "files": {"/abs/path.reqif": {"size": 1234, "mtime_ns": 1700000000000000000,
+                                   "digest": "9e10...", "requirement_count": 50}}}
+"""
+
+from typing import Dict, Any, Optional, Callable
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+CACHE_FILE_NAME = 'file_hashes.json'
+# 2: requirement counts come from a well-formedness-checking scan (older ones may count broken files)
+CACHE_FORMAT_VERSION = 2
+
+# Bytes read per hash update
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files modified this recently could change again within the same mtime tick
+# without changing size or mtime, so their results are not cached
+RACY_WINDOW_NS = 2 * 10**9
+
+# Least recently stored entries are dropped beyond this size
+MAX_CACHE_ENTRIES = 200000
+
+
+class FileHashCache:
+    """
+    Thread-safe digest and requirement count cache for files
+
+    Entries are valid while a file keeps its size and mtime_ns. The cache is
+    loaded on first use and written back by save() (atomically, only when
+    something changed); without a cache path it lives in memory only.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, algorithm: str = 'md5'):
+        """
+        Args:
+            cache_path: JSON file to persist entries in (None keeps them in memory)
+            algorithm: hashlib algorithm name for content digests
+        """
+        hashlib.new(algorithm)  # Fail early on an unknown algorithm
+        self.cache_path = cache_path
+        self.algorithm = algorithm
+
+        self.stats = {
+            'files_hashed': 0,
+            'bytes_hashed': 0,
+            'hash_seconds': 0.0,
+            'cache_hits': 0,
+            'counts_scanned': 0,
+            'values_computed': 0
+        }
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cache_config) -> 'FileHashCache':
+        """
+        Create the cache described by a CacheConfig
+
+        Entries are persisted in cache_dir when caching and cache_file_hashes
+        are both enabled, and kept in memory otherwise.
+        """
+        persistent = getattr(cache_config, 'enabled', False) and getattr(cache_config, 'cache_file_hashes', False)
+        cache_path = os.path.join(cache_config.cache_dir, CACHE_FILE_NAME) if persistent else None
+        return cls(cache_path, getattr(cache_config, 'hash_algorithm', 'md5'))
+
+    def digest(self, file_path: str, use_cache: bool = True) -> str:
+        """
+        Content digest of a file
+
+        Args:
+            file_path: File to hash
+            use_cache: Accept a cached digest (False rehashes but still stores the result)
+
+        Returns:
+            Hex digest
+        """
+        key, stat = self._key(file_path)
+        if use_cache:
+            cached = self._lookup(key, stat, 'digest')
+            if cached is not None:
+                return cached
+
+        start = time.perf_counter()
+        hasher = hashlib.new(self.algorithm)
+        size = 0
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+        digest = hasher.hexdigest()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.stats['files_hashed'] += 1
+            self.stats['bytes_hashed'] += size
+            self.stats['hash_seconds'] += elapsed
+        self._store(key, stat, 'digest', digest)
+        return digest
+
+    def requirement_count(self, file_path: str, count_requirements: Callable[[str], int],
+                          use_cache: bool = True) -> int:
+        """
+        Requirement count of a file from a quick scan, cached like digests
+
+        Args:
+            file_path: ReqIF file or archive
+            count_requirements: Scanner returning the count (e.g. ReqIFParser.count_requirements)
+            use_cache: Accept a cached count
+
+        Returns:
+            Number of requirements
+        """
+        key, stat = self._key(file_path)
+        if use_cache:
+            cached = self._lookup(key, stat, 'requirement_count')
+            if cached is not None:
+                return cached
+
+        count = count_requirements(file_path)
+        with self._lock:
+            self.stats['counts_scanned'] += 1
+        self._store(key, stat, 'requirement_count', count)
+        return count
+
+    def value(self, file_path: str, field: str, compute: Callable[[str], Any], use_cache: bool = True) -> Any:
+        """
+        Cached value derived from a file's content, e.g. a requirement ID signature
+
+        Args:
+            file_path: File the value belongs to
+            field: Entry field name (should name every parameter the value depends on)
+            compute: Called with file_path on a miss; must return a JSON-serialisable, non-None value
+            use_cache: Accept a cached value
+
+        Returns:
+            The value
+        """
+        key, stat = self._key(file_path)
+        if use_cache:
+            cached = self._lookup(key, stat, field)
+            if cached is not None:
+                return cached
+
+        value = compute(file_path)
+        with self._lock:
+            self.stats['values_computed'] += 1
+        self._store(key, stat, field, value)
+        return value
+
+    def save(self):
+        """Write changed entries to the cache file (no-op for in-memory caches)"""
+        if not self.cache_path:
+            return
+
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            data = {
+                'version': CACHE_FORMAT_VERSION,
+                'algorithm': self.algorithm,
+                'files': self._entries
+            }
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(temp_path, self.cache_path)
+                self._dirty = False
+            except Exception as e:
+                print(f"Error saving file hash cache {self.cache_path}: {e}")
+
+    def clear(self):
+        """Drop all entries (the cache file is rewritten on the next save)"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def _key(self, file_path: str):
+        """Cache key and current stat of a file"""
+        return os.path.abspath(file_path), os.stat(file_path)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Entries, read from the cache file on first use (caller holds the lock)"""
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_path and os.path.exists(self.cache_path):
+                try:
+                    with open(self.cache_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if data.get('version') == CACHE_FORMAT_VERSION and data.get('algorithm') == self.algorithm:
+                        self._entries = data.get('files', {})
+                except Exception as e:
+                    print(f"Ignoring unreadable file hash cache {self.cache_path}: {e}")
+        return self._entries
+
+    def _lookup(self, key: str, stat: os.stat_result, field: str) -> Optional[Any]:
+        """Cached field of an entry that still matches the file's size and mtime"""
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None or entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+                return None
+            value = entry.get(field)
+            if value is not None:
+                self.stats['cache_hits'] += 1
+            return value
+
+    def _store(self, key: str, stat: os.stat_result, field: str, value: Any):
+        """Record a field for the file's current size and mtime"""
+        if stat.st_mtime_ns > time.time_ns() - RACY_WINDOW_NS:
+            return
+
+        with self._lock:
+            entries = self._load()
+            entry = entries.pop(key, None)
+            if entry is None or entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns:
+                entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            entry[field] = value
+            entries[key] = entry
+            while len(entries) > MAX_CACHE_ENTRIES:
+                del entries[next(iter(entries))]
+            self._dirty = True
+
+
+# Example usage
+if __name__ == "__main__":
+    print("File Hash Cache - content digests cached by (path, size, mtime_ns)")
+
+    # cache = FileHashCache.from_config(get_caching_config())
+    # if cache.digest("old/spec.reqif") == cache.digest("new/spec.reqif"):
+    #     print("identical")
+    # cache.save()
@@ -5,22 +5,30 @@ Removed hardcoded field references and added clear distinction between
 content modifications and structural differences
 """
 
+import io
 import os
-import difflib
+from array import array
+from concurrent.futures import wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional, Callable
+from typing import List, Dict, Any, Tuple, Optional, Callable, TextIO
 import threading as thread_module
 import time
 
 # Original imports
 from reqif_comparator import ReqIFComparator
 from reqif_parser import ReqIFParser
+from reqif_similarity import (RatioScanner, TrigramIndex, MinHashLSH, SignatureIndex,
+                              identifier_hashes, jaccard)
+from comparison_rules import ComparisonRules
+from report_export import ReportWriter
+from file_hash_cache import FileHashCache
+from result_snapshot import SnapshotWriter, SnapshotReader, RESULT_CATEGORIES, folder_document
 
 # Check for enhanced threading - use fallbacks if not available
 try:
-    from thread_pools.thread_manager import get_thread_manager, execute_parallel_parse, execute_parallel_compare
+    from thread_pools.thread_manager import get_thread_manager
     from thread_pools.task_queue import get_task_scheduler, get_result_collector, TaskPriority
-    from utils.config import get_threading_config, get_compatibility_config
+    from utils.config import get_threading_config, get_compatibility_config, get_caching_config
     ENHANCED_THREADING_AVAILABLE = True
 except ImportError:
     print("Enhanced threading not available, using basic threading")
@@ -41,6 +49,38 @@ except ImportError:
                 self.sequential_fallback = True
                 self.legacy_progress_callbacks = True
         return BasicConfig()
+    
+    def get_caching_config():
+        class BasicConfig:
+            def __init__(self):
+                self.enabled = True
+                self.cache_dir = str(Path.home() / '.reqif_tool_cache')
+                self.hash_algorithm = 'md5'
+                self.cache_file_hashes = True
+        return BasicConfig()
+
+
+# Files written between two progress reports of write_folder_summary
+PROGRESS_INTERVAL_FILES = 100
+
+# Fuzzy file matching scores every same-extension pair up to this many pairs;
+# above it each file scores only same-stem files or its best trigram-index candidates
+EXHAUSTIVE_MATCH_PAIRS = 2500
+FUZZY_CANDIDATES_PER_FILE = 8
+
+# Content matching (optional): unmatched files whose SPEC-OBJECT identifier sets
+# reach this Jaccard similarity are paired; 64-bin signatures in 32 bands of 2
+# make pairs at the threshold candidates with near certainty
+CONTENT_MATCH_THRESHOLD = 0.5
+CONTENT_SIGNATURE_BINS = 64
+CONTENT_SIGNATURE_BANDS = 32
+# Signature estimates are noisy; only clearly dissimilar candidates are pruned
+CONTENT_ESTIMATE_MARGIN = 0.2
+
+# Pairs parsed and compared at the same time (and held in memory) in the pipelined mode
+DEFAULT_PIPELINE_WINDOW = 4
+# Categories written to pipelined detail records; unchanged requirements are only counted
+DETAIL_CATEGORIES = tuple(category for category in RESULT_CATEGORIES if category != 'unchanged')
 
 
 class FolderComparator:
@@ -48,14 +88,22 @@ class FolderComparator:
     Enhanced Folder Comparator with content/structural change separation
     """
     
-    def __init__(self, max_files: int = 200, similarity_threshold: float = 0.6):
+    def __init__(self, max_files: Optional[int] = None, similarity_threshold: float = 0.6,
+                 content_matching: bool = False):
         self.max_files = max_files
         self.similarity_threshold = similarity_threshold
         
+        # Pair renamed/moved files by requirement-ID overlap (see _match_files_by_content)
+        self.content_matching = content_matching
+        
         # Initialize components
         self.reqif_parser = ReqIFParser()
         self.reqif_comparator = ReqIFComparator()
         
+        # Counts-only mode and cache bypass for the current run (see compare_folders)
+        self.stats_only = False
+        self.bypass_cache = False
+        
         # Progress tracking
         self.progress_callback = None
         self.cancel_flag = thread_module.Event()
@@ -64,6 +112,9 @@ class FolderComparator:
         self.threading_config = get_threading_config()
         self.compatibility_config = get_compatibility_config()
         
+        # Content digests for the identical-file fast path (persistent across runs)
+        self.hash_cache = FileHashCache.from_config(get_caching_config())
+        
         # Statistics (updated for new categorization)
         self.folder_stats = {}
         self.aggregated_req_stats = {}
@@ -75,7 +126,18 @@ class FolderComparator:
             'fallback_to_sequential': False,
             'parallel_parse_time': 0.0,
             'parallel_compare_time': 0.0,
-            'thread_efficiency': 0.0
+            'thread_efficiency': 0.0,
+            'identical_files_skipped': 0,
+            'files_hashed': 0,
+            'hash_cache_hits': 0,
+            'bytes_hashed': 0,
+            'hash_time': 0.0,
+            'hash_throughput_mb_s': 0.0,
+            'unmatched_files_counted': 0,
+            'unmatched_count_wait_time': 0.0,
+            'peak_parsed_files': 0,
+            'content_matches': 0,
+            'content_match_time': 0.0
         }
     
     def set_progress_callback(self, callback: Callable[[int, int, str], None]):
@@ -86,20 +148,50 @@ class FolderComparator:
         """Set cancel flag for operation cancellation"""
         self.cancel_flag = cancel_flag
     
+    def set_comparison_rules(self, rules: Optional[ComparisonRules]):
+        """Set ignore/normalisation rules applied to every file pair (None to compare everything)"""
+        self.reqif_comparator.set_rules(rules)
+    
     def compare_folders(self, folder1_path: str, folder2_path: str, 
-                       use_threading: bool = None, bypass_cache: bool = False) -> Dict[str, Any]:
+                       use_threading: bool = None, bypass_cache: bool = False,
+                       stats_only: bool = False, detail_path: Optional[str] = None,
+                       pipelined: bool = False, pipeline_window: Optional[int] = None,
+                       detail_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Compare two folders containing ReqIF files with content/structural separation
         
+        With pipelined=True or a detail_path, the bounded-memory pipelined mode
+        is used: at most pipeline_window pairs are in memory at once, each
+        result is written to the detail snapshot (if any) and reduced to its
+        statistics, so memory does not grow with the requirement lists of the
+        folder. Matched file results then carry no requirement lists;
+        load_file_details reads them back from detail_path. Otherwise every
+        matched file result keeps its full requirement lists, however many
+        files the folders hold.
+        
         Args:
             folder1_path: Path to the first folder (original)
             folder2_path: Path to the second folder (modified)
             use_threading: Override threading setting (None = use config)
             bypass_cache: Bypass cache for this operation
+            stats_only: Keep only per-file statistics; matched file results carry
+                no requirement lists or diffs
+            detail_path: Snapshot file for per-file detail records (implies
+                pipelined); the caller owns the file
+            pipelined: Use the pipelined mode; without detail_path only the
+                per-file statistics are kept
+            pipeline_window: Pairs in flight in the pipelined mode
+                (default DEFAULT_PIPELINE_WINDOW)
+            detail_metadata: Extra information stored in the detail snapshot's
+                document (see save_folder_results)
             
         Returns:
             Dictionary with comprehensive comparison results
         """
+        self.stats_only = stats_only
+        self.bypass_cache = bypass_cache
+        detail_writer = None
+        
         try:
             # Determine if threading should be used
             should_use_threading = self._should_use_threading(use_threading)
@@ -118,9 +210,9 @@ class FolderComparator:
             folder1_files = self._scan_folder(folder1_path)
             folder2_files = self._scan_folder(folder2_path)
             
-            # Check file limit
+            # Check file limit (None = unlimited)
             total_files = len(folder1_files) + len(folder2_files)
-            if total_files > self.max_files:
+            if self.max_files is not None and total_files > self.max_files:
                 raise ValueError(f"Too many files to process: {total_files}. Maximum allowed: {self.max_files}")
             
             # Update progress
@@ -129,11 +221,27 @@ class FolderComparator:
             # Match files between folders
             file_matches = self._match_files(folder1_files, folder2_files)
             
+            # Renamed or moved documents recognised by their requirement IDs
+            if self.content_matching:
+                self._update_progress(12, 100, "Matching files by content...")
+                self._match_files_by_content(file_matches, should_use_threading, bypass_cache)
+            
+            # Byte-identical pairs are reported as unchanged without parsing
+            self._update_progress(15, 100, "Checking for identical files...")
+            self._precheck_identical_files(file_matches, should_use_threading, bypass_cache)
+            
             # Update progress
             self._update_progress(20, 100, "Analyzing file differences...")
             
+            pipelined = pipelined or detail_path is not None
+            
             # Analyze file differences with optional threading
-            if should_use_threading and ENHANCED_THREADING_AVAILABLE:
+            if pipelined:
+                if detail_path is not None:
+                    detail_writer = SnapshotWriter(detail_path)
+                file_results = self._analyze_file_differences_pipelined(
+                    file_matches, detail_writer, pipeline_window or DEFAULT_PIPELINE_WINDOW, should_use_threading)
+            elif should_use_threading and ENHANCED_THREADING_AVAILABLE:
                 file_results = self._analyze_file_differences_threaded(file_matches, folder1_path, folder2_path)
             else:
                 file_results = self._analyze_file_differences_sequential(file_matches, folder1_path, folder2_path)
@@ -142,7 +250,11 @@ class FolderComparator:
             self._update_progress(90, 100, "Compiling results...")
             
             # Calculate comprehensive statistics with new categorization
-            self._calculate_enhanced_statistics(file_results)
+            # (the pipelined mode has aggregated matched files as they completed)
+            if pipelined:
+                self._finish_statistics(file_results)
+            else:
+                self._calculate_enhanced_statistics(file_results)
             
             # Build final results with enhanced data
             results = {
@@ -153,9 +265,20 @@ class FolderComparator:
                 'aggregated_statistics': self.aggregated_req_stats,
                 'individual_file_statistics': self.individual_file_stats,
                 'threading_statistics': self.threading_stats,
-                'file_matches': file_matches
+                'file_matches': file_matches,
+                'stats_only': stats_only,
+                'comparison_rules': self.reqif_comparator.rules.to_dict() if self.reqif_comparator.rules else None,
+                'pipelined': pipelined,
+                'detail_path': detail_path
             }
             
+            # The detail snapshot doubles as a folder snapshot (load_folder_results)
+            if detail_writer is not None:
+                document = folder_document(results, detail_metadata)
+                document['matched_sections'] = [file_result.get('detail_section')
+                                                for file_result in file_results['matched_files']]
+                detail_writer.close(document)
+            
             # Update progress
             self._update_progress(100, 100, "Comparison completed!")
             
@@ -163,6 +286,8 @@ class FolderComparator:
             
         except Exception as e:
             print(f"Error in folder comparison: {e}")
+            if detail_writer is not None:
+                detail_writer.close()
             raise
     
     def _should_use_threading(self, use_threading_override: Optional[bool]) -> bool:
@@ -181,9 +306,261 @@ class FolderComparator:
         
         return True
     
+    def _precheck_identical_files(self, file_matches: Dict[str, Any], use_threading: bool,
+                                  bypass_cache: bool = False):
+        """
+        Mark matched pairs whose two files are byte-identical
+        
+        Sizes are compared first; only pairs of equal size are hashed, with
+        digests taken from the persistent hash cache when the file's size and
+        mtime are unchanged. Identical pairs get 'content_identical' and the
+        quick-scan 'requirement_count' and are reported as unchanged without
+        being parsed. Hash counts and throughput go to threading_stats.
+        
+        Args:
+            file_matches: Result of _match_files (match dicts are updated in place)
+            use_threading: Hash pairs on the I/O thread pool
+            bypass_cache: Rehash every file instead of trusting cached digests
+        """
+        start_time = time.time()
+        stats_before = dict(self.hash_cache.stats)
+        use_cache = not bypass_cache
+        
+        all_matches = file_matches['exact_matches'] + file_matches['fuzzy_matches']
+        candidates = [match for match in all_matches if match['file1']['size'] == match['file2']['size']]
+        
+        counts = None
+        if use_threading and ENHANCED_THREADING_AVAILABLE and len(candidates) > 1:
+            try:
+                manager = get_thread_manager()
+                futures = [manager.submit_io_task(self._precheck_file_pair, match, use_cache) for match in candidates]
+                counts = [future.result() for future in futures]
+            except Exception as e:
+                print(f"Parallel identical-file check failed, checking sequentially: {e}")
+                counts = None
+        
+        if counts is None:
+            counts = [self._precheck_file_pair(match, use_cache) for match in candidates]
+        
+        identical = 0
+        for match, count in zip(candidates, counts):
+            if count is not None:
+                match['content_identical'] = True
+                match['requirement_count'] = count
+                identical += 1
+        
+        self.hash_cache.save()
+        
+        elapsed = time.time() - start_time
+        stats = self.hash_cache.stats
+        bytes_hashed = stats['bytes_hashed'] - stats_before['bytes_hashed']
+        self.threading_stats.update({
+            'identical_files_skipped': identical,
+            'files_hashed': stats['files_hashed'] - stats_before['files_hashed'],
+            'hash_cache_hits': stats['cache_hits'] - stats_before['cache_hits'],
+            'bytes_hashed': bytes_hashed,
+            'hash_time': elapsed,
+            'hash_throughput_mb_s': round(bytes_hashed / (1024 * 1024) / elapsed, 1) if elapsed > 0 else 0.0
+        })
+    
+    def _precheck_file_pair(self, match: Dict[str, Any], use_cache: bool) -> Optional[int]:
+        """Quick-scan requirement count if both files of a pair are byte-identical, else None"""
+        if self.cancel_flag.is_set():
+            return None
+        
+        try:
+            file1_path = match['file1']['full_path']
+            if self.hash_cache.digest(file1_path, use_cache) != self.hash_cache.digest(match['file2']['full_path'], use_cache):
+                return None
+            return self.hash_cache.requirement_count(file1_path, self.reqif_parser.count_requirements, use_cache)
+        except Exception as e:
+            # The pair is simply parsed and compared
+            print(f"Identical-file check failed for {match['file1']['relative_path']}: {e}")
+            return None
+    
+    def _identical_file_result(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Comparison result of a byte-identical pair: every requirement unchanged, lists not loaded"""
+        count = match.get('requirement_count', 0)
+        return {
+            'added': [],
+            'deleted': [],
+            'moved': [],
+            'content_modified': [],
+            'structural_only': [],
+            'unchanged': [],
+            'statistics': self.reqif_comparator._build_statistics_from_counts(count, count, {'unchanged': count},
+                                                                              set(), set()),
+            'file1_path': match['file1']['full_path'],
+            'file2_path': match['file2']['full_path'],
+            'content_identical': True
+        }
+    
+    def _analyze_file_differences_pipelined(self, file_matches: Dict, detail_writer: Optional[SnapshotWriter],
+                                            window: int, use_threading: bool) -> Dict[str, Any]:
+        """
+        Bounded-memory analysis of matched pairs
+        
+        At most window pairs are parsed and compared at once (on the compare
+        thread pool when available). Each finished result is written to the
+        detail snapshot as one section, reduced to its statistics and added to
+        the folder statistics, then dropped.
+        """
+        file_results = {
+            'matched_files': [],
+            'added_files': file_matches['added_files'],
+            'deleted_files': file_matches['deleted_files'],
+            'comparison_errors': []
+        }
+        self.individual_file_stats = {
+            'matched_files': {},
+            'added_files': {},
+            'deleted_files': {}
+        }
+        self._begin_statistics()
+        
+        # Added/deleted files are counted on the I/O pool while pairs are compared
+        unmatched_counts = self._start_unmatched_counts(file_matches, use_threading)
+        
+        all_matches = file_matches['exact_matches'] + file_matches['fuzzy_matches']
+        total_matches = len(all_matches)
+        completed = 0
+        
+        manager = None
+        if use_threading and ENHANCED_THREADING_AVAILABLE:
+            try:
+                manager = get_thread_manager()
+                if not manager.initialize_pools():
+                    manager = None
+            except Exception as e:
+                print(f"Compare pool not available, comparing pairs one at a time: {e}")
+                manager = None
+        self.threading_stats['threading_used'] = manager is not None
+        
+        def record(index: int, match: Dict[str, Any], comparison_result: Optional[Dict[str, Any]], error: str = ''):
+            nonlocal completed
+            completed += 1
+            if comparison_result is None:
+                file_results['comparison_errors'].append({
+                    'file1': match['file1']['relative_path'],
+                    'file2': match['file2']['relative_path'],
+                    'error': error
+                })
+            else:
+                self._record_pipelined_result(index, match, comparison_result, detail_writer, file_results)
+            progress = 20 + (completed / max(total_matches, 1)) * 70  # 20% to 90%
+            self._update_progress(int(progress), 100, f"Compared {completed}/{total_matches} file pairs")
+        
+        start_time = time.time()
+        pending = {}
+        for index, match in enumerate(all_matches):
+            if self.cancel_flag.is_set():
+                break
+            
+            if manager is None:
+                try:
+                    record(index, match, self._compare_match(match))
+                except Exception as e:
+                    record(index, match, None, str(e))
+                continue
+            
+            while len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._record_future(future, pending.pop(future), record)
+            pending[manager.submit_compare_task(self._compare_match, match)] = (index, match)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._record_future(future, pending.pop(future), record)
+        
+        # Results arrive in completion order; report them in match order
+        file_results['matched_files'].sort(key=lambda file_result: file_result['match_index'])
+        for file_result in file_results['matched_files']:
+            del file_result['match_index']
+        self.threading_stats['parallel_compare_time'] = time.time() - start_time
+        
+        self._collect_unmatched_file_stats(file_results, unmatched_counts)
+        return file_results
+    
+    def _record_future(self, future, pending_match: Tuple[int, Dict[str, Any]], record: Callable):
+        """Pass the outcome of a pipelined compare task to record"""
+        index, match = pending_match
+        try:
+            record(index, match, future.result())
+        except Exception as e:
+            record(index, match, None, str(e))
+    
+    def _compare_match(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare one matched pair with its own parser (safe on worker threads)"""
+        if match.get('content_identical'):
+            return self._identical_file_result(match)
+        return self._compare_single_file_pair(match['file1']['full_path'], match['file2']['full_path'],
+                                              ReqIFParser())
+    
+    def _record_pipelined_result(self, index: int, match: Dict[str, Any], comparison_result: Dict[str, Any],
+                                 detail_writer: Optional[SnapshotWriter], file_results: Dict[str, Any]):
+        """Write a pair's detail record and keep only its statistics"""
+        section = match['file1']['relative_path']
+        summary = {key: value for key, value in comparison_result.items() if key not in RESULT_CATEGORIES}
+        summary.update({
+            'file1_info': match['file1'],
+            'file2_info': match['file2'],
+            'match_type': match['match_type'],
+            'similarity': match['similarity'],
+            'detail_section': section
+        })
+        if detail_writer is not None:
+            detail_writer.add_results(comparison_result, section, summary, DETAIL_CATEGORIES)
+        summary['match_index'] = index
+        file_results['matched_files'].append(summary)
+        
+        stats = summary.get('statistics', {})
+        self.individual_file_stats['matched_files'][section] = {
+            'file1_info': match['file1'],
+            'file2_info': match['file2'],
+            'comparison_stats': stats,
+            'match_type': match['match_type'],
+            'similarity': match['similarity'],
+            'has_content_changes': self._file_has_content_changes(stats),
+            'has_structural_changes': self._file_has_structural_changes(stats)
+        }
+        self._aggregate_file_statistics(stats)
+    
+    def load_file_details(self, folder_results: Dict[str, Any], file_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the detailed comparison of one matched file back from a pipelined run
+        
+        Args:
+            folder_results: Result of compare_folders
+            file_key: Relative path of the file in the original folder
+            
+        Returns:
+            compare_requirements-style result (unchanged requirements are
+            counted in its statistics but not listed), or None when the run
+            kept no detail records
+        """
+        detail_path = folder_results.get('detail_path')
+        if not detail_path or not os.path.exists(detail_path):
+            return None
+        try:
+            with SnapshotReader(detail_path) as reader:
+                if file_key not in reader.sections:
+                    return None
+                return reader.load_results(file_key)
+        except Exception as e:
+            print(f"Error reading file details for {file_key}: {e}")
+            return None
+    
     def _analyze_file_differences_threaded(self, file_matches: Dict, folder1_path: str, folder2_path: str) -> Dict[str, Any]:
         """
-        Threaded analysis of file differences using thread pools
+        Threaded analysis of file differences as a parse -> compare dataflow
+        
+        Every file is parsed on the parse pool, largest first, with its own
+        parser. A pair's comparison is submitted to the compare pool as soon as
+        both of its files are parsed, so one huge file delays only its own
+        pair, and parsed requirements are released once no pending pair needs
+        them. Progress reports completed pairs.
         """
         start_time = time.time()
         self.threading_stats['threading_used'] = True
@@ -193,81 +570,135 @@ class FolderComparator:
                 print("Enhanced threading not available, falling back to sequential")
                 return self._analyze_file_differences_sequential(file_matches, folder1_path, folder2_path)
             
-            # Process all matched files (exact + fuzzy)
-            all_matches = file_matches['exact_matches'] + file_matches['fuzzy_matches']
-            
-            if not all_matches:
-                return {
-                    'matched_files': [],
-                    'added_files': file_matches['added_files'],
-                    'deleted_files': file_matches['deleted_files'],
-                    'comparison_errors': []
-                }
+            manager = get_thread_manager()
+            if not manager.initialize_pools():
+                print("Thread pools not available, falling back to sequential")
+                self.threading_stats['threading_used'] = False
+                self.threading_stats['fallback_to_sequential'] = True
+                return self._analyze_file_differences_sequential(file_matches, folder1_path, folder2_path)
             
-            # Create parse tasks for all files that need parsing
-            parse_tasks = []
-            file_parse_map = {}  # Map file path to future index
+            # Count requirements of added/deleted files alongside parsing and comparing
+            unmatched_counts = self._start_unmatched_counts(file_matches, True)
             
-            # Collect all unique files that need parsing
-            files_to_parse = set()
-            for match in all_matches:
-                file1_path = match['file1']['full_path']
-                file2_path = match['file2']['full_path']
-                files_to_parse.add(file1_path)
-                files_to_parse.add(file2_path)
+            # Process all matched files (exact + fuzzy)
+            all_matches = file_matches['exact_matches'] + file_matches['fuzzy_matches']
+            file_results = {
+                'matched_files': [],
+                'added_files': file_matches['added_files'],
+                'deleted_files': file_matches['deleted_files'],
+                'comparison_errors': []
+            }
             
-            # Create parse tasks
-            for i, file_path in enumerate(files_to_parse):
-                task = (self._safe_parse_file, (file_path,), {})
-                parse_tasks.append(task)
-                file_parse_map[file_path] = i
+            # Pairs waiting for each file, and how many pairs still need it (identical pairs need none)
+            waiting_pairs = {}
+            remaining_uses = {}
+            file_sizes = {}
+            for index, match in enumerate(all_matches):
+                if match.get('content_identical'):
+                    continue
+                for side in ('file1', 'file2'):
+                    file_sizes[match[side]['full_path']] = match[side]['size']
+                for file_path in {match['file1']['full_path'], match['file2']['full_path']}:
+                    waiting_pairs.setdefault(file_path, []).append(index)
+                    remaining_uses[file_path] = remaining_uses.get(file_path, 0) + 1
+            total_pairs = sum(1 for match in all_matches if not match.get('content_identical'))
             
-            # Execute parsing in parallel
-            self._update_progress(25, 100, f"Parsing {len(parse_tasks)} files in parallel...")
+            self._update_progress(25, 100, f"Parsing and comparing {total_pairs} file pairs in parallel...")
             
-            def parse_progress_callback(current, total, status):
-                progress = 25 + (current / total) * 40  # 25% to 65%
-                self._update_progress(int(progress), 100, f"Parsed {current}/{total} files")
+            # Largest files first: they bound the makespan
+            pending = {}
+            for file_path in sorted(file_sizes, key=file_sizes.get, reverse=True):
+                pending[manager.submit_parse_task(self._safe_parse_file, file_path)] = ('parse', file_path)
             
-            parse_results = execute_parallel_parse(parse_tasks, parse_progress_callback)
+            parsed = {}
+            results_by_index = {}
+            completed_pairs = 0
+            peak_parsed = 0
+            parse_end_time = start_time
             
-            # Create comparison tasks
-            compare_tasks = []
-            for match in all_matches:
-                file1_path = match['file1']['full_path']
-                file2_path = match['file2']['full_path']
-                
-                # Get parsed results
-                file1_result = parse_results[file_parse_map[file1_path]]
-                file2_result = parse_results[file_parse_map[file2_path]]
+            while pending:
+                if self.cancel_flag.is_set():
+                    for future in pending:
+                        future.cancel()
+                    break
                 
-                if file1_result is not None and file2_result is not None:
-                    task = (self._safe_compare_requirements, (file1_result, file2_result, match), {})
-                    compare_tasks.append(task)
-            
-            # Execute comparisons in parallel
-            self._update_progress(65, 100, f"Comparing {len(compare_tasks)} file pairs in parallel...")
-            
-            def compare_progress_callback(current, total, status):
-                progress = 65 + (current / total) * 20  # 65% to 85%
-                self._update_progress(int(progress), 100, f"Compared {current}/{total} pairs")
-            
-            compare_results = execute_parallel_compare(compare_tasks, compare_progress_callback)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, key = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        print(f"{kind.capitalize()} task failed: {e}")
+                        value = None
+                    
+                    if kind == 'parse':
+                        parsed[key] = value
+                        peak_parsed = max(peak_parsed, len(parsed))
+                        parse_end_time = time.time()
+                        for index in waiting_pairs.pop(key):
+                            match = all_matches[index]
+                            file1_path = match['file1']['full_path']
+                            file2_path = match['file2']['full_path']
+                            if file1_path not in parsed or file2_path not in parsed:
+                                continue
+                            
+                            file1_reqs = parsed[file1_path]
+                            file2_reqs = parsed[file2_path]
+                            if file1_reqs is not None and file2_reqs is not None:
+                                compare_future = manager.submit_compare_task(self._safe_compare_requirements,
+                                                                             file1_reqs, file2_reqs, match)
+                                pending[compare_future] = ('compare', index)
+                            else:
+                                completed_pairs += 1
+                                file_results['comparison_errors'].append({
+                                    'file1': match['file1']['relative_path'],
+                                    'file2': match['file2']['relative_path'],
+                                    'error': "File could not be parsed"
+                                })
+                            
+                            # The compare task holds its own references
+                            for file_path in {file1_path, file2_path}:
+                                remaining_uses[file_path] -= 1
+                                if remaining_uses[file_path] == 0:
+                                    del parsed[file_path]
+                    else:
+                        completed_pairs += 1
+                        if value is not None:
+                            results_by_index[key] = value
+                        else:
+                            match = all_matches[key]
+                            file_results['comparison_errors'].append({
+                                'file1': match['file1']['relative_path'],
+                                'file2': match['file2']['relative_path'],
+                                'error': "Comparison failed"
+                            })
+                        progress = 25 + (completed_pairs / max(total_pairs, 1)) * 60  # 25% to 85%
+                        self._update_progress(int(progress), 100, f"Compared {completed_pairs}/{total_pairs} pairs")
             
-            # Collect results
-            file_results = {
-                'matched_files': [r for r in compare_results if r is not None],
-                'added_files': file_matches['added_files'],
-                'deleted_files': file_matches['deleted_files'],
-                'comparison_errors': []
-            }
+            # Collect results in match order, identical pairs included
+            for index, match in enumerate(all_matches):
+                if match.get('content_identical'):
+                    result = self._identical_file_result(match)
+                    result.update({
+                        'file1_info': match['file1'],
+                        'file2_info': match['file2'],
+                        'match_type': match['match_type'],
+                        'similarity': match['similarity']
+                    })
+                else:
+                    result = results_by_index.pop(index, None)
+                if result is not None:
+                    file_results['matched_files'].append(result)
             
             # Initialize individual file statistics for threaded analysis
-            self._initialize_individual_stats_threaded(file_results)
+            self._initialize_individual_stats_threaded(file_results, unmatched_counts)
             
             # Record threading performance
-            self.threading_stats['parallel_parse_time'] = time.time() - start_time
-            self.threading_stats['thread_efficiency'] = len(compare_results) / max(1, time.time() - start_time)
+            elapsed = time.time() - start_time
+            self.threading_stats['parallel_parse_time'] = parse_end_time - start_time
+            self.threading_stats['parallel_compare_time'] = elapsed
+            self.threading_stats['peak_parsed_files'] = peak_parsed
+            self.threading_stats['thread_efficiency'] = completed_pairs / max(1, elapsed)
             
             return file_results
             
@@ -308,11 +739,14 @@ class FolderComparator:
             self._update_progress(int(progress), 100, f"Comparing {file1_name}...")
             
             try:
-                # Compare the two files
-                comparison_result = self._compare_single_file_pair(
-                    match['file1']['full_path'],
-                    match['file2']['full_path']
-                )
+                if match.get('content_identical'):
+                    comparison_result = self._identical_file_result(match)
+                else:
+                    # Compare the two files
+                    comparison_result = self._compare_single_file_pair(
+                        match['file1']['full_path'],
+                        match['file2']['full_path']
+                    )
                 
                 # Add file metadata
                 comparison_result.update({
@@ -346,48 +780,14 @@ class FolderComparator:
                 print(f"Error comparing files {match['file1']['relative_path']} and {match['file2']['relative_path']}: {e}")
         
         # Collect statistics for added/deleted files
-        for file_info in file_matches['added_files']:
-            try:
-                reqs = self.reqif_parser.parse_file(file_info['full_path'])
-                self.individual_file_stats['added_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': len(reqs),
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': True
-                }
-            except Exception as e:
-                self.individual_file_stats['added_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': 0,
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': False,
-                    'error': str(e)
-                }
-        
-        for file_info in file_matches['deleted_files']:
-            try:
-                reqs = self.reqif_parser.parse_file(file_info['full_path'])
-                self.individual_file_stats['deleted_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': len(reqs),
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': True
-                }
-            except Exception as e:
-                self.individual_file_stats['deleted_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': 0,
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': False,
-                    'error': str(e)
-                }
+        self._collect_unmatched_file_stats(file_results)
         
         return file_results
     
     def _safe_parse_file(self, file_path: str) -> Optional[List[Dict[str, Any]]]:
-        """Thread-safe file parsing with error handling"""
+        """Thread-safe file parsing with error handling (parser state is per call)"""
         try:
-            return self.reqif_parser.parse_file(file_path)
+            return ReqIFParser().parse_file(file_path)
         except Exception as e:
             print(f"Parse error for {file_path}: {e}")
             return None
@@ -397,7 +797,8 @@ class FolderComparator:
                                   match_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Thread-safe requirement comparison with error handling"""
         try:
-            comparison_result = self.reqif_comparator.compare_requirements(file1_reqs, file2_reqs)
+            comparison_result = self.reqif_comparator.compare_requirements(file1_reqs, file2_reqs,
+                                                                           stats_only=self.stats_only)
             
             # Add file metadata
             comparison_result.update({
@@ -412,7 +813,8 @@ class FolderComparator:
             print(f"Compare error for {match_info['file1']['relative_path']}: {e}")
             return None
     
-    def _initialize_individual_stats_threaded(self, file_results: Dict[str, Any]):
+    def _initialize_individual_stats_threaded(self, file_results: Dict[str, Any],
+                                              unmatched_counts: Optional[Dict[str, Any]] = None):
         """Initialize individual file statistics for threaded results"""
         self.individual_file_stats = {
             'matched_files': {},
@@ -436,42 +838,76 @@ class FolderComparator:
                     'has_structural_changes': self._file_has_structural_changes(stats)
                 }
         
-        # Process added/deleted files (similar to sequential method)
-        for file_info in file_results.get('added_files', []):
-            try:
-                reqs = self.reqif_parser.parse_file(file_info['full_path'])
-                self.individual_file_stats['added_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': len(reqs),
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': True
-                }
-            except Exception as e:
-                self.individual_file_stats['added_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': 0,
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': False,
-                    'error': str(e)
-                }
+        # Process added/deleted files
+        self._collect_unmatched_file_stats(file_results, unmatched_counts)
+    
+    def _start_unmatched_counts(self, file_matches: Dict[str, Any], use_threading: bool) -> Optional[Dict[str, Any]]:
+        """
+        Submit count-only scans of added and deleted files to the I/O thread pool
         
-        for file_info in file_results.get('deleted_files', []):
-            try:
-                reqs = self.reqif_parser.parse_file(file_info['full_path'])
-                self.individual_file_stats['deleted_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': len(reqs),
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': True
-                }
-            except Exception as e:
-                self.individual_file_stats['deleted_files'][file_info['relative_path']] = {
-                    'file_info': file_info,
-                    'requirement_count': 0,
-                    'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
-                    'parsing_success': False,
-                    'error': str(e)
-                }
+        Args:
+            file_matches: Result of _match_files
+            use_threading: Use the I/O pool (False counts inline later)
+            
+        Returns:
+            Futures by full path, or None when the files are counted inline by
+            _collect_unmatched_file_stats
+        """
+        unmatched = file_matches['added_files'] + file_matches['deleted_files']
+        if not (use_threading and ENHANCED_THREADING_AVAILABLE and unmatched):
+            return None
+        
+        try:
+            manager = get_thread_manager()
+            return {file_info['full_path']: manager.submit_io_task(self._count_file_requirements, file_info['full_path'])
+                    for file_info in unmatched}
+        except Exception as e:
+            print(f"Parallel requirement counting not available, counting sequentially: {e}")
+            return None
+    
+    def _count_file_requirements(self, file_path: str) -> int:
+        """Quick-scan requirement count of a file, cached in the hash cache"""
+        return self.hash_cache.requirement_count(file_path, self.reqif_parser.count_requirements,
+                                                 not self.bypass_cache)
+    
+    def _collect_unmatched_file_stats(self, file_results: Dict[str, Any],
+                                      unmatched_counts: Optional[Dict[str, Any]] = None):
+        """
+        Record requirement counts of added and deleted files in individual_file_stats
+        
+        Files are counted with a quick SPEC-OBJECT scan instead of a full parse;
+        counts submitted by _start_unmatched_counts are collected, the rest are
+        scanned here.
+        """
+        start_time = time.time()
+        counted = 0
+        for category in ('added_files', 'deleted_files'):
+            for file_info in file_results.get(category, []):
+                try:
+                    future = unmatched_counts.get(file_info['full_path']) if unmatched_counts else None
+                    if future is not None:
+                        count = future.result()
+                    else:
+                        count = self._count_file_requirements(file_info['full_path'])
+                    counted += 1
+                    self.individual_file_stats[category][file_info['relative_path']] = {
+                        'file_info': file_info,
+                        'requirement_count': count,
+                        'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
+                        'parsing_success': True
+                    }
+                except Exception as e:
+                    self.individual_file_stats[category][file_info['relative_path']] = {
+                        'file_info': file_info,
+                        'requirement_count': 0,
+                        'file_size_mb': round(file_info['size'] / (1024 * 1024), 2),
+                        'parsing_success': False,
+                        'error': str(e)
+                    }
+        
+        self.hash_cache.save()
+        self.threading_stats['unmatched_files_counted'] = counted
+        self.threading_stats['unmatched_count_wait_time'] = time.time() - start_time
     
     def _file_has_content_changes(self, stats: Dict) -> bool:
         """
@@ -493,13 +929,16 @@ class FolderComparator:
             print(f"Error checking structural changes: {e}")
             return False
     
-    def _compare_single_file_pair(self, file1_path: str, file2_path: str) -> Dict[str, Any]:
-        """Compare a single pair of ReqIF files"""
+    def _compare_single_file_pair(self, file1_path: str, file2_path: str,
+                                  parser: Optional[ReqIFParser] = None) -> Dict[str, Any]:
+        """Compare a single pair of ReqIF files (parser: own parser for use on worker threads)"""
+        parser = parser or self.reqif_parser
         try:
-            file1_reqs = self.reqif_parser.parse_file(file1_path)
-            file2_reqs = self.reqif_parser.parse_file(file2_path)
+            file1_reqs = parser.parse_file(file1_path)
+            file2_reqs = parser.parse_file(file2_path)
             
-            comparison_result = self.reqif_comparator.compare_requirements(file1_reqs, file2_reqs)
+            comparison_result = self.reqif_comparator.compare_requirements(file1_reqs, file2_reqs,
+                                                                           stats_only=self.stats_only)
             
             comparison_result['file1_path'] = file1_path
             comparison_result['file2_path'] = file2_path
@@ -510,6 +949,7 @@ class FolderComparator:
             return {
                 'added': [],
                 'deleted': [],
+                'moved': [],
                 'content_modified': [],
                 'structural_only': [],
                 'unchanged': [],
@@ -519,13 +959,15 @@ class FolderComparator:
                     'total_unique': 0,
                     'added_count': 0,
                     'deleted_count': 0,
+                    'moved_count': 0,
                     'content_modified_count': 0,
                     'structural_only_count': 0,
                     'unchanged_count': 0,
                     'content_change_percentage': 0.0,
                     'total_change_percentage': 0.0,
                     'added_fields': [],
-                    'removed_fields': []
+                    'removed_fields': [],
+                    'field_change_histogram': {}
                 },
                 'file1_path': file1_path,
                 'file2_path': file2_path,
@@ -534,21 +976,33 @@ class FolderComparator:
     
     def _calculate_enhanced_statistics(self, file_results: Dict[str, Any]):
         """Calculate comprehensive folder and aggregated requirement statistics with new categorization"""
+        self._begin_statistics()
+        
+        # Process matched files for detailed statistics
+        for file_result in file_results['matched_files']:
+            if file_result:
+                self._aggregate_file_statistics(file_result.get('statistics', {}))
+        
+        self._finish_statistics(file_results)
+    
+    def _begin_statistics(self):
+        """Reset folder and aggregated requirement statistics before matched files are added"""
         # Folder-level statistics
         self.folder_stats = {
-            'total_matched_files': len(file_results['matched_files']),
-            'files_added': len(file_results['added_files']),
-            'files_deleted': len(file_results['deleted_files']),
+            'total_matched_files': 0,
+            'files_added': 0,
+            'files_deleted': 0,
             'files_with_content_changes': 0,
             'files_with_structural_only': 0,
             'files_unchanged': 0,
-            'comparison_errors': len(file_results['comparison_errors'])
+            'comparison_errors': 0
         }
         
         # Aggregated requirement statistics
         self.aggregated_req_stats = {
             'total_requirements_added': 0,
             'total_requirements_deleted': 0,
+            'total_requirements_moved': 0,
             'total_requirements_content_modified': 0,
             'total_requirements_structural_only': 0,
             'total_requirements_unchanged': 0,
@@ -557,41 +1011,52 @@ class FolderComparator:
             'content_change_percentage': 0.0,
             'overall_change_percentage': 0.0,
             'common_added_fields': {},
-            'common_removed_fields': {}
+            'common_removed_fields': {},
+            'field_change_histogram': {}
         }
+    
+    def _aggregate_file_statistics(self, stats: Dict[str, Any]):
+        """Add the statistics of one matched file to the folder statistics"""
+        self.folder_stats['total_matched_files'] += 1
         
-        # Process matched files for detailed statistics
-        for file_result in file_results['matched_files']:
-            if file_result:
-                stats = file_result.get('statistics', {})
-                
-                has_content_changes = self._file_has_content_changes(stats)
-                has_structural_changes = self._file_has_structural_changes(stats)
-                
-                if has_content_changes:
-                    self.folder_stats['files_with_content_changes'] += 1
-                elif has_structural_changes:
-                    self.folder_stats['files_with_structural_only'] += 1
-                else:
-                    self.folder_stats['files_unchanged'] += 1
-                
-                # Aggregate requirement counts
-                self.aggregated_req_stats['total_requirements_added'] += stats.get('added_count', 0)
-                self.aggregated_req_stats['total_requirements_deleted'] += stats.get('deleted_count', 0)
-                self.aggregated_req_stats['total_requirements_content_modified'] += stats.get('content_modified_count', 0)
-                self.aggregated_req_stats['total_requirements_structural_only'] += stats.get('structural_only_count', 0)
-                self.aggregated_req_stats['total_requirements_unchanged'] += stats.get('unchanged_count', 0)
-                self.aggregated_req_stats['total_requirements_file1'] += stats.get('total_file1', 0)
-                self.aggregated_req_stats['total_requirements_file2'] += stats.get('total_file2', 0)
-                
-                # Track common field changes
-                for field in stats.get('added_fields', []):
-                    self.aggregated_req_stats['common_added_fields'][field] = \
-                        self.aggregated_req_stats['common_added_fields'].get(field, 0) + 1
-                
-                for field in stats.get('removed_fields', []):
-                    self.aggregated_req_stats['common_removed_fields'][field] = \
-                        self.aggregated_req_stats['common_removed_fields'].get(field, 0) + 1
+        has_content_changes = self._file_has_content_changes(stats)
+        has_structural_changes = self._file_has_structural_changes(stats)
+        
+        if has_content_changes:
+            self.folder_stats['files_with_content_changes'] += 1
+        elif has_structural_changes:
+            self.folder_stats['files_with_structural_only'] += 1
+        else:
+            self.folder_stats['files_unchanged'] += 1
+        
+        # Aggregate requirement counts
+        self.aggregated_req_stats['total_requirements_added'] += stats.get('added_count', 0)
+        self.aggregated_req_stats['total_requirements_deleted'] += stats.get('deleted_count', 0)
+        self.aggregated_req_stats['total_requirements_moved'] += stats.get('moved_count', 0)
+        self.aggregated_req_stats['total_requirements_content_modified'] += stats.get('content_modified_count', 0)
+        self.aggregated_req_stats['total_requirements_structural_only'] += stats.get('structural_only_count', 0)
+        self.aggregated_req_stats['total_requirements_unchanged'] += stats.get('unchanged_count', 0)
+        self.aggregated_req_stats['total_requirements_file1'] += stats.get('total_file1', 0)
+        self.aggregated_req_stats['total_requirements_file2'] += stats.get('total_file2', 0)
+        
+        # Track common field changes
+        for field in stats.get('added_fields', []):
+            self.aggregated_req_stats['common_added_fields'][field] = \
+                self.aggregated_req_stats['common_added_fields'].get(field, 0) + 1
+        
+        for field in stats.get('removed_fields', []):
+            self.aggregated_req_stats['common_removed_fields'][field] = \
+                self.aggregated_req_stats['common_removed_fields'].get(field, 0) + 1
+        
+        for field, count in stats.get('field_change_histogram', {}).items():
+            self.aggregated_req_stats['field_change_histogram'][field] = \
+                self.aggregated_req_stats['field_change_histogram'].get(field, 0) + count
+    
+    def _finish_statistics(self, file_results: Dict[str, Any]):
+        """Add file counts and added/deleted file requirements, then compute percentages"""
+        self.folder_stats['files_added'] = len(file_results['added_files'])
+        self.folder_stats['files_deleted'] = len(file_results['deleted_files'])
+        self.folder_stats['comparison_errors'] = len(file_results['comparison_errors'])
         
         # Add requirements from added/deleted files to aggregated stats
         for file_path, file_stats in self.individual_file_stats['added_files'].items():
@@ -618,6 +1083,7 @@ class FolderComparator:
             # Overall change percentage (all changes except structural-only)
             total_changes = (self.aggregated_req_stats['total_requirements_added'] +
                            self.aggregated_req_stats['total_requirements_deleted'] +
+                           self.aggregated_req_stats['total_requirements_moved'] +
                            self.aggregated_req_stats['total_requirements_content_modified'])
             
             self.aggregated_req_stats['overall_change_percentage'] = round(
@@ -658,7 +1124,14 @@ class FolderComparator:
             return []
     
     def _match_files(self, folder1_files: List[Dict], folder2_files: List[Dict]) -> Dict[str, Any]:
-        """Match files between two folders using fuzzy matching"""
+        """
+        Match files between two folders: exact relative paths first, then fuzzy
+        
+        Exact matches are dictionary lookups. Fuzzy candidates are scored once
+        (see _fuzzy_candidate_pairs) and assigned one-to-one in a single global
+        pass, best similarity first, so a file is never taken by an earlier but
+        weaker match. Fuzzy matches are listed in folder1 order.
+        """
         matches = {
             'exact_matches': [],
             'fuzzy_matches': [],
@@ -668,62 +1141,46 @@ class FolderComparator:
             'unmatched_folder2': []
         }
         
-        folder1_by_path = {f['relative_path']: f for f in folder1_files}
         folder2_by_path = {f['relative_path']: f for f in folder2_files}
-        
-        folder1_remaining = folder1_files.copy()
-        folder2_remaining = folder2_files.copy()
+        exact_paths2 = set()
+        folder1_remaining = []
         
         # First pass: Exact path matches
         for file1 in folder1_files:
-            if self.cancel_flag.is_set():
-                break
-                
-            rel_path = file1['relative_path']
-            if rel_path in folder2_by_path:
-                file2 = folder2_by_path[rel_path]
-                
-                if file1['extension'] == file2['extension']:
-                    matches['exact_matches'].append({
-                        'file1': file1,
-                        'file2': file2,
-                        'match_type': 'exact',
-                        'similarity': 1.0
-                    })
-                    
-                    if file1 in folder1_remaining:
-                        folder1_remaining.remove(file1)
-                    if file2 in folder2_remaining:
-                        folder2_remaining.remove(file2)
-        
-        # Second pass: Fuzzy matching for remaining files
-        for file1 in folder1_remaining.copy():
-            if self.cancel_flag.is_set():
-                break
-                
-            best_match = None
-            best_similarity = 0
-            
-            for file2 in folder2_remaining:
-                if file1['extension'] != file2['extension']:
-                    continue
-                
-                similarity = self._calculate_file_similarity(file1, file2)
-                
-                if similarity > best_similarity and similarity >= self.similarity_threshold:
-                    best_similarity = similarity
-                    best_match = file2
-            
-            if best_match:
-                matches['fuzzy_matches'].append({
+            file2 = folder2_by_path.get(file1['relative_path'])
+            if file2 is not None and file1['extension'] == file2['extension']:
+                matches['exact_matches'].append({
                     'file1': file1,
-                    'file2': best_match,
-                    'match_type': 'fuzzy',
-                    'similarity': best_similarity
+                    'file2': file2,
+                    'match_type': 'exact',
+                    'similarity': 1.0
                 })
-                
-                folder1_remaining.remove(file1)
-                folder2_remaining.remove(best_match)
+                exact_paths2.add(file2['relative_path'])
+            else:
+                folder1_remaining.append(file1)
+        
+        folder2_remaining = [f for f in folder2_files if f['relative_path'] not in exact_paths2]
+        
+        # Second pass: Fuzzy matching for remaining files, best pairs first
+        assigned = {}
+        assigned2 = set()
+        for similarity, index1, index2 in self._fuzzy_candidate_pairs(folder1_remaining, folder2_remaining):
+            if index1 in assigned or index2 in assigned2:
+                continue
+            assigned[index1] = (index2, similarity)
+            assigned2.add(index2)
+        
+        for index1 in sorted(assigned):
+            index2, similarity = assigned[index1]
+            matches['fuzzy_matches'].append({
+                'file1': folder1_remaining[index1],
+                'file2': folder2_remaining[index2],
+                'match_type': 'fuzzy',
+                'similarity': similarity
+            })
+        
+        folder1_remaining = [f for index, f in enumerate(folder1_remaining) if index not in assigned]
+        folder2_remaining = [f for index, f in enumerate(folder2_remaining) if index not in assigned2]
         
         matches['deleted_files'] = folder1_remaining.copy()
         matches['added_files'] = folder2_remaining.copy()
@@ -732,19 +1189,223 @@ class FolderComparator:
         
         return matches
     
-    def _calculate_file_similarity(self, file1: Dict, file2: Dict) -> float:
+    def _match_files_by_content(self, file_matches: Dict[str, Any], use_threading: bool,
+                                bypass_cache: bool = False):
+        """
+        Pair unmatched files whose requirement identifiers overlap
+        
+        Every deleted and added file gets a MinHash signature of its
+        SPEC-OBJECT identifiers (quick scan, cached in the hash cache). LSH
+        proposes deleted/added candidates, which are verified with the exact
+        Jaccard similarity of their identifier sets and assigned one-to-one,
+        best first. Accepted pairs are appended to fuzzy_matches with
+        match_type 'content'. Cost grows with the number of unmatched files
+        plus candidate pairs, not with their product.
+        
+        Args:
+            file_matches: Result of _match_files (updated in place)
+            use_threading: Compute signatures on the I/O thread pool
+            bypass_cache: Rescan every file instead of trusting cached signatures
+        """
+        deleted = file_matches['deleted_files']
+        added = file_matches['added_files']
+        if not deleted or not added:
+            return
+        
+        start_time = time.time()
+        use_cache = not bypass_cache
+        lsh = MinHashLSH(CONTENT_SIGNATURE_BINS, CONTENT_SIGNATURE_BANDS)
+        unmatched = deleted + added
+        
+        signatures = None
+        if use_threading and ENHANCED_THREADING_AVAILABLE:
+            try:
+                manager = get_thread_manager()
+                futures = [manager.submit_io_task(self._content_signature, file_info['full_path'], lsh, use_cache)
+                           for file_info in unmatched]
+                signatures = [future.result() for future in futures]
+            except Exception as e:
+                print(f"Parallel content signatures failed, computing sequentially: {e}")
+                signatures = None
+        
+        if signatures is None:
+            signatures = [self._content_signature(file_info['full_path'], lsh, use_cache) for file_info in unmatched]
+        self.hash_cache.save()
+        
+        # Verify candidates on exact identifier sets, scanned once per involved file
+        index = SignatureIndex(lsh, signatures[:len(deleted)])
+        deleted_ids = {}
+        scored = []
+        for added_index, signature in enumerate(signatures[len(deleted):]):
+            candidates = index.candidates(signature, CONTENT_MATCH_THRESHOLD - CONTENT_ESTIMATE_MARGIN)
+            if not candidates:
+                continue
+            try:
+                added_ids = identifier_hashes(self.reqif_parser.requirement_identifiers(added[added_index]['full_path']))
+                for deleted_index, _ in candidates:
+                    if deleted_index not in deleted_ids:
+                        deleted_ids[deleted_index] = identifier_hashes(
+                            self.reqif_parser.requirement_identifiers(deleted[deleted_index]['full_path']))
+                    similarity = jaccard(deleted_ids[deleted_index], added_ids)
+                    if similarity >= CONTENT_MATCH_THRESHOLD:
+                        scored.append((similarity, deleted_index, added_index))
+            except Exception as e:
+                print(f"Content matching skipped {added[added_index]['relative_path']}: {e}")
+        
+        # Greedy one-to-one assignment, best pairs first (index tie-break keeps it deterministic)
+        scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+        assigned = {}
+        assigned_added = set()
+        for similarity, deleted_index, added_index in scored:
+            if deleted_index in assigned or added_index in assigned_added:
+                continue
+            assigned[deleted_index] = (added_index, similarity)
+            assigned_added.add(added_index)
+        
+        for deleted_index in sorted(assigned):
+            added_index, similarity = assigned[deleted_index]
+            file_matches['fuzzy_matches'].append({
+                'file1': deleted[deleted_index],
+                'file2': added[added_index],
+                'match_type': 'content',
+                'similarity': round(similarity, 3)
+            })
+        
+        remaining_deleted = [f for i, f in enumerate(deleted) if i not in assigned]
+        remaining_added = [f for i, f in enumerate(added) if i not in assigned_added]
+        file_matches['deleted_files'] = remaining_deleted.copy()
+        file_matches['added_files'] = remaining_added.copy()
+        file_matches['unmatched_folder1'] = remaining_deleted
+        file_matches['unmatched_folder2'] = remaining_added
+        
+        self.threading_stats['content_matches'] = len(assigned)
+        self.threading_stats['content_match_time'] = time.time() - start_time
+    
+    def _content_signature(self, file_path: str, lsh: MinHashLSH, use_cache: bool) -> Optional[array]:
+        """MinHash signature of a file's requirement identifiers (None for files without any or on errors)"""
+        def compute(path: str) -> str:
+            signature = lsh.signature(identifier_hashes(self.reqif_parser.requirement_identifiers(path)))
+            return signature.tobytes().hex() if signature is not None else ''
+        
+        try:
+            encoded = self.hash_cache.value(file_path, f'id_minhash_{lsh.num_bins}', compute, use_cache)
+        except Exception as e:
+            print(f"Content signature failed for {file_path}: {e}")
+            return None
+        
+        if not encoded:
+            return None
+        signature = array('I')
+        signature.frombytes(bytes.fromhex(encoded))
+        return signature
+    
+    def _fuzzy_candidate_pairs(self, folder1_files: List[Dict],
+                               folder2_files: List[Dict]) -> List[Tuple[float, int, int]]:
+        """
+        Score candidate pairs of unmatched files that reach the similarity threshold
+        
+        Only files with the same extension are compared. Small groups score
+        every pair; above EXHAUSTIVE_MATCH_PAIRS pairs each folder2 file scores
+        only the folder1 files with the same filename stem or, when there are
+        none (or too many), its best candidates from trigram indexes of folder1
+        filename stems and relative paths, so the work grows linearly with the
+        number of files.
+        
+        Args:
+            folder1_files: Unmatched files of the original folder
+            folder2_files: Unmatched files of the modified folder
+        
+        Returns:
+            List of (similarity, folder1 index, folder2 index), highest similarity first
+        """
+        groups1 = {}
+        for index, file1 in enumerate(folder1_files):
+            groups1.setdefault(file1['extension'], []).append(index)
+        groups2 = {}
+        for index, file2 in enumerate(folder2_files):
+            groups2.setdefault(file2['extension'], []).append(index)
+        
+        threshold = self.similarity_threshold
+        scored = []
+        
+        for extension, indexes2 in groups2.items():
+            indexes1 = groups1.get(extension)
+            if not indexes1:
+                continue
+            
+            indexes = None
+            if len(indexes1) * len(indexes2) > EXHAUSTIVE_MATCH_PAIRS:
+                stems = [self._filename_stem(folder1_files[i]).lower() for i in indexes1]
+                same_stem = {}
+                for position, stem in enumerate(stems):
+                    same_stem.setdefault(stem, []).append(position)
+                indexes = (same_stem, TrigramIndex(stems),
+                           TrigramIndex([self._path_stem(folder1_files[i]) for i in indexes1]))
+            
+            # Each folder2 file is the fixed side of its scanners, built once for all its candidates
+            for index2 in indexes2:
+                if self.cancel_flag.is_set():
+                    break
+                
+                file2 = folder2_files[index2]
+                if indexes is None:
+                    candidates = indexes1
+                else:
+                    # A file keeping its name (moved or re-rooted) needs no trigram search
+                    same_stem, name_index, path_index = indexes
+                    stem = self._filename_stem(file2).lower()
+                    positions = same_stem.get(stem)
+                    if not positions or len(positions) > FUZZY_CANDIDATES_PER_FILE:
+                        positions = dict(name_index.candidates(stem, FUZZY_CANDIDATES_PER_FILE))
+                        positions.update(path_index.candidates(self._path_stem(file2),
+                                                               FUZZY_CANDIDATES_PER_FILE // 2))
+                        positions = sorted(positions)
+                    candidates = [indexes1[position] for position in positions]
+                
+                scanners = self._file_scanners(file2)
+                for index1 in candidates:
+                    similarity = self._scan_file_similarity(folder1_files[index1], scanners, threshold)
+                    if similarity >= threshold:
+                        scored.append((similarity, index1, index2))
+        
+        # Index tie-break keeps the assignment deterministic
+        scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+        return scored
+    
+    @staticmethod
+    def _filename_stem(file_info: Dict) -> str:
+        """Filename without its extension"""
+        filename = file_info['filename']
+        extension = file_info['extension']
+        return filename[:-len(extension)] if extension else filename
+    
+    @staticmethod
+    def _path_stem(file_info: Dict) -> str:
+        """Relative path without the file extension"""
+        path = file_info['relative_path']
+        extension = file_info['extension']
+        return path[:-len(extension)] if extension else path
+    
+    def _calculate_file_similarity(self, file1: Dict, file2: Dict, threshold: float = 0.0) -> float:
         """Calculate similarity between two files based on filename and path"""
-        filename_similarity = difflib.SequenceMatcher(
-            None, 
-            file1['filename'].lower(), 
-            file2['filename'].lower()
-        ).ratio()
-        
-        path_similarity = difflib.SequenceMatcher(
-            None,
-            file1['relative_path'].lower(),
-            file2['relative_path'].lower()
-        ).ratio()
+        return self._scan_file_similarity(file1, self._file_scanners(file2), threshold)
+    
+    def _file_scanners(self, file2: Dict) -> Tuple[RatioScanner, RatioScanner]:
+        """Filename and path ratio scanners with file2 as the fixed side"""
+        return RatioScanner(file2['filename'].lower()), RatioScanner(file2['relative_path'].lower())
+    
+    def _scan_file_similarity(self, file1: Dict, scanners: Tuple[RatioScanner, RatioScanner],
+                              threshold: float = 0.0) -> float:
+        """Combined filename (70%) and path (30%) similarity; below threshold the result may be an upper bound"""
+        name_scanner, path_scanner = scanners
+        
+        # The path adds at most 0.3, so a weak filename rules the pair out on its own
+        filename_similarity = name_scanner.ratio(file1['filename'].lower(), (threshold - 0.3) / 0.7 - 1e-9)
+        if filename_similarity * 0.7 + 0.3 < threshold:
+            return filename_similarity * 0.7 + 0.3
+        
+        path_similarity = path_scanner.ratio(file1['relative_path'].lower(),
+                                             (threshold - filename_similarity * 0.7) / 0.3 - 1e-9)
         
         combined_similarity = (filename_similarity * 0.7) + (path_similarity * 0.3)
         return combined_similarity
@@ -765,175 +1426,193 @@ class FolderComparator:
         """
         Generate enhanced text summary with content/structural separation
         """
+        buffer = io.StringIO()
         try:
-            folder_stats = comparison_results.get('folder_statistics', {})
-            req_stats = comparison_results.get('aggregated_statistics', {})
-            individual_stats = comparison_results.get('individual_file_statistics', {})
-            threading_stats = comparison_results.get('threading_statistics', {})
+            self.write_folder_summary(comparison_results, buffer)
+            return buffer.getvalue()
             
-            summary_lines = [
-                "Enhanced Folder Comparison Summary - Content/Structural Analysis",
-                "=" * 60,
-                "",
-                "Folder Paths:",
-                f"- Original: {comparison_results.get('folder1_path', 'N/A')}",
-                f"- Modified: {comparison_results.get('folder2_path', 'N/A')}",
-                "",
-                "Processing Information:",
-                f"- Threading Used: {'Yes' if threading_stats.get('threading_used', False) else 'No'}",
-                f"- Fallback to Sequential: {'Yes' if threading_stats.get('fallback_to_sequential', False) else 'No'}",
-                f"- Parallel Processing Time: {threading_stats.get('parallel_parse_time', 0):.2f}s",
-                "",
-                "File-Level Changes:",
-                f"- Files Added: {folder_stats.get('files_added', 0)}",
-                f"- Files Deleted: {folder_stats.get('files_deleted', 0)}",
-                f"- Files with Content Changes: {folder_stats.get('files_with_content_changes', 0)}",
-                f"- Files with Structural Changes Only: {folder_stats.get('files_with_structural_only', 0)}",
-                f"- Files Unchanged: {folder_stats.get('files_unchanged', 0)}",
-                f"- Comparison Errors: {folder_stats.get('comparison_errors', 0)}",
-                "",
-                "Aggregated Requirement Changes:",
-                f"- Requirements Added: {req_stats.get('total_requirements_added', 0)}",
-                f"- Requirements Deleted: {req_stats.get('total_requirements_deleted', 0)}",
-                f"- Requirements with Content Changes: {req_stats.get('total_requirements_content_modified', 0)}",
-                f"- Requirements with Structural Changes Only: {req_stats.get('total_requirements_structural_only', 0)}",
-                f"- Requirements Unchanged: {req_stats.get('total_requirements_unchanged', 0)}",
-                "",
-                f"Content Change Rate: {req_stats.get('content_change_percentage', 0)}%",
-                f"Overall Change Rate: {req_stats.get('overall_change_percentage', 0)}%",
+        except Exception as e:
+            return f"Error generating enhanced folder summary: {str(e)}"
+    
+    def write_folder_summary(self, comparison_results: Dict[str, Any], out: TextIO,
+                             progress_callback: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Stream the enhanced folder summary to a text stream
+        
+        The folder-level sections are written and flushed first (constant
+        time to first byte); file sections follow in chunks of lines, so
+        memory does not grow with the number of files. The text is the same
+        as export_folder_summary_enhanced returns.
+        
+        Args:
+            comparison_results: Result of compare_folders
+            out: Text stream (file, StringIO or export job stream)
+            progress_callback: Called as (files written, total files, status)
+        """
+        folder_stats = comparison_results.get('folder_statistics', {})
+        req_stats = comparison_results.get('aggregated_statistics', {})
+        individual_stats = comparison_results.get('individual_file_statistics', {})
+        threading_stats = comparison_results.get('threading_statistics', {})
+        
+        matched_files = individual_stats.get('matched_files') or {}
+        added_files = individual_stats.get('added_files') or {}
+        deleted_files = individual_stats.get('deleted_files') or {}
+        total_files = len(matched_files) + len(added_files) + len(deleted_files)
+        written_files = 0
+        
+        def report_progress(section: str):
+            if progress_callback and (written_files % PROGRESS_INTERVAL_FILES == 0 or written_files == total_files):
+                progress_callback(written_files, total_files, f"Writing {section}")
+        
+        writer = ReportWriter(out)
+        writer.lines([
+            "Enhanced Folder Comparison Summary - Content/Structural Analysis",
+            "=" * 60,
+            "",
+            "Folder Paths:",
+            f"- Original: {comparison_results.get('folder1_path', 'N/A')}",
+            f"- Modified: {comparison_results.get('folder2_path', 'N/A')}",
+            "",
+            "Processing Information:",
+            f"- Threading Used: {'Yes' if threading_stats.get('threading_used', False) else 'No'}",
+            f"- Fallback to Sequential: {'Yes' if threading_stats.get('fallback_to_sequential', False) else 'No'}",
+            f"- Parallel Processing Time: {threading_stats.get('parallel_parse_time', 0):.2f}s",
+            f"- Identical Files (not parsed): {threading_stats.get('identical_files_skipped', 0)}",
+            "",
+            "File-Level Changes:",
+            f"- Files Added: {folder_stats.get('files_added', 0)}",
+            f"- Files Deleted: {folder_stats.get('files_deleted', 0)}",
+            f"- Files with Content Changes: {folder_stats.get('files_with_content_changes', 0)}",
+            f"- Files with Structural Changes Only: {folder_stats.get('files_with_structural_only', 0)}",
+            f"- Files Unchanged: {folder_stats.get('files_unchanged', 0)}",
+            f"- Comparison Errors: {folder_stats.get('comparison_errors', 0)}",
+            "",
+            "Aggregated Requirement Changes:",
+            f"- Requirements Added: {req_stats.get('total_requirements_added', 0)}",
+            f"- Requirements Deleted: {req_stats.get('total_requirements_deleted', 0)}",
+            f"- Requirements Moved/Renamed: {req_stats.get('total_requirements_moved', 0)}",
+            f"- Requirements with Content Changes: {req_stats.get('total_requirements_content_modified', 0)}",
+            f"- Requirements with Structural Changes Only: {req_stats.get('total_requirements_structural_only', 0)}",
+            f"- Requirements Unchanged: {req_stats.get('total_requirements_unchanged', 0)}",
+            "",
+            f"Content Change Rate: {req_stats.get('content_change_percentage', 0)}%",
+            f"Overall Change Rate: {req_stats.get('overall_change_percentage', 0)}%",
+            "",
+            "Common Structural Changes:",
+        ])
+        
+        # Add common field changes
+        common_added = req_stats.get('common_added_fields', {})
+        common_removed = req_stats.get('common_removed_fields', {})
+        
+        if common_added:
+            top_added = sorted(common_added.items(), key=lambda x: x[1], reverse=True)[:5]
+            writer.line("- Most Common Added Fields:")
+            for field, count in top_added:
+                writer.line(f"    {field}: {count} files")
+        else:
+            writer.line("- No fields commonly added")
+        
+        if common_removed:
+            top_removed = sorted(common_removed.items(), key=lambda x: x[1], reverse=True)[:5]
+            writer.line("- Most Common Removed Fields:")
+            for field, count in top_removed:
+                writer.line(f"    {field}: {count} files")
+        else:
+            writer.line("- No fields commonly removed")
+        
+        writer.lines([
+            "",
+            "=" * 60,
+            "INDIVIDUAL FILE STATISTICS",
+            "=" * 60,
+        ])
+        writer.flush(stream=True)
+        
+        # Add individual file statistics
+        if matched_files:
+            writer.lines([
                 "",
-                "Common Structural Changes:",
-            ]
-            
-            # Add common field changes
-            common_added = req_stats.get('common_added_fields', {})
-            common_removed = req_stats.get('common_removed_fields', {})
-            
-            if common_added:
-                top_added = sorted(common_added.items(), key=lambda x: x[1], reverse=True)[:5]
-                summary_lines.append("- Most Common Added Fields:")
-                for field, count in top_added:
-                    summary_lines.append(f"    {field}: {count} files")
-            else:
-                summary_lines.append("- No fields commonly added")
-            
-            if common_removed:
-                top_removed = sorted(common_removed.items(), key=lambda x: x[1], reverse=True)[:5]
-                summary_lines.append("- Most Common Removed Fields:")
-                for field, count in top_removed:
-                    summary_lines.append(f"    {field}: {count} files")
-            else:
-                summary_lines.append("- No fields commonly removed")
+                f"Matched Files Details ({len(matched_files)}):",
+                "-" * 40
+            ])
             
-            summary_lines.extend([
+            for file_path, file_data in matched_files.items():
+                stats = file_data.get('comparison_stats', {})
+                match_type = file_data.get('match_type', 'unknown')
+                has_content_changes = file_data.get('has_content_changes', False)
+                has_structural_changes = file_data.get('has_structural_changes', False)
+                
+                if has_content_changes:
+                    status_icon = "🔄"
+                    status_text = "Content Changes"
+                elif has_structural_changes:
+                    status_icon = "📋"
+                    status_text = "Structural Only"
+                else:
+                    status_icon = "✓"
+                    status_text = "Unchanged"
+                
+                writer.line(f"{status_icon} {file_path} ({match_type} match) - {status_text}")
+                
+                if has_content_changes:
+                    content_count = stats.get('content_modified_count', 0)
+                    added = stats.get('added_count', 0)
+                    deleted = stats.get('deleted_count', 0)
+                    change_pct = stats.get('content_change_percentage', 0)
+                    writer.line(f"    Content: {content_count} modified, +{added}, -{deleted} ({change_pct}%)")
+                
+                if has_structural_changes:
+                    structural_count = stats.get('structural_only_count', 0)
+                    added_fields = stats.get('added_fields', [])
+                    removed_fields = stats.get('removed_fields', [])
+                    writer.line(f"    Structure: {structural_count} reqs, +{len(added_fields)} fields, -{len(removed_fields)} fields")
+                    if added_fields:
+                        writer.line(f"      Added: {', '.join(added_fields[:3])}")
+                    if removed_fields:
+                        writer.line(f"      Removed: {', '.join(removed_fields[:3])}")
+                
+                # File size information
+                file1_info = file_data.get('file1_info', {})
+                file2_info = file_data.get('file2_info', {})
+                if file1_info.get('size') and file2_info.get('size'):
+                    file1_size = round(file1_info['size'] / (1024 * 1024), 2)
+                    file2_size = round(file2_info['size'] / (1024 * 1024), 2)
+                    writer.line(f"    File sizes: {file1_size}MB → {file2_size}MB")
+                writer.line("")
+                
+                written_files += 1
+                report_progress("matched files")
+        
+        # Added and deleted files sections
+        for title, files in (("Added", added_files), ("Deleted", deleted_files)):
+            if not files:
+                continue
+            writer.lines([
                 "",
-                "=" * 60,
-                "INDIVIDUAL FILE STATISTICS",
-                "=" * 60,
+                f"{title} Files Details ({len(files)}):",
+                "-" * 40
             ])
             
-            # Add individual file statistics
-            if individual_stats.get('matched_files'):
-                summary_lines.extend([
-                    "",
-                    f"Matched Files Details ({len(individual_stats['matched_files'])}):",
-                    "-" * 40
-                ])
+            for file_path, file_data in files.items():
+                req_count = file_data.get('requirement_count', 0)
+                file_size = file_data.get('file_size_mb', 0)
+                parsing_success = file_data.get('parsing_success', False)
                 
-                for file_path, file_data in individual_stats['matched_files'].items():
-                    stats = file_data.get('comparison_stats', {})
-                    match_type = file_data.get('match_type', 'unknown')
-                    has_content_changes = file_data.get('has_content_changes', False)
-                    has_structural_changes = file_data.get('has_structural_changes', False)
-                    
-                    if has_content_changes:
-                        status_icon = "🔄"
-                        status_text = "Content Changes"
-                    elif has_structural_changes:
-                        status_icon = "📋"
-                        status_text = "Structural Only"
-                    else:
-                        status_icon = "✓"
-                        status_text = "Unchanged"
-                    
-                    summary_lines.append(f"{status_icon} {file_path} ({match_type} match) - {status_text}")
-                    
-                    if has_content_changes:
-                        content_count = stats.get('content_modified_count', 0)
-                        added = stats.get('added_count', 0)
-                        deleted = stats.get('deleted_count', 0)
-                        change_pct = stats.get('content_change_percentage', 0)
-                        summary_lines.append(f"    Content: {content_count} modified, +{added}, -{deleted} ({change_pct}%)")
-                    
-                    if has_structural_changes:
-                        structural_count = stats.get('structural_only_count', 0)
-                        added_fields = stats.get('added_fields', [])
-                        removed_fields = stats.get('removed_fields', [])
-                        summary_lines.append(f"    Structure: {structural_count} reqs, +{len(added_fields)} fields, -{len(removed_fields)} fields")
-                        if added_fields:
-                            summary_lines.append(f"      Added: {', '.join(added_fields[:3])}")
-                        if removed_fields:
-                            summary_lines.append(f"      Removed: {', '.join(removed_fields[:3])}")
-                    
-                    # File size information
-                    file1_info = file_data.get('file1_info', {})
-                    file2_info = file_data.get('file2_info', {})
-                    if file1_info.get('size') and file2_info.get('size'):
-                        file1_size = round(file1_info['size'] / (1024 * 1024), 2)
-                        file2_size = round(file2_info['size'] / (1024 * 1024), 2)
-                        summary_lines.append(f"    File sizes: {file1_size}MB → {file2_size}MB")
-                    summary_lines.append("")
-            
-            # Added files section
-            if individual_stats.get('added_files'):
-                summary_lines.extend([
-                    "",
-                    f"Added Files Details ({len(individual_stats['added_files'])}):",
-                    "-" * 40
-                ])
+                status_icon = "✅" if parsing_success else "❌"
+                writer.line(f"{status_icon} {file_path}")
+                writer.line(f"    Requirements: {req_count}")
+                writer.line(f"    File Size: {file_size}MB")
                 
-                for file_path, file_data in individual_stats['added_files'].items():
-                    req_count = file_data.get('requirement_count', 0)
-                    file_size = file_data.get('file_size_mb', 0)
-                    parsing_success = file_data.get('parsing_success', False)
-                    
-                    status_icon = "✅" if parsing_success else "❌"
-                    summary_lines.append(f"{status_icon} {file_path}")
-                    summary_lines.append(f"    Requirements: {req_count}")
-                    summary_lines.append(f"    File Size: {file_size}MB")
-                    
-                    if not parsing_success:
-                        error = file_data.get('error', 'Unknown error')
-                        summary_lines.append(f"    Error: {error}")
-                    summary_lines.append("")
-            
-            # Deleted files section
-            if individual_stats.get('deleted_files'):
-                summary_lines.extend([
-                    "",
-                    f"Deleted Files Details ({len(individual_stats['deleted_files'])}):",
-                    "-" * 40
-                ])
+                if not parsing_success:
+                    error = file_data.get('error', 'Unknown error')
+                    writer.line(f"    Error: {error}")
+                writer.line("")
                 
-                for file_path, file_data in individual_stats['deleted_files'].items():
-                    req_count = file_data.get('requirement_count', 0)
-                    file_size = file_data.get('file_size_mb', 0)
-                    parsing_success = file_data.get('parsing_success', False)
-                    
-                    status_icon = "✅" if parsing_success else "❌"
-                    summary_lines.append(f"{status_icon} {file_path}")
-                    summary_lines.append(f"    Requirements: {req_count}")
-                    summary_lines.append(f"    File Size: {file_size}MB")
-                    
-                    if not parsing_success:
-                        error = file_data.get('error', 'Unknown error')
-                        summary_lines.append(f"    Error: {error}")
-                    summary_lines.append("")
-            
-            return '\n'.join(summary_lines)
-            
-        except Exception as e:
-            return f"Error generating enhanced folder summary: {str(e)}"
+                written_files += 1
+                report_progress(f"{title.lower()} files")
+        
+        writer.flush(stream=True)
     
     def export_folder_summary(self, comparison_results: Dict[str, Any]) -> str:
         """Maintain compatibility - delegates to enhanced version"""
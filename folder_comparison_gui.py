@@ -5,6 +5,8 @@ Handles: Added, Deleted, Content Changed, Structural Changes, Unchanged
 """
 
 import os
+import atexit
+import tempfile
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import Dict, List, Tuple, Optional, Any
@@ -14,6 +16,8 @@ import json
 
 from reqif_comparator import ReqIFComparator
 from folder_comparator import FolderComparator
+from result_snapshot import save_folder_results, load_folder_results
+from report_export import ReportExportJob
 
 
 class FolderComparisonGUI:
@@ -28,6 +32,11 @@ class FolderComparisonGUI:
         self.current_comparison = None
         self.folder_comparator = FolderComparator()
         
+        # Per-file detail records of the last comparison (drill-down); removed on clear and exit
+        self.detail_path: Optional[str] = None
+        atexit.register(self.remove_detail_file)
+        self.root.bind('<Destroy>', self.on_destroy, add='+')
+        
         self.is_comparing = False
         self.selected_file = None
         
@@ -95,6 +104,9 @@ class FolderComparisonGUI:
         ttk.Button(button_frame, text="Export Results", 
                   command=self.export_results).pack(side=tk.LEFT, padx=(0, 10))
         
+        ttk.Button(button_frame, text="Load Results", 
+                  command=self.load_results).pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(button_frame, text="Clear Results", 
                   command=self.clear_results).pack(side=tk.LEFT)
         
@@ -287,8 +299,10 @@ class FolderComparisonGUI:
                     progress = (current / total) * 100 if total > 0 else 0
                     self.root.after(0, self.update_progress, progress, f"Processing: {filename}", current, total)
             
+            handle, self.detail_path = tempfile.mkstemp(prefix='reqif_folder_details_', suffix='.rqsnap')
+            os.close(handle)
             self.folder_results = self.folder_comparator.compare_folders(
-                folder1, folder2
+                folder1, folder2, detail_path=self.detail_path
             )
             
             if self.is_comparing:
@@ -577,7 +591,7 @@ class FolderComparisonGUI:
         details_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         details_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
-        details_content = []
+        details_content = self.format_requirement_changes(file_path)
         
         if comparison_stats.get('content_change_percentage', 0) > 0:
             details_content.append(f"Content Change Rate: {comparison_stats.get('content_change_percentage', 0)}%")
@@ -598,6 +612,22 @@ class FolderComparisonGUI:
                  font=('Arial', 11), relief='raised', bd=2, padx=20, pady=6,
                  cursor='hand2').pack(pady=(20, 0))
         
+    def format_requirement_changes(self, file_path: str, limit: int = 50) -> List[str]:
+        """Changed requirement IDs of one matched file, read from the detail records"""
+        details = self.folder_comparator.load_file_details(self.folder_results, file_path)
+        if details is None:
+            return []
+            
+        lines = []
+        for category in ('added', 'deleted', 'moved', 'content_modified', 'structural_only'):
+            entries = details.get(category) or []
+            if not entries:
+                continue
+            ids = [str(entry.get('id', '?')) for entry in entries[:limit]]
+            more = f" (+{len(entries) - limit} more)" if len(entries) > limit else ""
+            lines.append(f"{category.replace('_', ' ').title()} ({len(entries)}): {', '.join(ids)}{more}")
+        return lines
+        
     def export_results(self):
         """Export comparison results with updated format"""
         if not self.folder_results:
@@ -608,6 +638,7 @@ class FolderComparisonGUI:
             defaultextension=".txt",
             filetypes=[
                 ("Text files", "*.txt"),
+                ("Result snapshots", "*.rqsnap"),
                 ("JSON files", "*.json"),
                 ("CSV files", "*.csv"),
                 ("All files", "*.*")
@@ -619,12 +650,16 @@ class FolderComparisonGUI:
             return
             
         try:
-            if filename.endswith('.json'):
+            if filename.endswith('.rqsnap'):
+                self.export_as_snapshot(filename)
+            elif filename.endswith('.json'):
                 self.export_as_json(filename)
             elif filename.endswith('.csv'):
                 self.export_as_csv(filename)
             else:
+                # Written in the background; the export job reports completion
                 self.export_as_text(filename)
+                return
                 
             messagebox.showinfo("Export", f"Results exported successfully to:\n{filename}")
             
@@ -649,6 +684,47 @@ class FolderComparisonGUI:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(export_data, f, indent=2, default=str)
             
+    def export_as_snapshot(self, filename: str):
+        """Export complete results (including every requirement change) as a result snapshot"""
+        save_folder_results(filename, self.folder_results, {
+            'export_time': datetime.now().isoformat(),
+            'original_folder': self.folder1_var.get(),
+            'modified_folder': self.folder2_var.get()
+        })
+        
+    def load_results(self):
+        """Load results from a result snapshot instead of comparing again"""
+        if self.is_comparing:
+            return
+            
+        filename = filedialog.askopenfilename(
+            filetypes=[("Result snapshots", "*.rqsnap"), ("All files", "*.*")],
+            title="Load Folder Comparison Results"
+        )
+        
+        if not filename:
+            return
+            
+        try:
+            folder_results = load_folder_results(filename)
+        except Exception as e:
+            messagebox.showerror("Load Error", f"Failed to load results:\n{str(e)}")
+            return
+            
+        self.clear_results()
+        self.folder_results = folder_results
+        self.folder1_var.set(folder_results.get('folder1_path', ''))
+        self.folder2_var.set(folder_results.get('folder2_path', ''))
+        
+        self.progress_var.set(100)
+        self.current_file_label.config(text=f"Loaded {os.path.basename(filename)}")
+        
+        self.update_statistics()
+        self.update_file_tree()
+        self.update_summary()
+        
+        self.update_status(f"Results loaded from {filename}")
+        
     def export_as_csv(self, filename: str):
         """Export results as CSV"""
         import csv
@@ -686,39 +762,69 @@ class FolderComparisonGUI:
                 writer.writerow([file_path, "File Deleted", 0, req_count, 0, 0, 0])
                 
     def export_as_text(self, filename: str):
-        """Export results as formatted text"""
-        try:
-            summary_content = self.folder_comparator.export_folder_summary_enhanced(self.folder_results)
+        """Export results as formatted text, streamed to the file on a background thread"""
+        results = self.folder_results
+        
+        def progress_callback(current, total, status):
+            progress = (current / total) * 100 if total > 0 else 0
+            self.root.after(0, self.update_progress, progress, status, current, total)
+            
+        def done_callback(job):
+            self.root.after(0, self.text_export_finished, job)
+            
+        self.update_status(f"Exporting summary to {filename}...")
+        ReportExportJob(
+            lambda out, report_progress: self.folder_comparator.write_folder_summary(results, out, report_progress),
+            filename, progress_callback=progress_callback, done_callback=done_callback
+        ).start()
+        
+    def text_export_finished(self, job: ReportExportJob):
+        """Report the outcome of a background text export"""
+        if job.completed:
+            self.update_status(f"Summary exported ({job.stats['elapsed_seconds']:.1f}s)")
+            messagebox.showinfo("Export", f"Results exported successfully to:\n{job.path}")
+            return
+        if job.cancelled:
+            self.update_status("Export cancelled")
+            return
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(summary_content)
-                
+        try:
+            self.export_basic_text(job.path)
+            self.update_status("Detailed summary failed - exported basic statistics")
+            messagebox.showwarning("Export", f"Detailed summary failed ({job.error}); "
+                                   f"basic statistics exported to:\n{job.path}")
         except Exception as e:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("REQIF FOLDER COMPARISON RESULTS\n")
-                f.write("=" * 50 + "\n\n")
-                
-                f.write(f"Export Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Original Folder: {self.folder1_var.get()}\n")
-                f.write(f"Modified Folder: {self.folder2_var.get()}\n\n")
-                
-                folder_stats = self.folder_results.get('folder_statistics', {})
-                req_stats = self.folder_results.get('aggregated_statistics', {})
-                
-                f.write("SUMMARY STATISTICS:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"Total Files: {folder_stats.get('total_matched_files', 0)}\n")
-                f.write(f"Files with Changes: {folder_stats.get('files_with_content_changes', 0)}\n")
-                f.write(f"Requirements Added: {req_stats.get('total_requirements_added', 0)}\n")
-                f.write(f"Requirements Deleted: {req_stats.get('total_requirements_deleted', 0)}\n")
-                f.write(f"Content Modified: {req_stats.get('total_requirements_content_modified', 0)}\n")
-                f.write(f"Structural Changes: {req_stats.get('total_requirements_structural_only', 0)}\n")
-                f.write(f"Unchanged: {req_stats.get('total_requirements_unchanged', 0)}\n")
-                
+            messagebox.showerror("Export Error", f"Failed to export results:\n{str(e)}")
+            
+    def export_basic_text(self, filename: str):
+        """Export summary statistics only (fallback when the detailed summary fails)"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("REQIF FOLDER COMPARISON RESULTS\n")
+            f.write("=" * 50 + "\n\n")
+            
+            f.write(f"Export Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Original Folder: {self.folder1_var.get()}\n")
+            f.write(f"Modified Folder: {self.folder2_var.get()}\n\n")
+            
+            folder_stats = self.folder_results.get('folder_statistics', {})
+            req_stats = self.folder_results.get('aggregated_statistics', {})
+            
+            f.write("SUMMARY STATISTICS:\n")
+            f.write("-" * 30 + "\n")
+            f.write(f"Total Files: {folder_stats.get('total_matched_files', 0)}\n")
+            f.write(f"Files with Changes: {folder_stats.get('files_with_content_changes', 0)}\n")
+            f.write(f"Requirements Added: {req_stats.get('total_requirements_added', 0)}\n")
+            f.write(f"Requirements Deleted: {req_stats.get('total_requirements_deleted', 0)}\n")
+            f.write(f"Content Modified: {req_stats.get('total_requirements_content_modified', 0)}\n")
+            f.write(f"Structural Changes: {req_stats.get('total_requirements_structural_only', 0)}\n")
+            f.write(f"Unchanged: {req_stats.get('total_requirements_unchanged', 0)}\n")
+            
     def clear_results(self):
         """Clear all comparison results"""
         self.folder_results = {}
         self.selected_file = None
+        if not self.is_comparing:
+            self.remove_detail_file()
         
         for label in self.stats_labels.values():
             label.config(text="0")
@@ -737,6 +843,20 @@ class FolderComparisonGUI:
         
         self.update_status("Results cleared")
         
+    def remove_detail_file(self):
+        """Delete the detail records of the last comparison"""
+        if self.detail_path:
+            try:
+                os.remove(self.detail_path)
+            except OSError:
+                pass
+            self.detail_path = None
+            
+    def on_destroy(self, event):
+        """Clean up when the window closes"""
+        if event.widget is self.root:
+            self.remove_detail_file()
+            
     def update_status(self, message: str):
         """Update status bar message"""
         self.status_var.set(message)
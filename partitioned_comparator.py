@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Partitioned Comparator Module
+Compares one very large requirement pair in parallel worker processes by
+sharding both ID maps with a stable hash and merging the partition results.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import zlib
+
+from reqif_comparator import ReqIFComparator, ComparisonEntry
+from comparison_rules import ComparisonRules
+
+try:
+    from utils.config import get_threading_config
+except ImportError:
+    get_threading_config = None
+
+
+def partition_for_id(req_id: str, partitions: int) -> int:
+    """Stable partition number of a requirement ID (independent of PYTHONHASHSEED)"""
+    return zlib.crc32(str(req_id).encode('utf-8')) % partitions
+
+
+def _compact_entry(entry: Mapping) -> Tuple[Optional[str], Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Reduce a changed entry to (id, delta, comparison) so the parent can rebind its own requirements"""
+    if isinstance(entry, ComparisonEntry):
+        return entry.delta.get('id', entry.new.get('id')), entry.delta, entry.comparison
+    # Fallback entries from error paths are plain dicts; ship them as they are
+    return None, dict(entry), None
+
+
+def _compare_partition(file1_part: List[Dict[str, Any]], file2_part: List[Dict[str, Any]],
+                       options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: compare one partition and return IDs plus change deltas only"""
+    comparator = ReqIFComparator()
+    comparator.use_digest_fast_path = options.get('use_digest_fast_path', True)
+    comparator.eager_diffs = options.get('eager_diffs', False)
+    if options.get('rules'):
+        comparator.set_rules(ComparisonRules.from_dict(options['rules']))
+
+    results = comparator.compare_requirements(file1_part, file2_part, detect_moved=False)
+    stats = results.get('statistics', {})
+
+    return {
+        'added': [req['id'] for req in results.get('added', [])],
+        'deleted': [req['id'] for req in results.get('deleted', [])],
+        'unchanged': [req['id'] for req in results.get('unchanged', []) if isinstance(req, Mapping) and 'id' in req],
+        'content_modified': [_compact_entry(entry) for entry in results.get('content_modified', [])],
+        'structural_only': [_compact_entry(entry) for entry in results.get('structural_only', [])],
+        'added_fields': stats.get('added_fields', []),
+        'removed_fields': stats.get('removed_fields', []),
+        'field_changes': stats.get('field_change_histogram', {})
+    }
+
+
+class PartitionedComparator:
+    """
+    Process-parallel comparison of a single huge requirement pair
+
+    Both requirement sets are sharded by a stable CRC32 hash of the ID into K
+    partitions, so every common ID lands in the same partition on both sides.
+    Partitions are compared in a process pool and merged deterministically
+    (each category sorted by ID); moved detection runs once on the merged
+    added/deleted sets. Small inputs are compared in-process.
+    """
+
+    def __init__(self, processes: Optional[int] = None, partitions: Optional[int] = None,
+                 min_requirements: Optional[int] = None, comparator: Optional[ReqIFComparator] = None):
+        threading_config = get_threading_config() if get_threading_config else None
+
+        self.processes = processes or getattr(threading_config, 'compare_processes', 1) or 1
+        self.partitions = partitions or self.processes * 2
+        self.min_requirements = (min_requirements if min_requirements is not None
+                                 else getattr(threading_config, 'partition_min_requirements', 100000))
+        self.comparator = comparator or ReqIFComparator()
+
+        self.last_run_stats = {}
+
+    def compare_requirements(self, file1_reqs: List[Dict[str, Any]], file2_reqs: List[Dict[str, Any]],
+                             detect_moved: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Compare two sets of requirements, partitioned across worker processes when large
+
+        Args:
+            file1_reqs: Requirements from the first file (original)
+            file2_reqs: Requirements from the second file (modified)
+            detect_moved: Pair deleted/added requirements with similar content
+                (defaults to the comparator's setting)
+
+        Returns:
+            Same structure as ReqIFComparator.compare_requirements
+        """
+        total = len(file1_reqs) + len(file2_reqs)
+        if total < self.min_requirements or self.processes < 2 or self.partitions < 2:
+            self.last_run_stats = {'mode': 'in-process', 'partitions': 1}
+            return self.comparator.compare_requirements(file1_reqs, file2_reqs, detect_moved=detect_moved)
+
+        try:
+            return self._compare_partitioned(file1_reqs, file2_reqs, detect_moved)
+        except Exception as e:
+            print(f"Partitioned comparison failed, falling back to in-process: {e}")
+            self.last_run_stats = {'mode': 'in-process (fallback)', 'partitions': 1, 'error': str(e)}
+            return self.comparator.compare_requirements(file1_reqs, file2_reqs, detect_moved=detect_moved)
+
+    def _shard(self, requirements: List[Dict[str, Any]]) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+        """Split requirements into partitions and build the ID lookup used for merging"""
+        shards = [[] for _ in range(self.partitions)]
+        by_id = {}
+        for req in requirements:
+            if isinstance(req, Mapping) and req.get('id'):
+                shards[partition_for_id(req['id'], self.partitions)].append(req)
+                by_id[req['id']] = req
+        return shards, by_id
+
+    def _compare_partitioned(self, file1_reqs: List[Dict[str, Any]], file2_reqs: List[Dict[str, Any]],
+                             detect_moved: Optional[bool]) -> Dict[str, Any]:
+        """Run partitions in a process pool and merge the compact results"""
+        if detect_moved is None:
+            detect_moved = self.comparator.detect_moved
+
+        file1_shards, file1_dict = self._shard(file1_reqs)
+        file2_shards, file2_dict = self._shard(file2_reqs)
+
+        options = {
+            'use_digest_fast_path': self.comparator.use_digest_fast_path,
+            'eager_diffs': self.comparator.eager_diffs,
+            'rules': self.comparator.rules.to_dict() if self.comparator.rules else None
+        }
+
+        print(f"Partitioned comparison: {len(file1_dict)} vs {len(file2_dict)} requirements, "
+              f"{self.partitions} partitions on {self.processes} processes")
+
+        with ProcessPoolExecutor(max_workers=min(self.processes, self.partitions)) as executor:
+            futures = [executor.submit(_compare_partition, file1_shards[i], file2_shards[i], options)
+                       for i in range(self.partitions)]
+            # Collect in partition order so merging does not depend on completion order
+            partition_results = [future.result() for future in futures]
+
+        added_ids, deleted_ids, unchanged_ids = [], [], []
+        content_records, structural_records = [], []
+        all_added_fields, all_removed_fields = set(), set()
+        field_changes = {}
+        for part in partition_results:
+            added_ids.extend(part['added'])
+            deleted_ids.extend(part['deleted'])
+            unchanged_ids.extend(part['unchanged'])
+            content_records.extend(part['content_modified'])
+            structural_records.extend(part['structural_only'])
+            all_added_fields.update(part['added_fields'])
+            all_removed_fields.update(part['removed_fields'])
+            for field, count in part['field_changes'].items():
+                field_changes[field] = field_changes.get(field, 0) + count
+
+        # Rebind to the caller's requirement objects and order every category by ID
+        added = [file2_dict[req_id] for req_id in sorted(added_ids)]
+        deleted = [file1_dict[req_id] for req_id in sorted(deleted_ids)]
+        unchanged = [file2_dict[req_id] for req_id in sorted(unchanged_ids)]
+        content_modified = self._rebuild_entries(content_records, file1_dict, file2_dict)
+        structural_only = self._rebuild_entries(structural_records, file1_dict, file2_dict)
+
+        moved = []
+        if detect_moved and added and deleted:
+            moved, added, deleted = self.comparator._detect_moved_requirements(deleted, added)
+
+        stats = self.comparator._build_statistics(len(file1_reqs), len(file2_reqs), added, deleted, moved,
+                                                  content_modified, structural_only, unchanged,
+                                                  all_added_fields, all_removed_fields, field_changes)
+
+        self.last_run_stats = {
+            'mode': 'partitioned',
+            'partitions': self.partitions,
+            'processes': self.processes,
+            'partition_sizes': [len(file1_shards[i]) + len(file2_shards[i]) for i in range(self.partitions)]
+        }
+
+        return {
+            'added': added,
+            'deleted': deleted,
+            'moved': moved,
+            'content_modified': content_modified,
+            'structural_only': structural_only,
+            'unchanged': unchanged,
+            'statistics': stats
+        }
+
+    def _rebuild_entries(self, records: List[Tuple], file1_dict: Dict[str, Dict[str, Any]],
+                         file2_dict: Dict[str, Dict[str, Any]]) -> List[Mapping]:
+        """Turn (id, delta, comparison) records back into entries referencing local requirements"""
+        entries = []
+        for req_id, delta, comparison in sorted(records, key=lambda record: str(record[0] or record[1].get('id', ''))):
+            if req_id is None or req_id not in file1_dict or req_id not in file2_dict:
+                entries.append(delta)
+            else:
+                entries.append(ComparisonEntry(file1_dict[req_id], file2_dict[req_id], delta, comparison))
+        return entries
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Partitioned Comparator - process-parallel comparison of large requirement pairs")
+
+    # comparator = PartitionedComparator(processes=8)
+    # results = comparator.compare_requirements(file1_reqs, file2_reqs)
+    # print(comparator.last_run_stats)
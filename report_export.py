@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Report Export Module
+Streams text reports to files: ReportWriter hands lines to a text stream in
+chunks instead of building one large string, and ReportExportJob runs a
+report writer on a background thread with progress, cancellation and an
+atomic rename of the finished file.
+"""
+
+from typing import Callable, Optional, Iterable, TextIO, Dict, Any
+import os
+import threading
+import time
+
+
+# Lines buffered before they are written to the stream
+DEFAULT_CHUNK_LINES = 512
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class ExportCancelled(Exception):
+    """Raised inside a report writer when its export job is cancelled"""
+
+
+class ReportWriter:
+    """
+    Line-oriented writer for text reports
+
+    Lines are joined with newlines exactly like '\\n'.join(lines) (no trailing
+    newline), so streaming and string reports are identical.
+    """
+
+    def __init__(self, out: TextIO, chunk_lines: int = DEFAULT_CHUNK_LINES):
+        self.out = out
+        self.chunk_lines = chunk_lines
+        self._pending = []
+        self._started = False
+
+    def line(self, text: str = ''):
+        """Append one line"""
+        self._pending.append(text)
+        if len(self._pending) >= self.chunk_lines:
+            self.flush()
+
+    def lines(self, texts: Iterable[str]):
+        """Append several lines"""
+        for text in texts:
+            self.line(text)
+
+    def flush(self, stream: bool = False):
+        """
+        Write pending lines
+
+        Args:
+            stream: Also flush the underlying stream (e.g. after the report
+                header, so the first bytes reach the file immediately)
+        """
+        if self._pending:
+            text = '\n'.join(self._pending)
+            self.out.write(('\n' + text) if self._started else text)
+            self._started = True
+            self._pending = []
+        if stream and hasattr(self.out, 'flush'):
+            self.out.flush()
+
+
+class _JobStream:
+    """Text stream wrapper that counts characters, records the first write and honours cancellation"""
+
+    def __init__(self, out: TextIO, job: 'ReportExportJob'):
+        self._out = out
+        self._job = job
+
+    def write(self, text: str) -> int:
+        job = self._job
+        if job.cancel_event.is_set():
+            raise ExportCancelled()
+        if job.stats['first_write_seconds'] is None:
+            job.stats['first_write_seconds'] = time.perf_counter() - job._start_time
+        job.stats['characters_written'] += len(text)
+        return self._out.write(text)
+
+    def flush(self):
+        self._out.flush()
+
+
+class ReportExportJob:
+    """
+    Write a report to a file on a background thread
+
+    The report function is called as write_report(stream, progress_callback)
+    and should write sections as it produces them. Output goes to
+    '<path>.part' and is renamed to path on success; a cancelled or failed
+    export leaves no partial file behind.
+    """
+
+    def __init__(self, write_report: Callable[[TextIO, ProgressCallback], None], path: str,
+                 progress_callback: Optional[ProgressCallback] = None,
+                 done_callback: Optional[Callable[['ReportExportJob'], None]] = None,
+                 encoding: str = 'utf-8'):
+        """
+        Args:
+            write_report: Report function taking (stream, progress_callback)
+            path: Output file path
+            progress_callback: Called as (current, total, status) from the export thread
+            done_callback: Called with the job when it finished, failed or was cancelled
+            encoding: Output file encoding
+        """
+        self.write_report = write_report
+        self.path = path
+        self.progress_callback = progress_callback
+        self.done_callback = done_callback
+        self.encoding = encoding
+
+        self.cancel_event = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        self.completed = False
+        self.stats: Dict[str, Any] = {
+            'characters_written': 0,
+            'first_write_seconds': None,
+            'elapsed_seconds': 0.0
+        }
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = 0.0
+
+    def start(self) -> 'ReportExportJob':
+        """Start the export thread"""
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="report-export", daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self) -> 'ReportExportJob':
+        """Run the export on the calling thread"""
+        self._start_time = time.perf_counter()
+        self._run()
+        return self
+
+    def cancel(self):
+        """Stop the export at its next write"""
+        self.cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the export thread; returns True when it has finished"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        partial_path = f"{self.path}.part"
+        try:
+            with open(partial_path, 'w', encoding=self.encoding) as f:
+                self.write_report(_JobStream(f, self), self._report_progress)
+            os.replace(partial_path, self.path)
+            self.completed = True
+        except ExportCancelled:
+            self.cancelled = True
+        except Exception as e:
+            print(f"Report export to {self.path} failed: {e}")
+            self.error = e
+        finally:
+            if not self.completed:
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+            self.stats['elapsed_seconds'] = time.perf_counter() - self._start_time
+            if self.done_callback:
+                try:
+                    self.done_callback(self)
+                except Exception as e:
+                    print(f"Error in export done callback: {e}")
+
+    def _report_progress(self, current: int, total: int, status: str):
+        if self.cancel_event.is_set():
+            raise ExportCancelled()
+        if self.progress_callback:
+            self.progress_callback(current, total, status)
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Report Export - streaming text reports on a background thread")
+
+    # job = ReportExportJob(lambda out, progress: folder_comparator.write_folder_summary(results, out, progress),
+    #                       "summary.txt", progress_callback=print)
+    # job.start().wait()
+    # print(job.stats)
@@ -5,9 +5,345 @@ Handles comparison logic between two sets of requirements with clear separation
 between content modifications and structural differences.
 """
 
-from typing import List, Dict, Any, Tuple, Set
-import difflib
+from typing import List, Dict, Any, Tuple, Set, Optional, Iterator, Callable, TextIO
+from collections.abc import Mapping
+import functools
+import hashlib
+from datetime import datetime
+import io
 import os
+import sys
+import threading
+
+from reqif_similarity import MovedRequirementDetector, SimilarityIndex, bounded_ratio
+from comparison_rules import ComparisonRules
+from text_diff import word_diff_lines
+from report_export import ReportWriter
+
+
+# Fields never part of the comparison digest (attributes are hashed separately)
+DIGEST_EXCLUDED_FIELDS = frozenset({'content', 'raw_attributes', 'typed_attributes', 'attributes', '_comparison_data'})
+
+# Fields never compared field by field ('attributes' is compared as a whole and per attribute)
+PROFILE_EXCLUDED_FIELDS = frozenset({'content', 'raw_attributes', 'typed_attributes', '_comparison_data'})
+
+# Marks an ID of the first file already matched by compare_statistics
+_MATCHED = object()
+
+
+def _with_call_caches(method):
+    """
+    Run a comparison entry point with digest and profile caches that live for its outermost call
+    
+    Digests and comparison profiles are kept per thread in comparator-owned
+    maps, id(req) -> (req, value), and dropped when the outermost call returns.
+    Holding the requirement keeps its id from being reused while the entry is
+    alive; nothing is written into the caller's requirement dicts, so edited
+    or copied requirements are never judged by a stale digest or profile.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        caches = self._call_caches
+        if getattr(caches, 'digests', None) is not None:
+            return method(self, *args, **kwargs)
+        caches.digests = {}
+        caches.profiles = {}
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            caches.digests = None
+            caches.profiles = None
+    return wrapper
+
+
+def comparable_typed_value(typed_value: Any) -> str:
+    """
+    Canonical text of a native INTEGER/REAL/DATE/BOOLEAN attribute value
+    
+    "1" and "1.0" of a REAL, or one instant in different time zones, give the
+    same text; the leading XML-illegal marker keeps it apart from string values.
+    """
+    if isinstance(typed_value, datetime):
+        typed_value = typed_value.timestamp()
+    return f"\x1c{typed_value!r}"
+
+
+def field_similarity(old_value: str, new_value: str) -> float:
+    """Similarity ratio of two field values rounded to 3 decimals"""
+    if not old_value and not new_value:
+        return 1.0
+    if not old_value or not new_value:
+        return 0.0
+    
+    return round(bounded_ratio(str(old_value), str(new_value)), 3)
+
+
+class LazyFieldDiff(Mapping):
+    """
+    Detailed change entry for one field that computes its diff on first access
+    
+    Behaves like the dict {'change_type', 'old_value', 'new_value', 'diff_lines',
+    'similarity'} but only holds references to the two values until diff_lines
+    or similarity is read; results are memoised.
+    """
+    
+    _KEYS = ('change_type', 'old_value', 'new_value', 'diff_lines', 'similarity')
+    
+    __slots__ = ('old_value', 'new_value', '_diff_lines', '_similarity')
+    
+    def __init__(self, old_value: str, new_value: str):
+        self.old_value = old_value
+        self.new_value = new_value
+        self._diff_lines = None
+        self._similarity = None
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'change_type':
+            return 'modified'
+        if key == 'old_value':
+            return self.old_value
+        if key == 'new_value':
+            return self.new_value
+        if key == 'diff_lines':
+            if self._diff_lines is None:
+                try:
+                    self._diff_lines = (word_diff_lines(str(self.old_value), str(self.new_value))
+                                        if self.old_value and self.new_value else [])
+                except Exception as e:
+                    print(f"Error generating diff: {e}")
+                    self._diff_lines = []
+            return self._diff_lines
+        if key == 'similarity':
+            if self._similarity is None:
+                try:
+                    self._similarity = field_similarity(self.old_value, self.new_value)
+                except Exception as e:
+                    print(f"Error calculating similarity: {e}")
+                    self._similarity = 0.0
+            return self._similarity
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __getstate__(self):
+        return (self.old_value, self.new_value, self._diff_lines, self._similarity)
+    
+    def __setstate__(self, state):
+        self.old_value, self.new_value, self._diff_lines, self._similarity = state
+    
+    @property
+    def is_computed(self) -> bool:
+        """True once both diff lines and similarity have been computed"""
+        return self._diff_lines is not None and self._similarity is not None
+    
+    def materialize(self) -> 'LazyFieldDiff':
+        """Compute diff lines and similarity now (used for exports)"""
+        self['diff_lines']
+        self['similarity']
+        return self
+
+
+# Interned 'attribute.<name>' keys shared by all profiles
+_ATTRIBUTE_KEYS: Dict[str, str] = {}
+
+
+def _attribute_key(attr_name: str) -> str:
+    """Interned comparison key of an attribute"""
+    key = _ATTRIBUTE_KEYS.get(attr_name)
+    if key is None:
+        key = sys.intern(f'attribute.{attr_name}')
+        _ATTRIBUTE_KEYS[attr_name] = key
+    return key
+
+
+class ComparisonProfile:
+    """
+    Comparison view of one requirement, built once per comparison call
+    
+    Holds the comparable field keys ('attribute.' prefix included) as an
+    interned tuple, their normalised values in the same order and the native
+    values of typed attributes. Pairs with the same key tuple are compared
+    position by position without any lookups; the key set, positions and
+    per-field hashes are only built when a pair needs them.
+    
+    With a compiled ComparisonRules function, ignored fields and attributes
+    are left out and attribute values are the normalised ones.
+    """
+    
+    __slots__ = ('keys', 'values', 'typed', '_key_set', '_positions', '_hashes')
+    
+    def __init__(self, req: Mapping, normalize: Optional[Callable[[Mapping], Any]] = None):
+        keys = []
+        values = []
+        typed = {}
+        
+        if normalize is not None:
+            self._init_normalized(req, normalize, keys, values, typed)
+        else:
+            self._init_plain(req, keys, values, typed)
+        
+        self.keys = tuple(keys)
+        self.values = tuple(values)
+        self.typed = typed
+        self._key_set = None
+        self._positions = None
+        self._hashes = None
+    
+    def _init_plain(self, req: Mapping, keys: List[str], values: List[str], typed: Dict[str, Any]):
+        """Collect every comparable field and attribute"""
+        for field, value in req.items():
+            if field in PROFILE_EXCLUDED_FIELDS or field[:1] == '_':
+                continue
+            keys.append(sys.intern(field))
+            values.append(str(value).strip() if value is not None else '')
+        
+        attributes = req.get('attributes')
+        if isinstance(attributes, dict):
+            typed_attributes = req.get('typed_attributes') or {}
+            attribute_key = _ATTRIBUTE_KEYS.get
+            for attr_name, attr_value in attributes.items():
+                key = attribute_key(attr_name) or _attribute_key(attr_name)
+                keys.append(key)
+                values.append(attr_value.strip() if type(attr_value) is str
+                              else str(attr_value).strip() if attr_value is not None else '')
+                if attr_name in typed_attributes:
+                    typed[key] = typed_attributes[attr_name]
+    
+    def _init_normalized(self, req: Mapping, normalize: Callable[[Mapping], Any], keys: List[str],
+                         values: List[str], typed: Dict[str, Any]):
+        """Collect the fields and attributes the comparison rules keep, with normalised values"""
+        fields, attributes = normalize(req)
+        for field, value in fields:
+            keys.append(sys.intern(field))
+            values.append(value)
+        
+        if 'attributes' in req:
+            # The whole-dict field only reflects what the rules keep
+            keys.append('attributes')
+            values.append(str(dict(attributes)) if isinstance(req['attributes'], dict)
+                          else str(req['attributes']).strip())
+        
+        typed_attributes = req.get('typed_attributes') or {}
+        for attr_name, value in attributes:
+            key = _attribute_key(attr_name)
+            keys.append(key)
+            values.append(value.strip())
+            if attr_name in typed_attributes:
+                typed[key] = typed_attributes[attr_name]
+    
+    def __getstate__(self):
+        return (self.keys, self.values, self.typed)
+    
+    def __setstate__(self, state):
+        keys, self.values, self.typed = state
+        self.keys = tuple(sys.intern(key) for key in keys)
+        self._key_set = None
+        self._positions = None
+        self._hashes = None
+    
+    @property
+    def key_set(self) -> frozenset:
+        """Field keys as a set"""
+        if self._key_set is None:
+            self._key_set = frozenset(self.keys)
+        return self._key_set
+    
+    @property
+    def hashes(self) -> Tuple[int, ...]:
+        """Per-field value hashes aligned with keys (per process, never pickled)"""
+        if self._hashes is None:
+            self._hashes = tuple(map(hash, self.values))
+        return self._hashes
+    
+    def positions(self) -> Dict[str, int]:
+        """Field key -> index into keys/values"""
+        if self._positions is None:
+            self._positions = {key: index for index, key in enumerate(self.keys)}
+        return self._positions
+    
+    def common_fields(self, other: 'ComparisonProfile') -> Iterator[Tuple[str, str, str]]:
+        """Yield (key, value, other value) for the fields both profiles have, in this profile's order"""
+        if self.keys == other.keys:
+            yield from zip(self.keys, self.values, other.values)
+            return
+        
+        other_positions = other.positions()
+        other_values = other.values
+        for index, key in enumerate(self.keys):
+            other_index = other_positions.get(key)
+            if other_index is not None:
+                yield key, self.values[index], other_values[other_index]
+    
+    def changed_fields(self, other: 'ComparisonProfile') -> Iterator[Tuple[str, str, str]]:
+        """Yield (key, value, other value) for common fields whose normalised values differ"""
+        if self.keys == other.keys:
+            if self.values == other.values:
+                return
+            # Hashes are cached on the strings, so unequal fields rarely need a full compare
+            for key, value1, value2, hash1, hash2 in zip(self.keys, self.values, other.values,
+                                                        self.hashes, other.hashes):
+                if hash1 != hash2 or value1 != value2:
+                    yield key, value1, value2
+            return
+        
+        for key, value1, value2 in self.common_fields(other):
+            if value1 != value2:
+                yield key, value1, value2
+
+
+class ComparisonEntry(Mapping):
+    """
+    Result entry for a changed requirement that references both versions instead of copying them
+    
+    Reads like the former entry dict: the fields of the new requirement, overlaid
+    with the change metadata in delta, plus '_comparison_data' holding the old
+    and new requirement objects and the change details. Internal keys of the
+    requirement (underscore-prefixed, e.g. the parser's '_datatypes') can be
+    read but are not listed, so dict(entry) and exports only carry real fields.
+    """
+    
+    __slots__ = ('old', 'new', 'delta', 'comparison')
+    
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any], delta: Dict[str, Any],
+                 comparison: Optional[Dict[str, Any]] = None):
+        self.old = old
+        self.new = new
+        self.delta = delta
+        self.comparison = comparison or {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.delta:
+            return self.delta[key]
+        if key == '_comparison_data':
+            comparison_data = {'old': self.old, 'new': self.new}
+            comparison_data.update(self.comparison)
+            return comparison_data
+        return self.new[key]
+    
+    def __contains__(self, key) -> bool:
+        return key in self.delta or key == '_comparison_data' or key in self.new
+    
+    def __iter__(self) -> Iterator[str]:
+        delta = self.delta
+        for key in self.new:
+            if key not in delta and key[:1] != '_':
+                yield key
+        yield from delta
+        yield '_comparison_data'
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"ComparisonEntry(id={self.get('id')!r}, delta={self.delta!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialise the entry as a plain dict"""
+        return dict(self.items())
 
 
 class ReqIFComparator:
@@ -15,20 +351,68 @@ class ReqIFComparator:
     
     def __init__(self):
         self.similarity_threshold = 0.8  # For fuzzy matching (future use)
+        self.use_digest_fast_path = True  # Skip field analysis when requirement digests match
+        self.detect_moved = True  # Pair deleted/added requirements with near-identical content
+        self.eager_diffs = False  # Compute detailed diffs up front instead of on first access
+        self.moved_threshold = 0.8  # Minimum shingle Jaccard similarity for a move/rename
         
+        # Ignore/normalisation rules (see set_rules)
+        self.rules = None
+        self._normalize = None
+        
+        # Per-thread digest and profile caches of the running comparison call (see _with_call_caches)
+        self._call_caches = threading.local()
+        
+        # Last SimilarityIndex built by find_similar_requirements, the list it indexes
+        # and that list's length (see invalidate_similarity_index for in-place edits)
+        self._similarity_index = None
+        self._similarity_index_source = None
+        self._similarity_index_size = None
+    
+    def set_rules(self, rules: Optional[ComparisonRules]):
+        """
+        Apply ignore/normalisation rules to all following comparisons
+        
+        The rules are compiled once and used when digests and comparison
+        profiles are built, so ignored attributes and normalised differences
+        are neither hashed nor compared.
+        
+        Args:
+            rules: ComparisonRules to apply (None or empty rules to compare everything)
+        """
+        if rules is None or rules.is_empty:
+            self.rules = None
+            self._normalize = None
+        else:
+            self.rules = rules
+            self._normalize = rules.compile()
+        
+    @_with_call_caches
     def compare_requirements(self, file1_reqs: List[Dict[str, Any]], 
-                           file2_reqs: List[Dict[str, Any]]) -> Dict[str, Any]:
+                           file2_reqs: List[Dict[str, Any]],
+                           detect_moved: Optional[bool] = None,
+                           stats_only: bool = False) -> Dict[str, Any]:
         """
         Compare two sets of requirements and categorize differences
         
         Args:
             file1_reqs: Requirements from the first file (original)
             file2_reqs: Requirements from the second file (modified)
+            detect_moved: Pair deleted/added requirements with similar content
+                (defaults to self.detect_moved)
+            stats_only: Only count categories (see compare_statistics); the
+                category lists in the result are left empty
             
         Returns:
-            Dictionary with categorized results: added, deleted, content_modified, 
+            Dictionary with categorized results: added, deleted, moved, content_modified, 
             structural_only, unchanged
         """
+        if detect_moved is None:
+            detect_moved = self.detect_moved
+        
+        if stats_only:
+            return self.compare_statistics(file1_reqs, file2_reqs, detect_moved=detect_moved)
+        
         print(f"Starting comparison: {len(file1_reqs)} vs {len(file2_reqs)} requirements")
         
         try:
@@ -90,30 +474,25 @@ class ReqIFComparator:
             # Track structural changes across all files
             all_added_fields = set()
             all_removed_fields = set()
+            field_changes = {}
             
             for req_id in common_ids:
                 try:
-                    req1 = file1_dict[req_id]
-                    req2 = file2_dict[req_id]
+                    category, entry, comparison_result = self.classify_common_requirement(
+                        req_id, file1_dict[req_id], file2_dict[req_id])
                     
-                    # Analyze changes
-                    comparison_result = self._analyze_requirement_changes(req1, req2)
-                    
-                    if comparison_result['has_content_changes']:
-                        # Create entry for content modifications
-                        modified_entry = self._create_content_modified_entry(req_id, req1, req2, comparison_result)
-                        content_modified.append(modified_entry)
-                    elif comparison_result['has_structural_changes']:
-                        # Create entry for structural-only changes
-                        structural_entry = self._create_structural_entry(req_id, req1, req2, comparison_result)
-                        structural_only.append(structural_entry)
+                    if category == 'content_modified':
+                        content_modified.append(entry)
+                    elif category == 'structural_only':
+                        structural_only.append(entry)
                     else:
-                        # Completely identical
-                        unchanged.append(req2)
+                        unchanged.append(entry)
                     
                     # Track field changes for statistics
-                    all_added_fields.update(comparison_result['added_fields'])
-                    all_removed_fields.update(comparison_result['removed_fields'])
+                    if comparison_result:
+                        all_added_fields.update(comparison_result['added_fields'])
+                        all_removed_fields.update(comparison_result['removed_fields'])
+                        self._count_field_changes(field_changes, comparison_result)
                         
                 except Exception as e:
                     print(f"Error processing common requirement {req_id}: {e}")
@@ -124,30 +503,24 @@ class ReqIFComparator:
                         pass
                     continue
             
-            print(f"Final counts: Added={len(added)}, Deleted={len(deleted)}, "
+            # Re-exported requirements with regenerated IDs: one delete plus one add
+            moved = []
+            if detect_moved and added and deleted:
+                moved, added, deleted = self._detect_moved_requirements(deleted, added)
+            
+            print(f"Final counts: Added={len(added)}, Deleted={len(deleted)}, Moved={len(moved)}, "
                   f"Content Modified={len(content_modified)}, Structural Only={len(structural_only)}, "
                   f"Unchanged={len(unchanged)}")
             
             # Calculate statistics
-            total_reqs = len(file1_reqs) + len(added)
-            stats = {
-                'total_file1': len(file1_reqs),
-                'total_file2': len(file2_reqs),
-                'total_unique': total_reqs,
-                'added_count': len(added),
-                'deleted_count': len(deleted),
-                'content_modified_count': len(content_modified),
-                'structural_only_count': len(structural_only),
-                'unchanged_count': len(unchanged),
-                'content_change_percentage': round((len(content_modified)) / max(total_reqs, 1) * 100, 2),
-                'total_change_percentage': round((len(added) + len(deleted) + len(content_modified)) / max(total_reqs, 1) * 100, 2),
-                'added_fields': sorted(list(all_added_fields)),
-                'removed_fields': sorted(list(all_removed_fields))
-            }
+            stats = self._build_statistics(len(file1_reqs), len(file2_reqs), added, deleted, moved,
+                                           content_modified, structural_only, unchanged,
+                                           all_added_fields, all_removed_fields, field_changes)
             
             return {
                 'added': added,
                 'deleted': deleted,
+                'moved': moved,
                 'content_modified': content_modified,
                 'structural_only': structural_only,
                 'unchanged': unchanged,
@@ -163,6 +536,7 @@ class ReqIFComparator:
             return {
                 'added': [],
                 'deleted': [],
+                'moved': [],
                 'content_modified': [],
                 'structural_only': [],
                 'unchanged': [],
@@ -172,20 +546,414 @@ class ReqIFComparator:
                     'total_unique': 0,
                     'added_count': 0,
                     'deleted_count': 0,
+                    'moved_count': 0,
                     'content_modified_count': 0,
                     'structural_only_count': 0,
                     'unchanged_count': 0,
                     'content_change_percentage': 0.0,
                     'total_change_percentage': 0.0,
                     'added_fields': [],
-                    'removed_fields': []
+                    'removed_fields': [],
+                    'field_change_histogram': {}
                 }
             }
     
-    def _analyze_requirement_changes(self, req1: Dict[str, Any], req2: Dict[str, Any]) -> Dict[str, Any]:
+    def classify_common_requirement(self, req_id: str, req1: Dict[str, Any],
+                                    req2: Dict[str, Any]) -> Tuple[str, Mapping, Optional[Dict[str, Any]]]:
+        """
+        Classify one requirement present in both files
+        
+        Args:
+            req_id: Requirement ID shared by both versions
+            req1: Requirement from the first file (original)
+            req2: Requirement from the second file (modified)
+            
+        Returns:
+            Tuple of (category, entry, comparison result or None when the digest
+            fast path decided the pair is unchanged)
+        """
+        # Fast path: identical digests mean no content or structural change
+        if self.use_digest_fast_path and self.get_requirement_digest(req1) == self.get_requirement_digest(req2):
+            return 'unchanged', req2, None
+        
+        comparison_result = self._analyze_requirement_changes(req1, req2)
+        
+        if comparison_result['has_content_changes']:
+            return 'content_modified', self._create_content_modified_entry(req_id, req1, req2, comparison_result), comparison_result
+        if comparison_result['has_structural_changes']:
+            return 'structural_only', self._create_structural_entry(req_id, req1, req2, comparison_result), comparison_result
+        return 'unchanged', req2, comparison_result
+    
+    @_with_call_caches
+    def compare_statistics(self, file1_reqs: List[Dict[str, Any]], file2_reqs: List[Dict[str, Any]],
+                           detect_moved: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Counts-only comparison for gating: categorise requirements without building entries
+        
+        Equal requirement dicts are unchanged after one C-level comparison,
+        without digests or a per-field walk in Python; pairs that differ only
+        in fields the digest ignores are caught by a field check, and only the
+        rest get a field-level analysis of the fields and attributes that
+        differ (no diffs, no entries, no cached profiles). A single ID
+        map over the first file is kept (matched IDs are marked in it instead
+        of building a second map), and nothing from the inputs is retained in
+        the result.
+        
+        Args:
+            file1_reqs: Requirements from the first file (original)
+            file2_reqs: Requirements from the second file (modified)
+            detect_moved: Count deleted/added pairs with similar content as moved
+                (defaults to self.detect_moved)
+            
+        Returns:
+            Dictionary with 'statistics', 'stats_only': True and empty category lists
+        """
+        if detect_moved is None:
+            detect_moved = self.detect_moved
+        
+        counts = {'added': 0, 'deleted': 0, 'moved': 0, 'content_modified': 0,
+                  'structural_only': 0, 'unchanged': 0}
+        added_fields, removed_fields = set(), set()
+        field_changes = {}
+        
+        try:
+            file1_dict = {req['id']: req for req in file1_reqs
+                          if (type(req) is dict or isinstance(req, Mapping)) and req.get('id')}
+            
+            # Only kept when moved detection needs them; released on return
+            added, deleted = [], []
+            
+            # Backwards, so the last requirement with an ID wins like in compare_requirements
+            for req2 in reversed(file2_reqs):
+                if not (type(req2) is dict or isinstance(req2, Mapping)):
+                    continue
+                req_id = req2.get('id')
+                if not req_id:
+                    continue
+                req1 = file1_dict.get(req_id)
+                if req1 is _MATCHED:
+                    continue
+                file1_dict[req_id] = _MATCHED
+                
+                if req1 is None:
+                    counts['added'] += 1
+                    if detect_moved:
+                        added.append(req2)
+                    continue
+                
+                if req1 == req2 or self._requirements_identical(req1, req2):
+                    counts['unchanged'] += 1
+                    continue
+                
+                # Each pair is analysed once, so its profiles are not kept in the call cache
+                if self._normalize is None:
+                    req1, req2 = self._differing_parts(req1, req2)
+                analysis = self._analyze_requirement_changes(req1, req2, ComparisonProfile(req1, self._normalize),
+                                                             ComparisonProfile(req2, self._normalize))
+                if analysis['has_content_changes']:
+                    counts['content_modified'] += 1
+                elif analysis['has_structural_changes']:
+                    counts['structural_only'] += 1
+                else:
+                    counts['unchanged'] += 1
+                added_fields.update(analysis['added_fields'])
+                removed_fields.update(analysis['removed_fields'])
+                self._count_field_changes(field_changes, analysis)
+            
+            for req1 in file1_dict.values():
+                if req1 is not _MATCHED:
+                    counts['deleted'] += 1
+                    if detect_moved:
+                        deleted.append(req1)
+            
+            if detect_moved and added and deleted:
+                added.reverse()
+                try:
+                    pairs = MovedRequirementDetector(threshold=self.moved_threshold).find_moved(deleted, added)
+                except Exception as e:
+                    print(f"Error detecting moved requirements: {e}")
+                    pairs = []
+                counts['moved'] = len(pairs)
+                counts['added'] -= len(pairs)
+                counts['deleted'] -= len(pairs)
+                
+        except Exception as e:
+            print(f"Error in compare_statistics: {e}")
+        
+        stats = self._build_statistics_from_counts(len(file1_reqs), len(file2_reqs), counts,
+                                                   added_fields, removed_fields, field_changes)
+        
+        result = {category: [] for category in counts}
+        result['statistics'] = stats
+        result['stats_only'] = True
+        return result
+    
+    def _requirements_identical(self, req1: Dict[str, Any], req2: Dict[str, Any]) -> bool:
+        """
+        Sufficient check that two requirements would get equal digests
+        
+        Uses the digests of this call when both are cached; otherwise compares
+        the hashed fields directly, which is far cheaper than computing two digests.
+        """
+        digests = getattr(self._call_caches, 'digests', None)
+        if digests:
+            cached1 = digests.get(id(req1))
+            cached2 = digests.get(id(req2))
+            if cached1 is not None and cached2 is not None:
+                return cached1[1] == cached2[1]
+        
+        keys1 = req1.keys()
+        keys2 = req2.keys()
+        if keys1 != keys2:
+            # Only internal or excluded keys may be present on one side
+            for field in keys1 ^ keys2:
+                if field not in DIGEST_EXCLUDED_FIELDS and not field.startswith('_'):
+                    return False
+        
+        for field, value in req1.items():
+            if field in DIGEST_EXCLUDED_FIELDS or field.startswith('_'):
+                continue
+            if req2.get(field) != value:
+                return False
+        
+        # The digest keeps attribute order, so equal dicts must also list keys alike
+        attributes1 = req1.get('attributes')
+        attributes2 = req2.get('attributes')
+        return attributes1 == attributes2 and (not isinstance(attributes1, dict) or list(attributes1) == list(attributes2))
+    
+    def _differing_parts(self, req1: Mapping, req2: Mapping) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Reduce a pair to the fields and attributes whose raw values differ
+        
+        Without comparison rules a field's profile value depends on its raw value
+        only, so analysing the reduced pair finds the same content changes and
+        added/removed fields as analysing the whole requirements.
+        """
+        part1, part2 = {}, {}
+        for field, value in req1.items():
+            if field not in req2:
+                part1[field] = value
+            elif req2[field] != value:
+                part1[field] = value
+                part2[field] = req2[field]
+        for field, value in req2.items():
+            if field not in req1:
+                part2[field] = value
+        
+        attributes1 = part1.get('attributes')
+        attributes2 = part2.get('attributes')
+        if isinstance(attributes1, dict) and isinstance(attributes2, dict):
+            part1['attributes'] = {name: value for name, value in attributes1.items()
+                                   if attributes2.get(name, attributes2) != value}
+            part2['attributes'] = {name: value for name, value in attributes2.items()
+                                   if attributes1.get(name, attributes1) != value}
+        
+        # Native values only decide whether a differing attribute counts as changed
+        for part, req in ((part1, req1), (part2, req2)):
+            if 'typed_attributes' in req:
+                part['typed_attributes'] = req['typed_attributes']
+        return part1, part2
+    
+    def _count_field_changes(self, field_changes: Dict[str, int], analysis: Dict[str, Any]):
+        """Add the content-changed fields of one analysed pair to a histogram"""
+        for change in analysis['content_changes']:
+            # The whole 'attributes' dict changes with any attribute.* field; not informative
+            if change['field'] != 'attributes':
+                field_changes[change['field']] = field_changes.get(change['field'], 0) + 1
+    
+    def _build_statistics(self, total_file1: int, total_file2: int, added: List, deleted: List,
+                          moved: List, content_modified: List, structural_only: List, unchanged: List,
+                          added_fields: Set[str], removed_fields: Set[str],
+                          field_changes: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Build the statistics block of a comparison result from its categories"""
+        counts = {
+            'added': len(added),
+            'deleted': len(deleted),
+            'moved': len(moved),
+            'content_modified': len(content_modified),
+            'structural_only': len(structural_only),
+            'unchanged': len(unchanged)
+        }
+        return self._build_statistics_from_counts(total_file1, total_file2, counts, added_fields,
+                                                  removed_fields, field_changes)
+    
+    def _build_statistics_from_counts(self, total_file1: int, total_file2: int, counts: Dict[str, int],
+                                      added_fields: Set[str], removed_fields: Set[str],
+                                      field_changes: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Build the statistics block from per-category counts (used when results are streamed)"""
+        total_reqs = total_file1 + counts.get('added', 0)
+        changed = (counts.get('added', 0) + counts.get('deleted', 0) + counts.get('moved', 0)
+                   + counts.get('content_modified', 0))
+        return {
+            'total_file1': total_file1,
+            'total_file2': total_file2,
+            'total_unique': total_reqs,
+            'added_count': counts.get('added', 0),
+            'deleted_count': counts.get('deleted', 0),
+            'moved_count': counts.get('moved', 0),
+            'content_modified_count': counts.get('content_modified', 0),
+            'structural_only_count': counts.get('structural_only', 0),
+            'unchanged_count': counts.get('unchanged', 0),
+            'content_change_percentage': round(counts.get('content_modified', 0) / max(total_reqs, 1) * 100, 2),
+            'total_change_percentage': round(changed / max(total_reqs, 1) * 100, 2),
+            'added_fields': sorted(list(added_fields)),
+            'removed_fields': sorted(list(removed_fields)),
+            # Number of requirements whose value changed, per field, most frequent first
+            'field_change_histogram': dict(sorted((field_changes or {}).items(), key=lambda item: (-item[1], item[0])))
+        }
+    
+    def _detect_moved_requirements(self, deleted: List[Dict[str, Any]], 
+                                   added: List[Dict[str, Any]]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Pair deleted and added requirements whose content survived an ID change
+        
+        Returns:
+            Tuple of (moved entries, remaining added, remaining deleted)
+        """
+        try:
+            detector = MovedRequirementDetector(threshold=self.moved_threshold)
+            pairs = detector.find_moved(deleted, added)
+        except Exception as e:
+            print(f"Error detecting moved requirements: {e}")
+            return [], added, deleted
+        
+        if not pairs:
+            return [], added, deleted
+        
+        moved_old_ids = set()
+        moved_new_ids = set()
+        moved = []
+        for old_req, new_req, similarity in pairs:
+            moved.append(self._create_moved_entry(old_req, new_req, similarity))
+            moved_old_ids.add(old_req['id'])
+            moved_new_ids.add(new_req['id'])
+        
+        remaining_added = [req for req in added if req['id'] not in moved_new_ids]
+        remaining_deleted = [req for req in deleted if req['id'] not in moved_old_ids]
+        
+        print(f"Moved detection: {len(moved)} pairs from {detector.stats.get('candidates', 0)} candidates")
+        return moved, remaining_added, remaining_deleted
+    
+    def _create_moved_entry(self, req1: Dict[str, Any], req2: Dict[str, Any], similarity: float) -> Mapping:
+        """Create entry for a requirement whose ID changed but content matched"""
+        analysis = self._analyze_requirement_changes(req1, req2)
+        content_changes = [change for change in analysis['content_changes'] if change['field'] != 'id']
+        
+        # The new ID is the current one; the entry reads through to req2
+        changed_fields = [change['field'] for change in content_changes]
+        return ComparisonEntry(req1, req2, {
+            'previous_id': req1.get('id', ''),
+            'similarity': similarity,
+            'changes_summary': ', '.join(changed_fields) if changed_fields else 'No content changes',
+            'changed_fields': changed_fields,
+            'change_count': len(changed_fields)
+        }, {
+            'changes': content_changes
+        })
+    
+    def get_requirement_digest(self, req: Dict[str, Any]) -> bytes:
+        """
+        Get the comparison digest of a requirement
+        
+        Equal digests guarantee that _analyze_requirement_changes finds no changes;
+        different digests only mean the full field analysis has to run. Inside
+        compare_requirements/compare_statistics each requirement is hashed once;
+        the requirement itself is never modified.
+        
+        Args:
+            req: Requirement dictionary
+            
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        digests = getattr(self._call_caches, 'digests', None)
+        if digests is None:
+            return self._compute_requirement_digest(req)
+        cached = digests.get(id(req))
+        if cached is None:
+            cached = digests[id(req)] = (req, self._compute_requirement_digest(req))
+        return cached[1]
+    
+    def comparable_values(self, req: Mapping) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        Comparable content of a requirement under the current comparison rules
+        
+        Shared by the digest, the three-way comparison and the history engine
+        so all of them ignore and normalise the same things.
+        
+        Args:
+            req: Requirement dictionary
+            
+        Returns:
+            Tuple of (fields, attributes): (field, stripped value) pairs for
+            top-level fields and (attribute name, value) pairs in attribute
+            order, where typed attributes carry comparable_typed_value
+        """
+        if self._normalize is not None:
+            fields, attributes = self._normalize(req)
+        else:
+            fields = [(field, str(value).strip() if value is not None else '') for field, value in req.items()
+                      if field not in DIGEST_EXCLUDED_FIELDS and field[:1] != '_']
+            values = req.get('attributes')
+            attributes = ([(name, str(value) if value is not None else '') for name, value in values.items()]
+                          if isinstance(values, dict) else [])
+        
+        typed_attributes = req.get('typed_attributes')
+        if typed_attributes:
+            attributes = [(name, comparable_typed_value(typed_attributes[name]) if name in typed_attributes else value)
+                          for name, value in attributes]
+        return fields, attributes
+    
+    def _compute_requirement_digest(self, req: Dict[str, Any]) -> bytes:
+        """Hash comparable fields and attributes joined with XML-illegal control separators"""
+        fields, attributes = self.comparable_values(req)
+        
+        parts = []
+        for field, value in sorted(fields):
+            parts.append(field)
+            parts.append(value)
+        
+        if isinstance(req.get('attributes'), dict):
+            parts.append('\x1d')
+            # Dict order is kept: the 'attributes' field itself is compared as a whole
+            for attr_name, attr_value in attributes:
+                parts.append(attr_name)
+                parts.append(attr_value)
+        elif 'attributes' in req:
+            parts.append('\x1d' + str(req['attributes']))
+        
+        key = '\x1f'.join(parts)
+        return hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    
+    def get_comparison_profile(self, req: Dict[str, Any]) -> ComparisonProfile:
+        """
+        Get the comparison profile of a requirement
+        
+        Inside compare_requirements/compare_statistics each requirement gets
+        one profile for the whole call; the requirement itself is never modified.
+        
+        Args:
+            req: Requirement dictionary or read-only mapping such as a result entry
+            
+        Returns:
+            ComparisonProfile of the requirement
+        """
+        profiles = getattr(self._call_caches, 'profiles', None)
+        if profiles is None:
+            return ComparisonProfile(req, self._normalize)
+        cached = profiles.get(id(req))
+        if cached is None:
+            cached = profiles[id(req)] = (req, ComparisonProfile(req, self._normalize))
+        return cached[1]
+    
+    def _analyze_requirement_changes(self, req1: Dict[str, Any], req2: Dict[str, Any],
+                                     profile1: Optional[ComparisonProfile] = None,
+                                     profile2: Optional[ComparisonProfile] = None) -> Dict[str, Any]:
         """
         Analyze changes between two requirements, separating content and structural changes
         
+        Profiles not passed in are taken from get_comparison_profile.
+        
         Returns:
             Dict with analysis results including:
             - has_content_changes: bool
@@ -195,32 +963,44 @@ class ReqIFComparator:
             - removed_fields: set of fields only in req1
             - common_fields: set of fields in both
         """
-        # Get fields from both requirements
-        fields1 = self._get_requirement_fields(req1)
-        fields2 = self._get_requirement_fields(req2)
+        if profile1 is None:
+            profile1 = self.get_comparison_profile(req1)
+        if profile2 is None:
+            profile2 = self.get_comparison_profile(req2)
         
         # Categorize fields
-        common_fields = fields1 & fields2
-        added_fields = fields2 - fields1
-        removed_fields = fields1 - fields2
+        if profile1.keys == profile2.keys:
+            common_fields = profile1.key_set
+            added_fields = set()
+            removed_fields = set()
+        else:
+            common_fields = profile1.key_set & profile2.key_set
+            added_fields = set(profile2.key_set - profile1.key_set)
+            removed_fields = set(profile1.key_set - profile2.key_set)
         
-        # Check for content changes in common fields
+        # Check for content changes in common fields (values are already normalised)
         content_changes = []
-        for field in common_fields:
-            value1 = self._get_field_value(req1, field)
-            value2 = self._get_field_value(req2, field)
-            
-            # Normalize and compare values
-            norm_value1 = str(value1).strip() if value1 is not None else ''
-            norm_value2 = str(value2).strip() if value2 is not None else ''
-            
-            if norm_value1 != norm_value2:
-                content_changes.append({
-                    'field': field,
-                    'old_value': norm_value1,
-                    'new_value': norm_value2,
-                    'change_type': 'modified'
-                })
+        typed1 = profile1.typed
+        typed2 = profile2.typed
+        for field, value1, value2 in profile1.changed_fields(profile2):
+            # Differing display strings with the same native INTEGER/REAL/DATE/BOOLEAN value
+            if field in typed1:
+                if field in typed2 and typed1[field] == typed2[field]:
+                    continue
+            elif field == 'attributes' and self._attributes_equal(profile1, profile2):
+                continue
+            
+            if self._normalize is not None:
+                # Compared normalised, shown as written
+                value1 = self._display_value(req1, field)
+                value2 = self._display_value(req2, field)
+            
+            content_changes.append({
+                'field': field,
+                'old_value': value1,
+                'new_value': value2,
+                'change_type': 'modified'
+            })
         
         return {
             'has_content_changes': len(content_changes) > 0,
@@ -233,24 +1013,9 @@ class ReqIFComparator:
     
     def _get_requirement_fields(self, req: Dict[str, Any]) -> Set[str]:
         """Get all comparable fields from a requirement"""
-        fields = set()
-        
-        if not isinstance(req, dict):
-            return fields
-        
-        # Add regular fields (excluding internal ones)
-        excluded_fields = {'content', 'raw_attributes', '_comparison_data'}
-        for field in req.keys():
-            if field not in excluded_fields and not field.startswith('_'):
-                fields.add(field)
-        
-        # Add attribute fields with special prefix
-        attributes = req.get('attributes', {})
-        if isinstance(attributes, dict):
-            for attr_name in attributes.keys():
-                fields.add(f'attribute.{attr_name}')
-        
-        return fields
+        if not isinstance(req, Mapping):
+            return set()
+        return self.get_comparison_profile(req).key_set
     
     def _get_field_value(self, req: Dict[str, Any], field: str) -> Any:
         """Get value for a field, handling both regular and attribute fields"""
@@ -265,42 +1030,47 @@ class ReqIFComparator:
             # Regular field
             return req.get(field, None)
     
+    def _attributes_equal(self, profile1: ComparisonProfile, profile2: ComparisonProfile) -> bool:
+        """Whole 'attributes' field: equal when both have the same attributes and each matches by value or native value"""
+        attribute_keys1 = {key for key in profile1.keys if key.startswith('attribute.')}
+        attribute_keys2 = {key for key in profile2.keys if key.startswith('attribute.')}
+        if attribute_keys1 != attribute_keys2:
+            return False
+        
+        typed1 = profile1.typed
+        typed2 = profile2.typed
+        for field, _, _ in profile1.changed_fields(profile2):
+            if not field.startswith('attribute.'):
+                continue
+            if field not in typed1 or field not in typed2 or typed1[field] != typed2[field]:
+                return False
+        return True
+    
+    def _display_value(self, req: Dict[str, Any], field: str) -> str:
+        """Field value as written in the requirement, stripped"""
+        value = self._get_field_value(req, field)
+        return str(value).strip() if value is not None else ''
+    
     def _create_content_modified_entry(self, req_id: str, req1: Dict[str, Any], 
-                                     req2: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+                                     req2: Dict[str, Any], analysis: Dict[str, Any]) -> Mapping:
         """Create entry for content-modified requirement"""
         try:
             # Get changed field names for summary
             changed_fields = [change['field'] for change in analysis['content_changes']]
             changes_summary = ', '.join(changed_fields) if changed_fields else 'Unknown changes'
             
-            # Create the modified entry using the NEW version as base
-            modified_entry = {}
-            
-            # Copy all actual fields from req2
-            for field_name, field_value in req2.items():
-                if field_name not in ['_comparison_data']:
-                    modified_entry[field_name] = field_value
-            
-            # Ensure we have an ID
-            modified_entry['id'] = req_id
-            
-            # Add change metadata
-            modified_entry.update({
+            # Entry reads through to the NEW version and stores only the change metadata
+            return ComparisonEntry(req1, req2, {
+                'id': req_id,
                 'changes_summary': changes_summary,
                 'changed_fields': changed_fields,
-                'change_count': len(changed_fields),
-                
+                'change_count': len(changed_fields)
+            }, {
                 # Comparison data for diff viewer
-                '_comparison_data': {
-                    'old': self._safe_copy_dict(req1),
-                    'new': self._safe_copy_dict(req2),
-                    'changes': analysis['content_changes'],
-                    'detailed_changes': self._create_detailed_changes(req1, req2, analysis['content_changes'])
-                }
+                'changes': analysis['content_changes'],
+                'detailed_changes': self._create_detailed_changes(req1, req2, analysis['content_changes'])
             })
             
-            return modified_entry
-            
         except Exception as e:
             print(f"Error creating content modified entry for {req_id}: {e}")
             # Return basic fallback
@@ -313,82 +1083,44 @@ class ReqIFComparator:
             }
     
     def _create_structural_entry(self, req_id: str, req1: Dict[str, Any], 
-                               req2: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+                               req2: Dict[str, Any], analysis: Dict[str, Any]) -> Mapping:
         """Create entry for structural-only changes"""
         try:
-            # Create entry using req2 as base
-            structural_entry = {}
-            
-            # Copy all fields from req2
-            for field_name, field_value in req2.items():
-                if field_name not in ['_comparison_data']:
-                    structural_entry[field_name] = field_value
-            
-            # Ensure we have an ID
-            structural_entry['id'] = req_id
-            
-            # Add structural change metadata
-            structural_entry.update({
+            # Entry reads through to req2 and stores only the structural change metadata
+            return ComparisonEntry(req1, req2, {
+                'id': req_id,
                 'added_fields': sorted(list(analysis['added_fields'])),
                 'removed_fields': sorted(list(analysis['removed_fields'])),
-                'structural_changes_only': True,
-                
+                'structural_changes_only': True
+            }, {
                 # Include comparison data for viewing
-                '_comparison_data': {
-                    'old': self._safe_copy_dict(req1),
-                    'new': self._safe_copy_dict(req2),
-                    'added_fields': analysis['added_fields'],
-                    'removed_fields': analysis['removed_fields']
-                }
+                'added_fields': analysis['added_fields'],
+                'removed_fields': analysis['removed_fields']
             })
             
-            return structural_entry
-            
         except Exception as e:
             print(f"Error creating structural entry for {req_id}: {e}")
             return req2  # Return req2 as fallback
     
-    def _safe_copy_dict(self, source_dict):
-        """Safely copy a dictionary, handling non-dict inputs"""
-        try:
-            if isinstance(source_dict, dict):
-                return source_dict.copy()
-            else:
-                return {}
-        except:
-            return {}
-    
     def _create_detailed_changes(self, req1: Dict[str, Any], req2: Dict[str, Any], 
-                               changes: List[Dict[str, str]]) -> Dict[str, Dict]:
-        """Create detailed change information for diff viewer"""
+                               changes: List[Dict[str, str]]) -> Dict[str, LazyFieldDiff]:
+        """Create detailed change information for diff viewer (lazy unless eager_diffs is set)"""
         detailed_changes = {}
         
         try:
             for change in changes:
                 try:
                     field = change.get('field', '')
-                    old_value = str(change.get('old_value', '') or '')
-                    new_value = str(change.get('new_value', '') or '')
-                    
                     if not field:
                         continue
                     
-                    # Generate text diff for the field
-                    diff_lines = []
-                    try:
-                        if old_value and new_value:
-                            diff_lines = self.get_text_diff(old_value, new_value)
-                    except Exception as e:
-                        print(f"Error generating diff for field {field}: {e}")
-                        diff_lines = []
+                    old_value = str(change.get('old_value', '') or '')
+                    new_value = str(change.get('new_value', '') or '')
                     
-                    detailed_changes[field] = {
-                        'change_type': 'modified',
-                        'old_value': old_value,
-                        'new_value': new_value,
-                        'diff_lines': diff_lines,
-                        'similarity': self._calculate_field_similarity(old_value, new_value)
-                    }
+                    field_diff = LazyFieldDiff(old_value, new_value)
+                    if self.eager_diffs:
+                        field_diff.materialize()
+                    detailed_changes[field] = field_diff
                     
                 except Exception as e:
                     print(f"Error processing change: {e}")
@@ -402,60 +1134,46 @@ class ReqIFComparator:
     def _calculate_field_similarity(self, old_value: str, new_value: str) -> float:
         """Calculate similarity between two field values"""
         try:
-            if not old_value and not new_value:
-                return 1.0
-            if not old_value or not new_value:
-                return 0.0
-            
-            matcher = difflib.SequenceMatcher(None, str(old_value), str(new_value))
-            return round(matcher.ratio(), 3)
+            return field_similarity(old_value, new_value)
         except Exception as e:
             print(f"Error calculating similarity: {e}")
             return 0.0
     
     def get_text_diff(self, text1: str, text2: str) -> List[str]:
-        """Get a unified diff between two text strings"""
+        """Get a word-level diff ([-deleted-] / {+inserted+} markup) between two text strings"""
         try:
-            if not text1 and not text2:
-                return []
-                
-            lines1 = text1.splitlines() if text1 else ['']
-            lines2 = text2.splitlines() if text2 else ['']
-            
-            diff = list(difflib.unified_diff(
-                lines1, lines2,
-                fromfile='Original',
-                tofile='Modified',
-                lineterm=''
-            ))
-            
-            return diff
+            return word_diff_lines(text1, text2)
         except Exception as e:
             print(f"Error generating text diff: {e}")
             return []
     
-    def calculate_similarity(self, req1: Dict[str, Any], req2: Dict[str, Any]) -> float:
-        """Calculate similarity score between two requirements (0.0 to 1.0)"""
+    def calculate_similarity(self, req1: Dict[str, Any], req2: Dict[str, Any], threshold: float = 0.0) -> float:
+        """
+        Calculate similarity score between two requirements (0.0 to 1.0)
+        
+        Args:
+            req1: First requirement
+            req2: Second requirement
+            threshold: Scores below this value may be returned as a cheap upper bound
+            
+        Returns:
+            Similarity score between 0 and 1
+        """
         try:
-            if not isinstance(req1, dict) or not isinstance(req2, dict):
+            if not isinstance(req1, Mapping) or not isinstance(req2, Mapping):
                 return 0.0
             
-            # Get all text content from both requirements
+            # Get all text content of the fields both requirements have
             text1_parts = []
             text2_parts = []
             
-            # Get common fields only for similarity calculation
-            fields1 = self._get_requirement_fields(req1)
-            fields2 = self._get_requirement_fields(req2)
-            common_fields = fields1 & fields2
-            
-            for field in common_fields:
-                val1 = self._get_field_value(req1, field)
-                val2 = self._get_field_value(req2, field)
-                if val1:
-                    text1_parts.append(str(val1))
-                if val2:
-                    text2_parts.append(str(val2))
+            profile1 = self.get_comparison_profile(req1)
+            profile2 = self.get_comparison_profile(req2)
+            for _, value1, value2 in profile1.common_fields(profile2):
+                if value1:
+                    text1_parts.append(value1)
+                if value2:
+                    text2_parts.append(value2)
             
             # Combine texts
             text1 = ' '.join(text1_parts).lower().strip()
@@ -466,9 +1184,7 @@ class ReqIFComparator:
             if not text1 or not text2:
                 return 0.0
                 
-            # Use SequenceMatcher for similarity
-            matcher = difflib.SequenceMatcher(None, text1, text2)
-            return matcher.ratio()
+            return bounded_ratio(text1, text2, threshold)
         except Exception as e:
             print(f"Error calculating similarity: {e}")
             return 0.0
@@ -476,29 +1192,73 @@ class ReqIFComparator:
     def find_similar_requirements(self, req: Dict[str, Any], 
                                 candidates: List[Dict[str, Any]], 
                                 threshold: float = 0.8) -> List[Tuple[Dict[str, Any], float]]:
-        """Find requirements similar to the given requirement"""
+        """
+        Find requirements similar to the given requirement
+        
+        Candidates are scored through a SimilarityIndex (TF-IDF postings) that is
+        built once per candidate list and reused by later calls with the same
+        list (call invalidate_similarity_index after editing it in place). Unlike a full pairwise scan, the results differ in two ways:
+        
+        - a candidate with the same ID as req is never returned, and
+        - only the 200 candidates with the best cosine score are re-ranked with
+          difflib and checked against the threshold, so a candidate sharing
+          almost no words with req can be missed even if its ratio would pass.
+        
+        Args:
+            req: Requirement to find matches for
+            candidates: Requirements to search
+            threshold: Minimum difflib ratio of a returned candidate
+            
+        Returns:
+            List of (candidate, similarity) tuples, highest similarity first
+        """
         similar = []
         
         try:
-            for candidate in candidates:
-                similarity = self.calculate_similarity(req, candidate)
-                if similarity >= threshold:
-                    similar.append((candidate, similarity))
-            
-            # Sort by similarity (highest first)
-            similar.sort(key=lambda x: x[1], reverse=True)
+            index = self.get_similarity_index(candidates)
+            similar = index.query(req, top_k=None, threshold=threshold, pool_size=200)
         except Exception as e:
             print(f"Error finding similar requirements: {e}")
         
         return similar
     
-    def calculate_filename_similarity(self, filename1: str, filename2: str) -> float:
+    def get_similarity_index(self, requirements: List[Dict[str, Any]]) -> SimilarityIndex:
+        """
+        Get a SimilarityIndex over a requirement list, reusing the last one built
+        
+        The last index is reused for the same list object with the same length;
+        validating the contents on every query would cost as much as the query.
+        Callers that edit requirements of the list in place call
+        invalidate_similarity_index; callers that query one set many times can
+        also keep their own SimilarityIndex.
+        
+        Args:
+            requirements: Requirement list to index
+            
+        Returns:
+            SimilarityIndex for the list
+        """
+        if (self._similarity_index is None or self._similarity_index_source is not requirements
+                or self._similarity_index_size != len(requirements)):
+            self._similarity_index = SimilarityIndex(requirements)
+            self._similarity_index_source = requirements
+            self._similarity_index_size = len(requirements)
+        return self._similarity_index
+    
+    def invalidate_similarity_index(self):
+        """Drop the cached SimilarityIndex (after editing the indexed requirements in place)"""
+        self._similarity_index = None
+        self._similarity_index_source = None
+        self._similarity_index_size = None
+    
+    def calculate_filename_similarity(self, filename1: str, filename2: str, threshold: float = 0.0) -> float:
         """
         Calculate similarity between two filenames for folder comparison
         
         Args:
             filename1: First filename
             filename2: Second filename
+            threshold: Scores below this value may be returned as a cheap upper bound
             
         Returns:
             Similarity score between 0 and 1
@@ -508,20 +1268,19 @@ class ReqIFComparator:
             name1 = os.path.splitext(filename1.lower())[0]
             name2 = os.path.splitext(filename2.lower())[0]
             
-            # Use SequenceMatcher for similarity
-            matcher = difflib.SequenceMatcher(None, name1, name2)
-            return matcher.ratio()
+            return bounded_ratio(name1, name2, threshold)
         except Exception as e:
             print(f"Error calculating filename similarity: {e}")
             return 0.0
     
-    def calculate_path_similarity(self, path1: str, path2: str) -> float:
+    def calculate_path_similarity(self, path1: str, path2: str, threshold: float = 0.0) -> float:
         """
         Calculate similarity between two file paths for folder comparison
         
         Args:
             path1: First file path
             path2: Second file path
+            threshold: Scores below this value may be returned as a cheap upper bound
             
         Returns:
             Similarity score between 0 and 1
@@ -531,107 +1290,125 @@ class ReqIFComparator:
             norm_path1 = os.path.normpath(path1.lower())
             norm_path2 = os.path.normpath(path2.lower())
             
-            # Use SequenceMatcher for similarity
-            matcher = difflib.SequenceMatcher(None, norm_path1, norm_path2)
-            return matcher.ratio()
+            return bounded_ratio(norm_path1, norm_path2, threshold)
         except Exception as e:
             print(f"Error calculating path similarity: {e}")
             return 0.0
     
     def export_comparison_summary(self, comparison_results: Dict[str, Any]) -> str:
         """Generate a text summary of the comparison results"""
+        buffer = io.StringIO()
         try:
-            if not isinstance(comparison_results, dict):
-                return "Error: Invalid comparison results"
-            
-            stats = comparison_results.get('statistics', {})
-            
-            # Build summary string
-            summary_lines = [
-                "ReqIF Comparison Summary",
-                "========================",
-                "",
-                "File Statistics:",
-                f"- Original file: {stats.get('total_file1', 0)} requirements",
-                f"- Modified file: {stats.get('total_file2', 0)} requirements",
-                f"- Total unique requirements: {stats.get('total_unique', 0)}",
-                "",
-                "Changes Detected:",
-                f"- Added: {stats.get('added_count', 0)} requirements",
-                f"- Deleted: {stats.get('deleted_count', 0)} requirements",
-                f"- Content Modified: {stats.get('content_modified_count', 0)} requirements",
-                f"- Structure Only Changes: {stats.get('structural_only_count', 0)} requirements",
-                f"- Unchanged: {stats.get('unchanged_count', 0)} requirements",
-                "",
-                f"Content Change Rate: {stats.get('content_change_percentage', 0)}%",
-                f"Overall Change Rate: {stats.get('total_change_percentage', 0)}%",
-                "",
-                "Structural Changes:"
-            ]
-            
-            # Add field changes
-            added_fields = stats.get('added_fields', [])
-            removed_fields = stats.get('removed_fields', [])
-            
-            if added_fields:
-                summary_lines.append(f"- Added Fields: {', '.join(added_fields[:5])}")
-                if len(added_fields) > 5:
-                    summary_lines.append(f"  ... and {len(added_fields) - 5} more")
-            else:
-                summary_lines.append("- No fields added")
-                
-            if removed_fields:
-                summary_lines.append(f"- Removed Fields: {', '.join(removed_fields[:5])}")
-                if len(removed_fields) > 5:
-                    summary_lines.append(f"  ... and {len(removed_fields) - 5} more")
-            else:
-                summary_lines.append("- No fields removed")
-            
-            summary_lines.append("")
-            summary_lines.append("Detailed Changes:")
-            
-            # Add details for each category
-            for category in ['added', 'deleted', 'content_modified', 'structural_only']:
-                try:
-                    requirements = comparison_results.get(category, [])
-                    if requirements and isinstance(requirements, list):
-                        summary_lines.append("")
-                        summary_lines.append(f"{category.replace('_', ' ').title()} Requirements ({len(requirements)}):")
-                        
-                        for req in requirements[:5]:  # Show first 5
-                            if isinstance(req, dict):
-                                req_id = req.get('id', 'No ID')
-                                
-                                if category == 'content_modified':
-                                    change_count = req.get('change_count', 0)
-                                    changes_summary = req.get('changes_summary', 'Unknown changes')
-                                    summary_lines.append(f"  ~ {req_id}: {changes_summary} ({change_count} field(s))")
-                                elif category == 'structural_only':
-                                    added = len(req.get('added_fields', []))
-                                    removed = len(req.get('removed_fields', []))
-                                    summary_lines.append(f"  ~ {req_id}: +{added} fields, -{removed} fields")
-                                else:
-                                    prefix = "+" if category == 'added' else "-"
-                                    display_text = self._get_requirement_display_text(req)
-                                    summary_lines.append(f"  {prefix} {req_id}: {display_text}")
-                        
-                        if len(requirements) > 5:
-                            remaining = len(requirements) - 5
-                            summary_lines.append(f"  ... and {remaining} more")
-                except Exception as e:
-                    print(f"Error processing {category} requirements: {e}")
-                    continue
-            
-            return '\n'.join(summary_lines)
+            self.write_comparison_summary(comparison_results, buffer)
+            return buffer.getvalue()
             
         except Exception as e:
             print(f"Error generating comparison summary: {e}")
             return f"Error generating summary: {str(e)}"
     
+    def write_comparison_summary(self, comparison_results: Dict[str, Any], out: TextIO):
+        """
+        Write the text summary of the comparison results to a stream
+        
+        The statistics header is written and flushed before the per-category
+        details, so the first bytes appear immediately; the output is the
+        same text export_comparison_summary returns.
+        
+        Args:
+            comparison_results: Result of compare_requirements
+            out: Text stream (file, StringIO or export job stream)
+        """
+        writer = ReportWriter(out)
+        if not isinstance(comparison_results, dict):
+            writer.line("Error: Invalid comparison results")
+            writer.flush()
+            return
+        
+        stats = comparison_results.get('statistics', {})
+        
+        writer.lines([
+            "ReqIF Comparison Summary",
+            "========================",
+            "",
+            "File Statistics:",
+            f"- Original file: {stats.get('total_file1', 0)} requirements",
+            f"- Modified file: {stats.get('total_file2', 0)} requirements",
+            f"- Total unique requirements: {stats.get('total_unique', 0)}",
+            "",
+            "Changes Detected:",
+            f"- Added: {stats.get('added_count', 0)} requirements",
+            f"- Deleted: {stats.get('deleted_count', 0)} requirements",
+            f"- Moved/Renamed: {stats.get('moved_count', 0)} requirements",
+            f"- Content Modified: {stats.get('content_modified_count', 0)} requirements",
+            f"- Structure Only Changes: {stats.get('structural_only_count', 0)} requirements",
+            f"- Unchanged: {stats.get('unchanged_count', 0)} requirements",
+            "",
+            f"Content Change Rate: {stats.get('content_change_percentage', 0)}%",
+            f"Overall Change Rate: {stats.get('total_change_percentage', 0)}%",
+            "",
+            "Structural Changes:"
+        ])
+        
+        # Add field changes
+        added_fields = stats.get('added_fields', [])
+        removed_fields = stats.get('removed_fields', [])
+        
+        if added_fields:
+            writer.line(f"- Added Fields: {', '.join(added_fields[:5])}")
+            if len(added_fields) > 5:
+                writer.line(f"  ... and {len(added_fields) - 5} more")
+        else:
+            writer.line("- No fields added")
+            
+        if removed_fields:
+            writer.line(f"- Removed Fields: {', '.join(removed_fields[:5])}")
+            if len(removed_fields) > 5:
+                writer.line(f"  ... and {len(removed_fields) - 5} more")
+        else:
+            writer.line("- No fields removed")
+        
+        writer.line("")
+        writer.line("Detailed Changes:")
+        writer.flush(stream=True)
+        
+        # Add details for each category
+        for category in ['added', 'deleted', 'content_modified', 'structural_only']:
+            try:
+                requirements = comparison_results.get(category, [])
+                if requirements and isinstance(requirements, list):
+                    lines = ["", f"{category.replace('_', ' ').title()} Requirements ({len(requirements)}):"]
+                    
+                    for req in requirements[:5]:  # Show first 5
+                        if isinstance(req, Mapping):
+                            req_id = req.get('id', 'No ID')
+                            
+                            if category == 'content_modified':
+                                change_count = req.get('change_count', 0)
+                                changes_summary = req.get('changes_summary', 'Unknown changes')
+                                lines.append(f"  ~ {req_id}: {changes_summary} ({change_count} field(s))")
+                            elif category == 'structural_only':
+                                added = len(req.get('added_fields', []))
+                                removed = len(req.get('removed_fields', []))
+                                lines.append(f"  ~ {req_id}: +{added} fields, -{removed} fields")
+                            else:
+                                prefix = "+" if category == 'added' else "-"
+                                display_text = self._get_requirement_display_text(req)
+                                lines.append(f"  {prefix} {req_id}: {display_text}")
+                    
+                    if len(requirements) > 5:
+                        remaining = len(requirements) - 5
+                        lines.append(f"  ... and {remaining} more")
+                    writer.lines(lines)
+            except Exception as e:
+                print(f"Error processing {category} requirements: {e}")
+                continue
+        
+        writer.flush(stream=True)
+    
     def _get_requirement_display_text(self, req: Dict[str, Any]) -> str:
         """Get appropriate display text for a requirement"""
         try:
-            if not isinstance(req, dict):
+            if not isinstance(req, Mapping):
                 return "Invalid requirement"
             
             # Try to find the best field for display
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+ReqIF History Module
+Ingests an ordered series of baselines once and keeps, per requirement and
+attribute, only the versions at which the value changed (64-bit digests in
+compact arrays). Timelines, churn rankings and "changed between vN and vM"
+queries are answered from these arrays without re-parsing or diffing.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Union, Callable, Tuple
+from collections.abc import Mapping
+from array import array
+from bisect import bisect_right
+import hashlib
+
+from reqif_comparator import ReqIFComparator
+from reqif_parser import ReqIFParser
+
+
+# Digest stored for "not present in this version"
+ABSENT = 0
+
+VersionRef = Union[int, str]
+
+
+def _hash64(text: str) -> int:
+    """Non-zero 64-bit digest of a string"""
+    value = int.from_bytes(hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+class _ChangeSeries:
+    """Versions at which a value changed and the digest it changed to (run-length encoded)"""
+
+    __slots__ = ('versions', 'digests')
+
+    def __init__(self):
+        self.versions = array('I')
+        self.digests = array('Q')
+
+    def record(self, version: int, digest: int) -> bool:
+        """Append digest for version if it differs from the current value; returns True on change"""
+        if self.digests and self.digests[-1] == digest:
+            return False
+        if not self.digests and digest == ABSENT:
+            return False
+        self.versions.append(version)
+        self.digests.append(digest)
+        return True
+
+    def at(self, version: int) -> int:
+        """Digest in effect at version (ABSENT before the first record)"""
+        position = bisect_right(self.versions, version)
+        return self.digests[position - 1] if position else ABSENT
+
+    def changed_at(self, version: int) -> bool:
+        """Whether a record exists exactly at version"""
+        position = bisect_right(self.versions, version)
+        return bool(position) and self.versions[position - 1] == version
+
+
+class _RequirementHistory:
+    """Whole-requirement series plus one series per attribute (keyed by interned attribute index)"""
+
+    __slots__ = ('series', 'attributes')
+
+    def __init__(self):
+        self.series = _ChangeSeries()
+        self.attributes: Dict[int, _ChangeSeries] = {}
+
+
+class BaselineHistory:
+    """
+    Change history of requirements across an ordered list of baselines
+
+    Each baseline is streamed once. A requirement whose digest did not change
+    since the previous version costs one digest comparison; only changed
+    requirements get per-attribute digests. Storage grows with the number of
+    changes, not with the number of versions.
+    """
+
+    def __init__(self, comparator: Optional[ReqIFComparator] = None):
+        self.comparator = comparator or ReqIFComparator()
+
+        self.labels: List[str] = []
+        self._attribute_names: List[str] = []
+        self._attribute_index: Dict[str, int] = {}
+        self._requirements: Dict[str, _RequirementHistory] = {}
+
+        self.stats = {
+            'versions': 0,
+            'requirements': 0,
+            'change_records': 0
+        }
+
+    def ingest_files(self, file_paths: Iterable[str], labels: Optional[Iterable[str]] = None,
+                     progress_callback: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Ingest baselines from ReqIF files, oldest first
+
+        Args:
+            file_paths: Baseline files in chronological order
+            labels: Version labels (defaults to the file paths)
+            progress_callback: Called as (current, total, status) after each file
+        """
+        file_paths = list(file_paths)
+        labels = list(labels) if labels is not None else file_paths
+
+        for index, (path, label) in enumerate(zip(file_paths, labels)):
+            self.add_baseline(label, ReqIFParser().iter_requirements(path))
+            if progress_callback:
+                progress_callback(index + 1, len(file_paths), f"Ingested {label}")
+
+    def add_baseline(self, label: str, requirements: Iterable[Dict[str, Any]]) -> int:
+        """
+        Append the next baseline
+
+        Args:
+            label: Version label (e.g. "2024-03")
+            requirements: Requirements of this baseline (list or iterator)
+
+        Returns:
+            Index of the new version
+        """
+        version = len(self.labels)
+        self.labels.append(label)
+        seen = set()
+
+        for req in requirements:
+            if not isinstance(req, Mapping) or not req.get('id'):
+                continue
+            req_id = req['id']
+            seen.add(req_id)
+
+            history = self._requirements.get(req_id)
+            if history is None:
+                history = _RequirementHistory()
+                self._requirements[req_id] = history
+
+            digest = int.from_bytes(self.comparator.get_requirement_digest(req)[:8], 'little') or 1
+            if history.series.record(version, digest):
+                self.stats['change_records'] += 1
+                self._record_attributes(history, version, req)
+
+        # Requirements missing from this baseline
+        for req_id, history in self._requirements.items():
+            if req_id not in seen and history.series.record(version, ABSENT):
+                self.stats['change_records'] += 1
+                for series in history.attributes.values():
+                    series.record(version, ABSENT)
+
+        self.stats['versions'] = len(self.labels)
+        self.stats['requirements'] = len(self._requirements)
+        return version
+
+    def _record_attributes(self, history: _RequirementHistory, version: int, req: Mapping):
+        """Record per-attribute digests of a requirement that changed"""
+        current = self._attribute_digests(req)
+
+        for index, digest in current.items():
+            series = history.attributes.get(index)
+            if series is None:
+                series = _ChangeSeries()
+                history.attributes[index] = series
+            series.record(version, digest)
+
+        for index, series in history.attributes.items():
+            if index not in current:
+                series.record(version, ABSENT)
+
+    def _attribute_digests(self, req: Mapping) -> Dict[int, int]:
+        """Interned attribute index -> 64-bit digest of the comparable values (after the comparison rules)"""
+        fields, attributes = self.comparator.comparable_values(req)
+        digests = {}
+        for field, value in fields:
+            if field != 'id':
+                digests[self._intern(field)] = _hash64(value)
+        for name, value in attributes:
+            digests[self._intern(f'attribute.{name}')] = _hash64(value)
+        return digests
+
+    def _intern(self, name: str) -> int:
+        """Index of an attribute name, shared by all requirements"""
+        index = self._attribute_index.get(name)
+        if index is None:
+            index = len(self._attribute_names)
+            self._attribute_index[name] = index
+            self._attribute_names.append(name)
+        return index
+
+    def requirement_ids(self) -> List[str]:
+        """All requirement IDs seen in any baseline"""
+        return list(self._requirements)
+
+    def timeline(self, req_id: str) -> List[Dict[str, Any]]:
+        """
+        Versions at which a requirement was added, modified or deleted
+
+        Args:
+            req_id: Requirement ID
+
+        Returns:
+            List of {'version', 'index', 'change', 'attributes'} in chronological
+            order; 'attributes' names the fields that changed at that version
+        """
+        history = self._requirements.get(req_id)
+        if history is None:
+            return []
+
+        events = []
+        previous = ABSENT
+        for version, digest in zip(history.series.versions, history.series.digests):
+            if previous == ABSENT:
+                change = 'added'
+            elif digest == ABSENT:
+                change = 'deleted'
+            else:
+                change = 'modified'
+
+            changed = []
+            if change == 'modified':
+                changed = sorted(self._attribute_names[index] for index, series in history.attributes.items()
+                                 if series.changed_at(version))
+
+            events.append({
+                'version': self.labels[version],
+                'index': version,
+                'change': change,
+                'attributes': changed
+            })
+            previous = digest
+        return events
+
+    def change_count(self, req_id: str, start: Optional[VersionRef] = None,
+                     end: Optional[VersionRef] = None) -> int:
+        """Number of modifications of a requirement within (start, end]"""
+        history = self._requirements.get(req_id)
+        if history is None:
+            return 0
+        return self._count_modifications(history.series, *self._range(start, end))
+
+    def churn(self, top_n: int = 20, start: Optional[VersionRef] = None,
+              end: Optional[VersionRef] = None) -> List[Tuple[str, int]]:
+        """
+        Requirements ranked by number of modifications
+
+        Args:
+            top_n: Number of requirements to return (None = all that changed)
+            start: Exclusive start version (label or index; None = first)
+            end: Inclusive end version (label or index; None = last)
+
+        Returns:
+            List of (requirement ID, modification count), most changed first
+        """
+        first, last = self._range(start, end)
+        ranking = []
+        for req_id, history in self._requirements.items():
+            count = self._count_modifications(history.series, first, last)
+            if count:
+                ranking.append((req_id, count))
+        ranking.sort(key=lambda item: (-item[1], item[0]))
+        return ranking[:top_n] if top_n is not None else ranking
+
+    def attribute_churn(self, start: Optional[VersionRef] = None,
+                        end: Optional[VersionRef] = None) -> Dict[str, int]:
+        """Number of value changes per attribute across all requirements, most changed first"""
+        first, last = self._range(start, end)
+        counts = {}
+        for history in self._requirements.values():
+            for index, series in history.attributes.items():
+                count = self._count_modifications(series, first, last)
+                if count:
+                    name = self._attribute_names[index]
+                    counts[name] = counts.get(name, 0) + count
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+    def changed_between(self, start: VersionRef, end: VersionRef) -> Dict[str, List[str]]:
+        """
+        Requirements that differ between two versions
+
+        Args:
+            start: Earlier version (label or index)
+            end: Later version (label or index)
+
+        Returns:
+            Dictionary with 'added', 'deleted' and 'modified' requirement ID lists
+        """
+        first = self._version_index(start)
+        last = self._version_index(end)
+
+        result = {'added': [], 'deleted': [], 'modified': []}
+        for req_id, history in self._requirements.items():
+            before = history.series.at(first)
+            after = history.series.at(last)
+            if before == after:
+                continue
+            if before == ABSENT:
+                result['added'].append(req_id)
+            elif after == ABSENT:
+                result['deleted'].append(req_id)
+            else:
+                result['modified'].append(req_id)
+        return result
+
+    def _count_modifications(self, series: _ChangeSeries, first: int, last: int) -> int:
+        """Records in (first, last] that change an existing value (not additions or deletions)"""
+        count = 0
+        low = bisect_right(series.versions, first)
+        high = bisect_right(series.versions, last)
+        for position in range(low, high):
+            previous = series.digests[position - 1] if position else ABSENT
+            if previous != ABSENT and series.digests[position] != ABSENT:
+                count += 1
+        return count
+
+    def _range(self, start: Optional[VersionRef], end: Optional[VersionRef]) -> Tuple[int, int]:
+        """Resolve an optional (start, end] version range to indices"""
+        first = self._version_index(start) if start is not None else -1
+        last = self._version_index(end) if end is not None else len(self.labels) - 1
+        return first, last
+
+    def _version_index(self, version: VersionRef) -> int:
+        """Resolve a version label or index"""
+        if isinstance(version, int):
+            if not -len(self.labels) <= version < len(self.labels):
+                raise IndexError(f"Version index out of range: {version}")
+            return version % len(self.labels)
+        try:
+            return self.labels.index(version)
+        except ValueError:
+            raise KeyError(f"Unknown version: {version}")
+
+
+# Example usage
+if __name__ == "__main__":
+    print("ReqIF History - change timelines across many baselines")
+
+    # history = BaselineHistory()
+    # history.ingest_files(["2024-01.reqif", "2024-02.reqif", "2024-03.reqif"],
+    #                      labels=["2024-01", "2024-02", "2024-03"])
+    # print(history.timeline("REQ-123"))
+    # print(history.churn(top_n=10))
+    # print(history.changed_between("2024-01", "2024-03"))
@@ -6,13 +6,155 @@ Based on diagnostic analysis and optimized for authentic ReqIF file representati
 """
 
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, Iterator, Callable, IO
+from datetime import datetime, timezone
+from functools import lru_cache
 import os
 import zipfile
 import tempfile
 import shutil
 import re
 import html
+import mmap
+import xml.parsers.expat
+
+
+# Attribute value types that get a native typed value next to the display string
+TYPED_VALUE_TYPES = {
+    'ATTRIBUTE-VALUE-INTEGER': 'integer',
+    'ATTRIBUTE-VALUE-REAL': 'real',
+    'ATTRIBUTE-VALUE-DATE': 'date',
+    'ATTRIBUTE-VALUE-BOOLEAN': 'boolean'
+}
+
+TypedValue = Union[int, float, bool, datetime]
+
+_FRACTION_PATTERN = re.compile(r'\.(\d+)')
+
+# IDENTIFIER attribute of a SPEC-OBJECT start tag, for requirement_identifiers
+_SPEC_OBJECT_IDENTIFIER = re.compile(
+    rb'<(?:[A-Za-z_][\w.-]*:)?SPEC-OBJECT\s[^<]*?(?<![\w.:-])IDENTIFIER\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_SCAN_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=65536)
+def parse_reqif_date(value: str) -> Optional[datetime]:
+    """
+    Parse an xsd:dateTime value into a timezone-aware UTC datetime
+
+    Results are cached because DATE attributes (e.g. LastModifiedOn) repeat
+    the same few timestamps across thousands of requirements.
+    """
+    text = value.strip()
+    if not text:
+        return None
+
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+
+    # fromisoformat before Python 3.11 only accepts 3 or 6 fractional digits
+    text = _FRACTION_PATTERN.sub(lambda m: '.' + (m.group(1) + '000000')[:6], text, count=1)
+
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        # ReqIF dates without offset are interpreted as UTC
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def convert_typed_value(raw_value: str, data_type: str) -> Optional[TypedValue]:
+    """Convert a raw THE-VALUE string into its native type (None if not convertible)"""
+    if raw_value is None:
+        return None
+
+    text = str(raw_value).strip()
+    if not text:
+        return None
+
+    try:
+        if data_type == 'integer':
+            return int(text)
+        if data_type == 'real':
+            return float(text)
+        if data_type == 'date':
+            return parse_reqif_date(text)
+        if data_type == 'boolean':
+            lowered = text.lower()
+            if lowered in ('true', '1', 'yes'):
+                return True
+            if lowered in ('false', '0', 'no'):
+                return False
+    except (ValueError, OverflowError):
+        return None
+
+    return None
+
+
+class MappedSource:
+    """
+    Read-only memory map of a parsed ReqIF file, shared by all requirements of that file
+
+    The map is opened lazily and is not pickled, so requirements carrying a
+    reference stay cheap to copy and can cross process boundaries.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._mmap = None
+    
+    def _get_map(self) -> mmap.mmap:
+        """Open the memory map on first use"""
+        if self._mmap is None:
+            with open(self.path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+    
+    def slice(self, offset: int, length: int) -> memoryview:
+        """Return a zero-copy view of length bytes starting at offset"""
+        return memoryview(self._get_map())[offset:offset + length]
+    
+    def close(self):
+        """Release the memory map (fails while views are still alive)"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+                self._mmap = None
+            except BufferError:
+                pass
+    
+    def __getstate__(self):
+        return {'path': self.path}
+    
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._mmap = None
+
+
+def raw_value(requirement: Dict[str, Any], attr_name: str) -> Optional[memoryview]:
+    """
+    Get the original ATTRIBUTE-VALUE markup of an attribute without copying it
+    
+    Args:
+        requirement: Requirement parsed with record_spans=True
+        attr_name: Human-readable attribute name (key of 'attributes')
+        
+    Returns:
+        memoryview over the UTF-8 source bytes, or None if no span was recorded
+    """
+    spans = requirement.get('_raw_spans')
+    source = requirement.get('_raw_source')
+    if not spans or source is None or attr_name not in spans:
+        return None
+    
+    offset, length = spans[attr_name]
+    try:
+        return source.slice(offset, length)
+    except (OSError, ValueError):
+        return None
 
 
 class ReqIFParser:
@@ -28,6 +170,7 @@ class ReqIFParser:
         
         # Comprehensive catalogs
         self.attribute_definitions = {}      # ID -> definition info
+        self.attribute_datatypes = {}       # Long name -> datatype (shared by the requirements of one file)
         self.spec_object_types = {}         # ID -> type info  
         self.enumeration_definitions = {}   # ID -> enum info
         self.enum_values = {}               # ID -> human readable name
@@ -42,12 +185,14 @@ class ReqIFParser:
             'content_extractions': 0
         }
         
-    def parse_file(self, file_path: str) -> List[Dict[str, Any]]:
+    def parse_file(self, file_path: str, record_spans: bool = False) -> List[Dict[str, Any]]:
         """
         Parse ReqIF file with enhanced namespace handling and content extraction
         
         Args:
             file_path: Path to the ReqIF file or ReqIF archive
+            record_spans: Record byte spans of each ATTRIBUTE-VALUE so the original
+                markup can be read back with raw_value()
             
         Returns:
             List of requirement dictionaries with only actual ReqIF content
@@ -78,16 +223,254 @@ class ReqIFParser:
             # Extract SPEC-OBJECTs with enhanced resolution
             requirements = self._extract_spec_objects_enhanced(root)
             
+            if record_spans:
+                self._record_raw_spans(actual_file_path, requirements)
+            
             return requirements
             
         except Exception as e:
             raise RuntimeError(f"Failed to parse ReqIF file: {str(e)}")
     
+    def count_requirements(self, file_path: str) -> int:
+        """
+        Quick-scan a ReqIF file or archive for its number of SPEC-OBJECTs
+        
+        SPEC-OBJECT start events are counted with expat, without building a
+        tree or extracting archives to disk, so documents that are not
+        well-formed fail like parse_file does. Uses no parser state, so one
+        parser can scan files from several threads.
+        
+        Args:
+            file_path: Path to the ReqIF file or ReqIF archive
+            
+        Returns:
+            Number of SPEC-OBJECT elements (what parse_file returns)
+            
+        Raises:
+            RuntimeError: If the file is not well-formed XML or cannot be read
+        """
+        return self._scan_file(file_path, self._count_spec_objects)
+    
+    def requirement_identifiers(self, file_path: str) -> List[str]:
+        """
+        Quick-scan a ReqIF file or archive for the IDENTIFIERs of its SPEC-OBJECTs
+        
+        A raw byte scan for SPEC-OBJECT start tags (no tree, thread-safe, and
+        unlike count_requirements no well-formedness check); used to recognise
+        renamed or moved documents by their requirement IDs.
+        
+        Args:
+            file_path: Path to the ReqIF file or ReqIF archive
+            
+        Returns:
+            SPEC-OBJECT identifiers in document order
+        """
+        identifiers = []
+        chunks = self._scan_file(file_path, lambda stream: list(self._scan_stream(stream, _SPEC_OBJECT_IDENTIFIER)))
+        for found in chunks:
+            identifiers.extend(html.unescape((double or single).decode('utf-8', 'replace'))
+                               for double, single in found)
+        return identifiers
+    
+    def _scan_file(self, file_path: str, scan: Callable[[IO[bytes]], Any]) -> Any:
+        """Run scan over the binary stream of a ReqIF file (largest .reqif member of an archive)"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"ReqIF file not found: {file_path}")
+        
+        try:
+            if file_path.lower().endswith('.reqifz'):
+                with zipfile.ZipFile(file_path, 'r') as zip_ref:
+                    # Same choice as _extract_reqifz: the largest .reqif member
+                    members = [info for info in zip_ref.infolist() if info.filename.lower().endswith('.reqif')]
+                    if not members:
+                        raise ValueError("No .reqif files found in archive")
+                    with zip_ref.open(max(members, key=lambda info: info.file_size)) as f:
+                        return scan(f)
+            
+            with open(file_path, 'rb') as f:
+                return scan(f)
+                
+        except Exception as e:
+            raise RuntimeError(f"Failed to scan ReqIF file: {str(e)}")
+    
+    def _count_spec_objects(self, stream: IO[bytes]) -> int:
+        """Count SPEC-OBJECT start events of a binary stream with expat; raises ExpatError if not well-formed"""
+        count = 0
+        
+        def start_element(name, attrs):
+            nonlocal count
+            if name == 'SPEC-OBJECT' or name.endswith(':SPEC-OBJECT'):
+                count += 1
+        
+        parser = xml.parsers.expat.ParserCreate()
+        parser.StartElementHandler = start_element
+        parser.ParseFile(stream)
+        return count
+    
+    def _scan_stream(self, stream, pattern) -> Iterator[list]:
+        """findall results of a single-tag pattern per chunk of a binary stream; a tag split between chunks is carried over"""
+        carry = b''
+        while True:
+            chunk = stream.read(_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            data = carry + chunk
+            # A match never contains a second '<', so everything before the last one is complete
+            cut = data.rfind(b'<')
+            if cut < 0:
+                carry = b''
+                continue
+            yield pattern.findall(data, 0, cut)
+            carry = data[cut:]
+        yield pattern.findall(carry)
+    
+    def iter_requirements(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream requirements one SPEC-OBJECT at a time without building the full tree
+        
+        Definition catalogs are built when their DATATYPES / SPEC-TYPES sections
+        close (ReqIF places them before CORE-CONTENT's SPEC-OBJECTS), and every
+        SPEC-OBJECT is detached from the tree once processed, so memory stays
+        bounded by the catalogs plus one object.
+        
+        Args:
+            file_path: Path to the ReqIF file or ReqIF archive
+        
+        Yields:
+            Requirement dictionaries in document order, as parse_file returns them
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"ReqIF file not found: {file_path}")
+        
+        self._reset_parser_state()
+        
+        if file_path.lower().endswith('.reqifz'):
+            actual_file_path = self._extract_reqifz(file_path)
+        else:
+            actual_file_path = file_path
+        
+        # Open elements from the root down; needed to detach finished SPEC-OBJECTs
+        stack = []
+        index = 0
+        
+        try:
+            for event, elem in ET.iterparse(actual_file_path, events=('start', 'end')):
+                if event == 'start':
+                    if not stack:
+                        self._setup_namespace_handling(elem)
+                    stack.append(elem)
+                    continue
+                
+                stack.pop()
+                tag = elem.tag.rsplit('}', 1)[-1]
+                
+                if tag in ('DATATYPES', 'SPEC-TYPES'):
+                    self._build_comprehensive_catalogs(elem)
+                elif tag == 'SPEC-OBJECT':
+                    try:
+                        requirement = self._process_single_spec_object(elem, index)
+                    except Exception:
+                        requirement = None
+                    index += 1
+                    self.stats['spec_objects_processed'] += 1
+                    
+                    if stack:
+                        stack[-1].remove(elem)
+                    elem.clear()
+                    
+                    if requirement:
+                        self.stats['successful_resolutions'] += 1
+                        yield requirement
+                elif tag in ('SPEC-RELATIONS', 'SPECIFICATIONS', 'SPEC-RELATION-GROUPS'):
+                    # Not needed for requirement content; drop the subtree
+                    elem.clear()
+        except ET.ParseError as e:
+            raise RuntimeError(f"Failed to parse ReqIF file: {str(e)}")
+        
+        self.stats['elements_found']['SPEC-OBJECT'] = index
+    
+    def _record_raw_spans(self, file_path: str, requirements: List[Dict[str, Any]]):
+        """Record (offset, length) of every ATTRIBUTE-VALUE element in the source file"""
+        by_id = {req['id']: req for req in requirements}
+        source = MappedSource(file_path)
+        data = source._get_map()
+        
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        
+        # Parsing state: current SPEC-OBJECT, open ATTRIBUTE-VALUE and its definition ref
+        state = {'spec_id': None, 'value_start': None, 'in_ref': False, 'ref': [], 'last_start': None}
+        
+        def local(name):
+            return name.rsplit(':', 1)[-1]
+        
+        def start_element(name, attrs):
+            tag = local(name)
+            state['last_start'] = tag
+            if tag == 'SPEC-OBJECT':
+                state['spec_id'] = attrs.get('IDENTIFIER') or attrs.get('identifier')
+            elif tag.startswith('ATTRIBUTE-VALUE-') and state['spec_id'] is not None:
+                state['value_start'] = parser.CurrentByteIndex
+                state['ref'] = []
+            elif tag.startswith('ATTRIBUTE-DEFINITION-') and tag.endswith('-REF') and state['value_start'] is not None:
+                state['in_ref'] = True
+        
+        def end_element(name):
+            tag = local(name)
+            index = parser.CurrentByteIndex
+            if tag == 'SPEC-OBJECT':
+                state['spec_id'] = None
+            elif state['in_ref'] and tag.endswith('-REF'):
+                state['in_ref'] = False
+            elif tag.startswith('ATTRIBUTE-VALUE-') and state['value_start'] is not None:
+                # Empty elements report the end after '/>', others at the start of '</'
+                if state['last_start'] == tag and data[index - 2:index] == b'/>':
+                    end = index
+                else:
+                    end = data.find(b'>', index) + 1
+                self._store_raw_span(by_id.get(state['spec_id']), ''.join(state['ref']).strip(),
+                                     state['value_start'], end, source)
+                state['value_start'] = None
+            state['last_start'] = None
+        
+        def character_data(text):
+            if state['in_ref']:
+                state['ref'].append(text)
+        
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        
+        try:
+            with open(file_path, 'rb') as f:
+                parser.ParseFile(f)
+        except Exception as e:
+            print(f"Warning: could not record raw value spans: {e}")
+    
+    def _store_raw_span(self, requirement: Optional[Dict[str, Any]], attr_def_ref: str,
+                        start: int, end: int, source: MappedSource):
+        """Attach a span to the requirement under its human-readable attribute name"""
+        if requirement is None or not attr_def_ref:
+            return
+        
+        attr_name = attr_def_ref
+        if attr_def_ref in self.attribute_definitions:
+            attr_name = self.attribute_definitions[attr_def_ref]['long_name']
+        
+        # Only attributes that carried content were stored by the main pass
+        if attr_name not in requirement['attributes']:
+            return
+        
+        requirement.setdefault('_raw_spans', {})[attr_name] = (start, end - start)
+        requirement['_raw_source'] = source
+    
     def _reset_parser_state(self):
         """Reset all parser state for new file"""
         self.root_namespace = None
         self.namespace_uri = None
         self.attribute_definitions.clear()
+        # Requirements of the previous file keep referencing their own map
+        self.attribute_datatypes = {}
         self.spec_object_types.clear()
         self.enumeration_definitions.clear()
         self.enum_values.clear()
@@ -187,6 +570,7 @@ class ReqIFParser:
                         'data_type': def_type.replace('ATTRIBUTE-DEFINITION-', '').lower(),
                         'element': elem
                     }
+                    self.attribute_datatypes[long_name] = self.attribute_definitions[identifier]['data_type']
     
     def _build_enumeration_catalog(self, root):
         """Build enumeration catalog with namespace awareness"""
@@ -265,7 +649,10 @@ class ReqIFParser:
         requirement = {
             'id': req_id,
             'attributes': {},
-            'raw_attributes': {}
+            'raw_attributes': {},
+            'typed_attributes': {},
+            # Attribute datatypes for comparison rules (one dict shared per file)
+            '_datatypes': self.attribute_datatypes
         }
         
         # Add identifier only if it exists and is different from id
@@ -344,6 +731,13 @@ class ReqIFParser:
         # Store with human-readable name
         requirement['attributes'][attr_name] = content
         
+        # Keep native value for INTEGER/REAL/DATE/BOOLEAN next to the display string
+        data_type = TYPED_VALUE_TYPES.get(value_type)
+        if data_type:
+            typed_value = convert_typed_value(self._extract_numeric_content_enhanced(attr_value_elem), data_type)
+            if typed_value is not None:
+                requirement['typed_attributes'][attr_name] = typed_value
+        
         self.stats['content_extractions'] += 1
     
     def _extract_attribute_definition_ref_enhanced(self, attr_value_elem) -> Optional[str]:
@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+ReqIF Similarity Module
+Scalable similarity detection between requirement sets: one-permutation MinHash
+signatures over word shingles with LSH banding to find moved/renamed requirements,
+a TF-IDF inverted index for interactive "find similar" queries, a trigram
+index that proposes candidate names (file matching), an LSH index over
+precomputed signatures (content-based file matching by requirement IDs), and
+bounded SequenceMatcher ratios shared by every string similarity in the tool.
+"""
+
+from typing import List, Dict, Any, Tuple, Optional, Union
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+import difflib
+import hashlib
+import heapq
+import math
+import re
+import threading
+import zlib
+
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Multiplicative mixing constant (odd, golden ratio based)
+_MIX = 0x9E3779B1
+_MASK32 = 0xFFFFFFFF
+_SHINGLE_PRIME = 1000003
+
+# Exact ratios kept by the shared RatioCache
+DEFAULT_RATIO_CACHE_SIZE = 65536
+
+
+def requirement_text(req: Dict[str, Any]) -> str:
+    """Join attribute values of a requirement into one lowercased text (IDs excluded)"""
+    attributes = req.get('attributes', {}) if isinstance(req, Mapping) else {}
+    if not isinstance(attributes, dict):
+        return ''
+
+    # Typed values give one canonical spelling for "1"/"1.0" or timezone variants
+    typed_attributes = req.get('typed_attributes') or {}
+    values = [str(typed_attributes[name]) if name in typed_attributes else str(value)
+              for name, value in attributes.items() if value]
+    return ' '.join(values).lower()
+
+
+def shingle_hashes(text: str, shingle_size: int = 3, word_cache: Optional[Dict[str, int]] = None) -> set:
+    """
+    Hash word shingles of a text
+
+    Words are hashed once with CRC32 (optionally memoised in word_cache) and
+    combined per shingle with a polynomial rolling step instead of hashing the
+    joined shingle string.
+
+    Args:
+        text: Text to shingle (expected lowercased)
+        shingle_size: Number of words per shingle
+        word_cache: Optional dict reused across calls to memoise word hashes
+
+    Returns:
+        Set of 32-bit shingle hashes (texts shorter than one shingle give a single hash)
+    """
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return set()
+
+    if word_cache is None:
+        word_cache = {}
+    for word in set(words).difference(word_cache):
+        word_cache[word] = zlib.crc32(word.encode('utf-8'))
+    word_hashes = [word_cache[word] for word in words]
+
+    # Fold the shingle columns pairwise: h = (h * P + next_word) mod 2^32
+    size = min(shingle_size, len(word_hashes))
+    count = len(word_hashes) - size + 1
+    shingles = word_hashes[:count]
+    for offset in range(1, size):
+        shingles = [(shingle * _SHINGLE_PRIME + word_hash) & _MASK32
+                    for shingle, word_hash in zip(shingles, word_hashes[offset:offset + count])]
+    return set(shingles)
+
+
+def identifier_hashes(identifiers) -> set:
+    """CRC32 hashes of identifiers (stable across runs, so signatures built from them can be cached)"""
+    return {zlib.crc32(identifier.encode('utf-8', 'surrogatepass')) for identifier in identifiers}
+
+
+def jaccard(set1: set, set2: set) -> float:
+    """Exact Jaccard similarity of two sets"""
+    if not set1 and not set2:
+        return 1.0
+    intersection = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
+
+
+def length_ratio_bound(length1: int, length2: int) -> float:
+    """Upper bound of SequenceMatcher.ratio() from the lengths alone (what real_quick_ratio computes)"""
+    total = length1 + length2
+    return 2.0 * min(length1, length2) / total if total else 1.0
+
+
+def text_digest(text: str) -> bytes:
+    """Compact key of a string for RatioCache"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class RatioCache:
+    """
+    Bounded LRU of exact SequenceMatcher ratios keyed by (digest1, digest2)
+
+    Only exact ratios are stored, never early-exit bounds, so a hit is valid
+    for any threshold. Safe to share between threads.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_RATIO_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[float]:
+        """Cached ratio for key, or None"""
+        with self._lock:
+            ratio = self._entries.get(key)
+            if ratio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ratio
+
+    def put(self, key: Tuple, ratio: float):
+        """Store an exact ratio, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = ratio
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by the comparators for pairs that recur (GUI re-renders, exports, rematching)
+ratio_cache = RatioCache()
+
+
+def bounded_ratio(text1: str, text2: str, threshold: float = 0.0,
+                  cache: Optional[RatioCache] = ratio_cache, key: Optional[Tuple] = None) -> float:
+    """
+    SequenceMatcher(None, text1, text2).ratio() with early exits below a threshold
+
+    The length bound and quick_ratio are tried first; when either is below
+    threshold it is returned instead of the exact ratio, so callers that only
+    test "ratio >= threshold" get the same answer cheaply.
+
+    Args:
+        text1: First string (SequenceMatcher seq1)
+        text2: Second string (seq2)
+        threshold: Ratios below this value need not be exact
+        cache: RatioCache for exact results (None to disable)
+        key: Cache key (defaults to the digests of both strings)
+
+    Returns:
+        Exact ratio, or an upper bound of it that is below threshold
+    """
+    if text1 == text2:
+        return 1.0
+
+    bound = length_ratio_bound(len(text1), len(text2))
+    if bound < threshold:
+        return bound
+
+    if cache is not None:
+        if key is None:
+            key = (text_digest(text1), text_digest(text2))
+        ratio = cache.get(key)
+        if ratio is not None:
+            return ratio
+
+    matcher = difflib.SequenceMatcher(None, text1, text2)
+    if threshold > 0.0:
+        bound = matcher.quick_ratio()
+        if bound < threshold:
+            return bound
+
+    ratio = matcher.ratio()
+    if cache is not None:
+        cache.put(key, ratio)
+    return ratio
+
+
+class RatioScanner:
+    """
+    Bounded ratios of many candidates against one fixed reference string
+
+    The reference is set once as seq2, where SequenceMatcher builds its
+    index (and quick_ratio its character counts); each candidate only
+    replaces seq1. ratio(candidate) therefore equals
+    SequenceMatcher(None, candidate, reference).ratio() - the argument order
+    matters, ratios are not symmetric.
+    """
+
+    def __init__(self, reference: str, autojunk: bool = True):
+        self.reference = reference
+        self._matcher = difflib.SequenceMatcher(None, autojunk=autojunk)
+        self._matcher.set_seq2(reference)
+        self.stats = {'length_rejected': 0, 'quick_rejected': 0, 'computed': 0}
+
+    def ratio(self, candidate: str, threshold: float = 0.0) -> float:
+        """
+        Ratio of candidate (seq1) against the reference
+
+        Args:
+            candidate: String to score
+            threshold: Ratios below this value need not be exact
+
+        Returns:
+            Exact ratio, or an upper bound of it that is below threshold
+        """
+        if candidate == self.reference:
+            return 1.0
+
+        bound = length_ratio_bound(len(candidate), len(self.reference))
+        if bound < threshold:
+            self.stats['length_rejected'] += 1
+            return bound
+
+        matcher = self._matcher
+        matcher.set_seq1(candidate)
+        if threshold > 0.0:
+            bound = matcher.quick_ratio()
+            if bound < threshold:
+                self.stats['quick_rejected'] += 1
+                return bound
+
+        self.stats['computed'] += 1
+        return matcher.ratio()
+
+
+class MinHashLSH:
+    """
+    One-permutation MinHash with rotation densification and LSH banding
+
+    Each shingle hash is mixed once and routed to one of num_bins bins keeping
+    the bin minimum, so a signature costs O(shingles) instead of O(shingles * k).
+    Empty bins borrow the value of the next non-empty bin (plus an offset per
+    step) so sparse texts still produce comparable signatures.
+    """
+
+    def __init__(self, num_bins: int = 64, bands: int = 16):
+        if num_bins & (num_bins - 1) or num_bins < 2:
+            raise ValueError("num_bins must be a power of two")
+        if num_bins % bands:
+            raise ValueError("num_bins must be divisible by bands")
+
+        self.num_bins = num_bins
+        self.bands = bands
+        self.rows = num_bins // bands
+        self._bin_shift = 32 - (num_bins.bit_length() - 1)
+        self._value_mask = (1 << self._bin_shift) - 1
+        self._empty = self._value_mask + 1
+
+    def signature(self, hashes) -> Optional[array]:
+        """Build the densified signature of a set of shingle hashes (None if empty)"""
+        if not hashes:
+            return None
+
+        num_bins = self.num_bins
+        shift = self._bin_shift
+        value_mask = self._value_mask
+        empty = self._empty
+        bins = [empty] * num_bins
+
+        # Visit mixed hashes in descending order so the last write per bin is its minimum
+        for mixed in sorted([(shingle_hash * _MIX) & _MASK32 for shingle_hash in hashes], reverse=True):
+            bins[mixed >> shift] = mixed & value_mask
+
+        if empty in bins:
+            # Rotation densification: walk backwards so each empty bin sees its right neighbour
+            start = next(i for i in range(num_bins) if bins[i] != empty)
+            offset = 0
+            carry = bins[start]
+            for step in range(1, num_bins + 1):
+                i = (start - step) % num_bins
+                if bins[i] == empty:
+                    offset += 1
+                    bins[i] = carry + offset * empty
+                else:
+                    carry = bins[i]
+                    offset = 0
+
+        return array('I', bins)
+
+    def band_keys(self, signature: array) -> List[Tuple[int, bytes]]:
+        """Split a signature into one hashable key per band"""
+        data = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [(band, data[band * width:(band + 1) * width]) for band in range(self.bands)]
+
+    @staticmethod
+    def estimate(signature1: array, signature2: array) -> float:
+        """Estimate Jaccard similarity as the fraction of equal bins"""
+        equal = sum(1 for a, b in zip(signature1, signature2) if a == b)
+        return equal / len(signature1)
+
+
+class SignatureIndex:
+    """
+    LSH buckets over precomputed MinHash signatures
+
+    For items whose signatures are built elsewhere (e.g. cached per file): a
+    query returns the indexed items sharing at least one band key with it,
+    filtered by their signature estimate. Buckets larger than max_bucket_size
+    (boilerplate shared by many items) are skipped.
+    """
+
+    def __init__(self, lsh: MinHashLSH, signatures: List[Optional[array]], max_bucket_size: int = 200):
+        self.lsh = lsh
+        self.max_bucket_size = max_bucket_size
+        self._signatures = signatures
+        self._buckets = {}
+
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            for key in lsh.band_keys(signature):
+                self._buckets.setdefault(key, []).append(index)
+
+    def candidates(self, signature: Optional[array], min_estimate: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        Indexed items sharing a band with signature
+
+        Args:
+            signature: Query signature (None gives no candidates)
+            min_estimate: Minimum estimated Jaccard similarity
+
+        Returns:
+            List of (item index, estimate) tuples, highest estimate first
+        """
+        if signature is None:
+            return []
+
+        seen = set()
+        for key in self.lsh.band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket and len(bucket) <= self.max_bucket_size:
+                seen.update(bucket)
+
+        scored = [(index, MinHashLSH.estimate(signature, self._signatures[index])) for index in seen]
+        return sorted((item for item in scored if item[1] >= min_estimate), key=lambda item: (-item[1], item[0]))
+
+
+class MovedRequirementDetector:
+    """Pairs deleted and added requirements whose content is near-identical"""
+
+    def __init__(self, threshold: float = 0.8, num_bins: int = 64, bands: int = 16,
+                 shingle_size: int = 3, max_bucket_size: int = 200):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max_bucket_size  # Buckets of boilerplate text are skipped
+        self.lsh = MinHashLSH(num_bins, bands)
+
+        # Signature estimates are noisy; only prune clearly dissimilar candidates
+        self.estimate_margin = 0.2
+
+        self.stats = {}
+
+    def find_moved(self, deleted: List[Dict[str, Any]],
+                   added: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+        """
+        Find one-to-one pairs of (deleted, added) requirements with similar content
+
+        Args:
+            deleted: Requirements only in the original file
+            added: Requirements only in the modified file
+
+        Returns:
+            List of (deleted_req, added_req, similarity) sorted by similarity, highest first
+        """
+        self.stats = {'candidates': 0, 'verified': 0, 'pairs': 0, 'skipped_buckets': 0}
+        if not deleted or not added:
+            return []
+
+        deleted_texts = [requirement_text(req) for req in deleted]
+        added_texts = [requirement_text(req) for req in added]
+        word_cache = {}
+
+        # Index deleted requirements by band keys
+        deleted_signatures = []
+        buckets = {}
+        for index, text in enumerate(deleted_texts):
+            signature = self.lsh.signature(shingle_hashes(text, self.shingle_size, word_cache))
+            deleted_signatures.append(signature)
+            if signature is None:
+                continue
+            for key in self.lsh.band_keys(signature):
+                buckets.setdefault(key, []).append(index)
+
+        # Query with added requirements, pruning by signature estimate
+        candidate_pairs = set()
+        for added_index, text in enumerate(added_texts):
+            signature = self.lsh.signature(shingle_hashes(text, self.shingle_size, word_cache))
+            if signature is None:
+                continue
+            seen = set()
+            for key in self.lsh.band_keys(signature):
+                bucket = buckets.get(key)
+                if not bucket:
+                    continue
+                if len(bucket) > self.max_bucket_size:
+                    self.stats['skipped_buckets'] += 1
+                    continue
+                seen.update(bucket)
+            for deleted_index in seen:
+                estimate = MinHashLSH.estimate(signature, deleted_signatures[deleted_index])
+                if estimate >= self.threshold - self.estimate_margin:
+                    candidate_pairs.add((deleted_index, added_index))
+
+        self.stats['candidates'] = len(candidate_pairs)
+
+        # Exact verification on shingle sets, computed once per involved requirement
+        deleted_shingles = {}
+        added_shingles = {}
+        scored = []
+        for deleted_index, added_index in candidate_pairs:
+            if deleted_index not in deleted_shingles:
+                deleted_shingles[deleted_index] = shingle_hashes(deleted_texts[deleted_index], self.shingle_size, word_cache)
+            if added_index not in added_shingles:
+                added_shingles[added_index] = shingle_hashes(added_texts[added_index], self.shingle_size, word_cache)
+            score = jaccard(deleted_shingles[deleted_index], added_shingles[added_index])
+            if score >= self.threshold:
+                scored.append((score, deleted_index, added_index))
+
+        self.stats['verified'] = len(scored)
+
+        # Greedy one-to-one assignment, best pairs first (index tie-break keeps it deterministic)
+        scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+        used_deleted = set()
+        used_added = set()
+        pairs = []
+        for score, deleted_index, added_index in scored:
+            if deleted_index in used_deleted or added_index in used_added:
+                continue
+            used_deleted.add(deleted_index)
+            used_added.add(added_index)
+            pairs.append((deleted[deleted_index], added[added_index], round(score, 3)))
+
+        self.stats['pairs'] = len(pairs)
+        return pairs
+
+
+class SimilarityIndex:
+    """
+    Reusable TF-IDF inverted index over a requirement set
+
+    Built once: every requirement is tokenised, its sublinear TF-IDF weights are
+    stored in per-token postings (parallel arrays of document index and weight)
+    and its vector norm is cached. Queries only touch the postings of their own
+    tokens; difflib is used just to re-rank the best cosine candidates.
+    """
+
+    def __init__(self, requirements: List[Dict[str, Any]]):
+        self.requirements = [req for req in requirements if isinstance(req, Mapping)]
+        self.document_count = len(self.requirements)
+
+        self._postings_docs = {}     # token -> array('I') of document indexes
+        self._postings_weights = {}  # token -> array('f') of TF-IDF weights
+        self._idf = {}
+        self._norms = array('d')
+
+        self._build()
+
+    def _build(self):
+        """Tokenise all requirements and fill postings, idf and norms"""
+        term_counts = []
+        document_frequency = Counter()
+        for req in self.requirements:
+            counts = Counter(WORD_PATTERN.findall(requirement_text(req)))
+            term_counts.append(counts)
+            document_frequency.update(counts.keys())
+
+        total = self.document_count
+        self._idf = {token: math.log((total + 1) / (frequency + 1)) + 1.0
+                     for token, frequency in document_frequency.items()}
+
+        norms = [0.0] * total
+        for index, counts in enumerate(term_counts):
+            squared = 0.0
+            for token, count in counts.items():
+                weight = (1.0 + math.log(count)) * self._idf[token]
+                squared += weight * weight
+                docs = self._postings_docs.get(token)
+                if docs is None:
+                    docs = self._postings_docs[token] = array('I')
+                    self._postings_weights[token] = array('f')
+                docs.append(index)
+                self._postings_weights[token].append(weight)
+            norms[index] = math.sqrt(squared)
+        self._norms = array('d', norms)
+
+    def _query_vector(self, text: str) -> Dict[str, float]:
+        """TF-IDF weights of the query tokens known to the index"""
+        counts = Counter(WORD_PATTERN.findall(text))
+        return {token: (1.0 + math.log(count)) * self._idf[token]
+                for token, count in counts.items() if token in self._idf}
+
+    def cosine_scores(self, query: Union[str, Dict[str, Any]]) -> Dict[int, float]:
+        """
+        Score every document sharing at least one token with the query
+
+        Args:
+            query: Requirement dictionary or free text
+
+        Returns:
+            Dict of document index -> cosine similarity
+        """
+        text = query.lower() if isinstance(query, str) else requirement_text(query)
+        vector = self._query_vector(text)
+        if not vector:
+            return {}
+
+        query_norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        scores = {}
+        for token, query_weight in vector.items():
+            get = scores.get
+            for index, weight in zip(self._postings_docs[token], self._postings_weights[token]):
+                scores[index] = get(index, 0.0) + query_weight * weight
+
+        norms = self._norms
+        return {index: dot / (query_norm * norms[index])
+                for index, dot in scores.items() if norms[index]}
+
+    def query(self, query: Union[str, Dict[str, Any]], top_k: Optional[int] = 10,
+              threshold: float = 0.0, rerank: bool = True,
+              pool_size: int = 100) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Find the requirements most similar to a requirement or text
+
+        Args:
+            query: Requirement dictionary (its own ID is excluded) or free text
+            top_k: Maximum number of results (None for all above threshold)
+            threshold: Minimum final score
+            rerank: Re-rank the best cosine candidates with difflib's ratio
+            pool_size: Number of cosine candidates passed to re-ranking
+
+        Returns:
+            List of (requirement, score) tuples, highest score first
+        """
+        scores = self.cosine_scores(query)
+
+        exclude_id = query.get('id') if isinstance(query, Mapping) else None
+        if exclude_id is not None:
+            scores = {index: score for index, score in scores.items()
+                      if self.requirements[index].get('id') != exclude_id}
+
+        pool = max(pool_size, top_k or 0)
+        candidates = heapq.nlargest(pool, scores.items(), key=lambda item: item[1])
+
+        if rerank and candidates:
+            query_text = query.lower() if isinstance(query, str) else requirement_text(query)
+            scanner = RatioScanner(query_text, autojunk=False)
+            reranked = []
+            for index, _ in candidates:
+                # Candidates that cannot reach the threshold are dropped below anyway
+                reranked.append((index, scanner.ratio(requirement_text(self.requirements[index]), threshold)))
+            candidates = sorted(reranked, key=lambda item: item[1], reverse=True)
+
+        results = [(self.requirements[index], round(score, 3))
+                   for index, score in candidates if score >= threshold]
+        return results[:top_k] if top_k is not None else results
+
+
+def trigrams(text: str) -> frozenset:
+    """Character trigrams of a lowercased string, padded so short strings and both ends still count"""
+    padded = f"  {text.lower()} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    Inverted index of character trigrams for candidate generation over short strings
+
+    Meant for names and identifiers: a query ranks the indexed strings by the
+    Dice coefficient of their trigram sets and returns the best few, which
+    callers then score exactly. Only the query's rarest trigrams are counted,
+    so trigrams common to most strings (a shared prefix or extension) do not
+    turn every query into a scan of the whole index.
+    """
+
+    def __init__(self, strings: List[str], max_query_trigrams: int = 12):
+        self.max_query_trigrams = max_query_trigrams
+        self._sizes = array('I')
+        self._postings = {}  # trigram -> list of string indexes
+
+        postings = self._postings
+        for index, text in enumerate(strings):
+            grams = trigrams(text)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [index]
+                else:
+                    posting.append(index)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def candidates(self, text: str, limit: int = 16) -> List[Tuple[int, float]]:
+        """
+        Indexed strings sharing trigrams with text, most similar first
+
+        Args:
+            text: Query string
+            limit: Maximum number of candidates
+
+        Returns:
+            List of (string index, Dice estimate) tuples; ties keep index order
+        """
+        grams = trigrams(text)
+        postings = self._postings
+        lists = sorted((postings[gram] for gram in grams if gram in postings), key=len)
+        counts = Counter()
+        for posting in lists[:self.max_query_trigrams]:
+            counts.update(posting)
+
+        size = len(grams)
+        sizes = self._sizes
+        best = heapq.nsmallest(limit, ((-2.0 * shared / (size + sizes[index]), index)
+                                       for index, shared in counts.items()))
+        return [(index, -score) for score, index in best]
+
+
+# Example usage
+if __name__ == "__main__":
+    print("ReqIF Similarity - MinHash/LSH moved requirement detection")
+
+    old = [{'id': 'A1', 'attributes': {'Text': 'The brake system shall report a fault within 10 ms'}}]
+    new = [{'id': 'B7', 'attributes': {'Text': 'The brake system shall report a fault within 10 ms.'}}]
+
+    detector = MovedRequirementDetector()
+    for old_req, new_req, score in detector.find_moved(old, new):
+        print(f"{old_req['id']} -> {new_req['id']} (similarity {score})")
+
+    index = SimilarityIndex(old + new)
+    for req, score in index.query(old[0], top_k=5):
+        print(f"Similar to {old[0]['id']}: {req['id']} ({score})")
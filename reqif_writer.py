@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+ReqIF Writer Module
+Streaming ReqIF writer for exporting filtered or merged subsets of an existing file.
+Header, datatype and spec-type sections are copied from the source file and
+SPEC-OBJECTs are written one at a time from an iterator, so memory use stays
+constant regardless of the size of the source.
+"""
+
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, Callable, Optional, Dict, Any, IO
+from contextlib import contextmanager
+from xml.sax.saxutils import escape, quoteattr
+import io
+import itertools
+import os
+import zipfile
+
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+XHTML_NAMESPACE = "http://www.w3.org/1999/xhtml"
+
+# Element path leading to the section containers of a ReqIF document
+CONTAINER_PATH = ('REQ-IF', 'CORE-CONTENT', 'REQ-IF-CONTENT')
+
+# Sections copied verbatim from the source. SPEC-RELATIONS, SPECIFICATIONS and
+# SPEC-RELATION-GROUPS are dropped because they may reference omitted objects.
+COPIED_SECTIONS = {'THE-HEADER', 'DATATYPES', 'SPEC-TYPES'}
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace part from an ElementTree tag"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _split_tag(tag: str):
+    """Split an ElementTree tag into (namespace_uri, local_name)"""
+    if tag.startswith('{'):
+        uri, local = tag[1:].split('}', 1)
+        return uri, local
+    return None, tag
+
+
+class ReqIFWriter:
+    """
+    Streaming ReqIF writer that copies the preamble of a source file and writes
+    SPEC-OBJECT elements from an iterator
+    """
+
+    def __init__(self, source_path: str):
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"ReqIF file not found: {source_path}")
+
+        self.source_path = source_path
+
+        # Namespaces declared on the source root element (the output root scope): uri -> prefix
+        self.namespaces: Dict[str, str] = {}
+
+        self.stats = {
+            'spec_objects_written': 0,
+            'spec_objects_skipped': 0,
+            'sections_copied': 0
+        }
+
+    def write(self, output_path: str, spec_objects: Optional[Iterable[ET.Element]] = None) -> Dict[str, Any]:
+        """
+        Write a ReqIF file with the source preamble and the given SPEC-OBJECTs
+
+        Args:
+            output_path: Target .reqif or .reqifz path
+            spec_objects: Iterable of SPEC-OBJECT elements (None = all from source)
+
+        Returns:
+            Statistics of the write operation
+        """
+        self._reset_stats()
+
+        if spec_objects is None:
+            spec_objects = self.iter_spec_objects()
+
+        try:
+            with self._open_output(output_path) as out:
+                out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                self._write_preamble(out)
+
+                out.write(f"<{self._qualified_container('SPEC-OBJECTS')}>\n")
+                for spec_obj in spec_objects:
+                    self._write_element(spec_obj, out, dict(self.namespaces))
+                    out.write('\n')
+                    self.stats['spec_objects_written'] += 1
+                out.write(f"</{self._qualified_container('SPEC-OBJECTS')}>\n")
+
+                for name in reversed(CONTAINER_PATH):
+                    out.write(f"</{self._qualified_container(name)}>\n")
+
+            result = self.stats.copy()
+            result['output_path'] = output_path
+            return result
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to write ReqIF file: {str(e)}")
+
+    def write_filtered(self, output_path: str, predicate: Callable[[ET.Element], bool]) -> Dict[str, Any]:
+        """Write only the source SPEC-OBJECTs accepted by the predicate"""
+        return self.write(output_path, self.iter_spec_objects(predicate))
+
+    def write_ids(self, output_path: str, ids: Iterable[str]) -> Dict[str, Any]:
+        """Write only the source SPEC-OBJECTs whose IDENTIFIER is in ids"""
+        id_set = set(ids)
+        return self.write_filtered(output_path, lambda elem: self._extract_identifier(elem) in id_set)
+
+    def write_comparison_subset(self, output_path: str, comparison_results: Dict[str, Any],
+                                categories: Iterable[str] = ('added', 'content_modified')) -> Dict[str, Any]:
+        """
+        Write the requirements of selected comparison categories
+
+        The source file must be the side that contains the requirements, i.e. the
+        modified file for 'added'/'content_modified' and the original for 'deleted'.
+
+        Args:
+            output_path: Target .reqif or .reqifz path
+            comparison_results: Result of ReqIFComparator.compare_requirements
+            categories: Result categories to export
+        """
+        ids = set()
+        for category in categories:
+            for req in comparison_results.get(category, []) or []:
+                try:
+                    req_id = req.get('id')
+                    if req_id:
+                        ids.add(req_id)
+                except Exception:
+                    continue
+
+        return self.write_ids(output_path, ids)
+
+    def write_merge(self, output_path: str, merge_plan: Dict[str, Any], theirs_path: str,
+                    conflict_policy: str = 'ours') -> Dict[str, Any]:
+        """
+        Write the result of a three-way merge; this writer's source is "ours"
+
+        SPEC-OBJECTs of ours are streamed unchanged except for IDs the plan drops
+        or takes from theirs; for 'merge_attributes' IDs the ATTRIBUTE-VALUEs
+        changed only by theirs are swapped into our element. Requirements taken
+        from theirs as a whole are appended after ours.
+
+        Args:
+            output_path: Target .reqif or .reqifz path
+            merge_plan: 'merge_plan' from ThreeWayComparator.compare_requirements
+            theirs_path: ReqIF file of the other edited copy
+            conflict_policy: 'ours' keeps our version of conflicting requirements,
+                'theirs' takes theirs, 'skip' leaves them out
+
+        Returns:
+            Statistics of the write operation
+        """
+        take_theirs = set(merge_plan.get('take_theirs', []))
+        drop = set(merge_plan.get('drop', []))
+        merge_attributes = merge_plan.get('merge_attributes', {})
+        conflicts = set(merge_plan.get('conflicts', {}))
+
+        if conflict_policy == 'theirs':
+            # Theirs wins; conflicts theirs deleted simply do not show up in their stream
+            drop |= conflicts
+            take_theirs |= conflicts
+        elif conflict_policy == 'skip':
+            drop |= conflicts
+        elif conflict_policy != 'ours':
+            raise ValueError(f"Unknown conflict policy: {conflict_policy}")
+
+        theirs_writer = ReqIFWriter(theirs_path)
+        ours_names = self.attribute_definition_names()
+        replacements = theirs_writer._collect_attribute_values(merge_attributes, theirs_writer.attribute_definition_names())
+
+        def ours_objects():
+            for elem in self.iter_spec_objects(
+                    lambda e: self._extract_identifier(e) not in drop and self._extract_identifier(e) not in take_theirs):
+                req_id = self._extract_identifier(elem)
+                if req_id in merge_attributes:
+                    self._apply_attribute_values(elem, merge_attributes[req_id], replacements.get(req_id, {}), ours_names)
+                yield elem
+
+        theirs_objects = theirs_writer.iter_spec_objects(lambda e: theirs_writer._extract_identifier(e) in take_theirs)
+
+        result = self.write(output_path, itertools.chain(ours_objects(), theirs_objects))
+        result['merged_requirements'] = len(merge_attributes)
+        result['taken_from_theirs'] = len(take_theirs)
+        return result
+
+    def attribute_definition_names(self) -> Dict[str, str]:
+        """Map ATTRIBUTE-DEFINITION identifiers of the source to their LONG-NAME (as ReqIFParser names attributes)"""
+        names = {}
+        with self._open_source() as stream:
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                name = _local_name(elem.tag)
+                if event == 'start':
+                    if name == 'SPEC-OBJECTS':
+                        break
+                    continue
+                if name.startswith('ATTRIBUTE-DEFINITION-') and not name.endswith('-REF'):
+                    identifier = self._extract_identifier(elem)
+                    if identifier:
+                        names[identifier] = elem.get('LONG-NAME') or elem.get('long-name') or identifier
+        return names
+
+    def _collect_attribute_values(self, merge_attributes: Dict[str, Any],
+                                  definition_names: Dict[str, str]) -> Dict[str, Dict[str, ET.Element]]:
+        """Detach the ATTRIBUTE-VALUE elements of the requested (ID, attribute) pairs from the source"""
+        collected = {}
+        if not merge_attributes:
+            return collected
+
+        for elem in self.iter_spec_objects(lambda e: self._extract_identifier(e) in merge_attributes):
+            req_id = self._extract_identifier(elem)
+            wanted = {field[len('attribute.'):] if field.startswith('attribute.') else field
+                      for field in merge_attributes[req_id]}
+            values = collected.setdefault(req_id, {})
+            for values_elem, value_elem in self._attribute_value_elements(elem):
+                attr_name = definition_names.get(self._definition_ref(value_elem), self._definition_ref(value_elem))
+                if attr_name in wanted:
+                    # Detached, so clearing the SPEC-OBJECT does not empty it
+                    values_elem.remove(value_elem)
+                    values[attr_name] = value_elem
+        return collected
+
+    def _apply_attribute_values(self, elem: ET.Element, fields: Iterable[str],
+                                replacements: Dict[str, ET.Element], definition_names: Dict[str, str]):
+        """Replace (or remove, when theirs deleted it) the given attributes of a SPEC-OBJECT in place"""
+        wanted = {field[len('attribute.'):] if field.startswith('attribute.') else field for field in fields}
+        values_container = None
+
+        for values_elem, value_elem in list(self._attribute_value_elements(elem)):
+            values_container = values_elem
+            attr_name = definition_names.get(self._definition_ref(value_elem), self._definition_ref(value_elem))
+            if attr_name in wanted:
+                values_elem.remove(value_elem)
+
+        if values_container is None:
+            values_container = next((child for child in elem if _local_name(child.tag) == 'VALUES'), None)
+            if values_container is None:
+                values_container = ET.SubElement(elem, elem.tag.replace('SPEC-OBJECT', 'VALUES'))
+
+        for attr_name in sorted(wanted):
+            if attr_name in replacements:
+                values_container.append(replacements[attr_name])
+
+    def _attribute_value_elements(self, elem: ET.Element) -> Iterator:
+        """Yield (VALUES element, ATTRIBUTE-VALUE-* element) pairs of a SPEC-OBJECT"""
+        for child in elem:
+            if _local_name(child.tag) == 'VALUES':
+                for value_elem in list(child):
+                    if _local_name(value_elem.tag).startswith('ATTRIBUTE-VALUE-'):
+                        yield child, value_elem
+
+    def _definition_ref(self, value_elem: ET.Element) -> Optional[str]:
+        """Attribute definition referenced by an ATTRIBUTE-VALUE element"""
+        for definition in value_elem:
+            if _local_name(definition.tag) == 'DEFINITION':
+                for ref in definition:
+                    if ref.text:
+                        return ref.text.strip()
+        return value_elem.get('ATTRIBUTE-DEFINITION-REF')
+
+    def iter_spec_objects(self, predicate: Optional[Callable[[ET.Element], bool]] = None) -> Iterator[ET.Element]:
+        """
+        Stream SPEC-OBJECT elements from the source file
+
+        Each yielded element is released as soon as the iteration continues, so it
+        must be consumed (e.g. written) before requesting the next one.
+        """
+        with self._open_source() as stream:
+            in_spec_objects = False
+            container = None
+
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                name = _local_name(elem.tag)
+
+                if event == 'start':
+                    if name == 'SPEC-OBJECTS':
+                        in_spec_objects = True
+                        container = elem
+                    continue
+
+                if name == 'SPEC-OBJECTS':
+                    # Nothing after the SPEC-OBJECTS section is needed
+                    return
+
+                if in_spec_objects and name == 'SPEC-OBJECT':
+                    if predicate is None or predicate(elem):
+                        yield elem
+                    else:
+                        self.stats['spec_objects_skipped'] += 1
+
+                    elem.clear()
+                    if container is not None:
+                        try:
+                            container.remove(elem)
+                        except ValueError:
+                            pass
+
+    def _reset_stats(self):
+        """Reset statistics for a new write"""
+        self.stats = {
+            'spec_objects_written': 0,
+            'spec_objects_skipped': 0,
+            'sections_copied': 0
+        }
+
+    def _write_preamble(self, out: IO[str]):
+        """Copy the root element, header, datatypes and spec-types from the source"""
+        self.namespaces = {}
+        stack = []
+
+        with self._open_source() as stream:
+            for event, payload in ET.iterparse(stream, events=('start-ns', 'start', 'end')):
+                if event == 'start-ns':
+                    if stack:
+                        # Declared below the root: _write_element declares it where it is used
+                        continue
+                    prefix, uri = payload
+                    # Prefer the default namespace if the source declares one
+                    if uri not in self.namespaces or prefix == '':
+                        self.namespaces[uri] = prefix
+                    continue
+
+                elem = payload
+                name = _local_name(elem.tag)
+
+                if event == 'start':
+                    if name == 'SPEC-OBJECTS' and tuple(stack) == CONTAINER_PATH:
+                        break
+
+                    stack.append(name)
+                    if tuple(stack) == CONTAINER_PATH[:len(stack)]:
+                        out.write(self._start_tag(elem, declare_namespaces=(len(stack) == 1)) + '\n')
+                    continue
+
+                stack.pop()
+                if name == CONTAINER_PATH[-1] and tuple(stack) == CONTAINER_PATH[:-1]:
+                    # End of REQ-IF-CONTENT without a SPEC-OBJECTS section
+                    stack.append(name)
+                    break
+
+                if stack and tuple(stack) == CONTAINER_PATH[:len(stack)] and name in COPIED_SECTIONS:
+                    self._write_element(elem, out, dict(self.namespaces))
+                    out.write('\n')
+                    self.stats['sections_copied'] += 1
+                    elem.clear()
+
+        if len(stack) < len(CONTAINER_PATH):
+            # Source without CORE-CONTENT: open the missing containers
+            for name in CONTAINER_PATH[len(stack):]:
+                out.write(f"<{self._qualified_container(name)}>\n")
+
+    def _start_tag(self, elem: ET.Element, declare_namespaces: bool = False) -> str:
+        """Build the start tag of a container element"""
+        parts = [self._qualified_name(elem.tag, self.namespaces)]
+
+        if declare_namespaces:
+            for uri, prefix in self.namespaces.items():
+                attr = 'xmlns' if not prefix else f'xmlns:{prefix}'
+                parts.append(f'{attr}={quoteattr(uri)}')
+
+        for key, value in elem.attrib.items():
+            parts.append(f'{self._qualified_name(key, self.namespaces, attribute=True)}={quoteattr(value)}')
+
+        return '<' + ' '.join(parts) + '>'
+
+    def _write_element(self, elem: ET.Element, out: IO[str], scope: Dict[str, str]):
+        """Serialize an element subtree, declaring namespaces not yet in scope"""
+        declarations = []
+
+        uri, _ = _split_tag(elem.tag)
+        if uri and uri != XML_NAMESPACE and uri not in scope:
+            scope = dict(scope)
+            scope[uri] = self._new_prefix(uri, scope)
+            declarations.append((uri, scope[uri]))
+
+        for key in elem.attrib:
+            attr_uri, _ = _split_tag(key)
+            if attr_uri and attr_uri != XML_NAMESPACE and not scope.get(attr_uri):
+                scope = dict(scope)
+                scope[attr_uri] = self._new_prefix(attr_uri, scope, allow_default=False)
+                declarations.append((attr_uri, scope[attr_uri]))
+
+        tag = self._qualified_name(elem.tag, scope)
+        parts = [tag]
+        for decl_uri, prefix in declarations:
+            attr = 'xmlns' if not prefix else f'xmlns:{prefix}'
+            parts.append(f'{attr}={quoteattr(decl_uri)}')
+        for key, value in elem.attrib.items():
+            parts.append(f'{self._qualified_name(key, scope, attribute=True)}={quoteattr(value)}')
+
+        if elem.text is None and len(elem) == 0:
+            out.write('<' + ' '.join(parts) + '/>')
+        else:
+            out.write('<' + ' '.join(parts) + '>')
+            if elem.text:
+                out.write(escape(elem.text))
+            for child in elem:
+                self._write_element(child, out, scope)
+                if child.tail:
+                    out.write(escape(child.tail))
+            out.write(f'</{tag}>')
+
+    def _qualified_name(self, tag: str, scope: Dict[str, str], attribute: bool = False) -> str:
+        """Map an ElementTree name to a prefixed name using the namespaces in scope"""
+        uri, local = _split_tag(tag)
+        if uri is None:
+            return local
+        if uri == XML_NAMESPACE:
+            return f'xml:{local}'
+
+        prefix = scope.get(uri, '')
+        if attribute and not prefix:
+            # Unprefixed attributes never belong to the default namespace
+            return local
+        return f'{prefix}:{local}' if prefix else local
+
+    def _qualified_container(self, name: str) -> str:
+        """Qualified name of a ReqIF container element"""
+        for uri, prefix in self.namespaces.items():
+            if uri.endswith('reqif.xsd'):
+                return f'{prefix}:{name}' if prefix else name
+        return name
+
+    def _new_prefix(self, uri: str, scope: Dict[str, str], allow_default: bool = True) -> str:
+        """Pick a prefix for a namespace that is not yet declared"""
+        used = set(scope.values())
+        if uri == XHTML_NAMESPACE and 'xhtml' not in used:
+            return 'xhtml'
+        if allow_default and '' not in used:
+            return ''
+
+        index = 0
+        while f'ns{index}' in used:
+            index += 1
+        return f'ns{index}'
+
+    def _extract_identifier(self, element) -> Optional[str]:
+        """Extract identifier with the same fallbacks as ReqIFParser"""
+        return (element.get('IDENTIFIER') or
+                element.get('identifier') or
+                element.get('ID') or
+                element.get('id'))
+
+    @contextmanager
+    def _open_source(self):
+        """Open the source ReqIF stream, reading .reqifz archives in place"""
+        if self.source_path.lower().endswith('.reqifz'):
+            with zipfile.ZipFile(self.source_path, 'r') as zip_ref:
+                members = [info for info in zip_ref.infolist()
+                           if info.filename.lower().endswith('.reqif')]
+                if not members:
+                    raise ValueError("No .reqif files found in archive")
+
+                # Same choice as ReqIFParser: the largest .reqif file
+                main_member = max(members, key=lambda info: info.file_size)
+                with zip_ref.open(main_member, 'r') as stream:
+                    yield stream
+        else:
+            with open(self.source_path, 'rb') as stream:
+                yield stream
+
+    @contextmanager
+    def _open_output(self, output_path: str):
+        """Open the output text stream, writing .reqifz archives directly"""
+        if output_path.lower().endswith('.reqifz'):
+            member_name = os.path.splitext(os.path.basename(output_path))[0] + '.reqif'
+            with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+                with zip_ref.open(member_name, 'w', force_zip64=True) as raw:
+                    with io.TextIOWrapper(raw, encoding='utf-8', newline='\n') as out:
+                        yield out
+        else:
+            with open(output_path, 'w', encoding='utf-8', newline='\n') as out:
+                yield out
+
+
+def write_requirement_subset(source_path: str, output_path: str, ids: Iterable[str]) -> Dict[str, Any]:
+    """Convenience wrapper: write the SPEC-OBJECTs with the given IDs to output_path"""
+    return ReqIFWriter(source_path).write_ids(output_path, ids)
+
+
+# Example usage
+if __name__ == "__main__":
+    print("ReqIF Writer - Streaming export of filtered or merged subsets")
+    print("Features: Constant-memory SPEC-OBJECT streaming, direct .reqifz output")
+
+    # Example usage:
+    # writer = ReqIFWriter("modified.reqif")
+    # writer.write_comparison_subset("changes.reqifz", comparison_results)
@@ -0,0 +1,967 @@
+#!/usr/bin/env python3
+"""
+Result Snapshot Module
+Compact, versioned binary format for comparison results, so file and folder
+comparisons can be saved and reloaded into the GUIs without re-comparing.
+
+Layout (all integers are LEB128 varints unless noted):
+    header   b'RQSN' + format version (u16 LE) + flags (u16 LE)
+    blocks   [length][zlib data] ... [0]
+             each block: strings and dict shapes first used in it, then
+             records of (section, category, value)
+    trailer  zlib data: complete string table, shapes, sections with their
+             metadata, the document, block offsets, record ids, record
+             positions (u32 arrays) and delta-encoded category membership
+             per section
+    footer   trailer offset (u64 LE), trailer length (u64 LE), b'RQSE'
+
+Field names and other dict keys are interned in the string table; a dict is
+stored as the index of its key tuple ("shape") followed by its values.
+Requirement copies and change payloads are compressed block by block, so a
+record is found by id with one block decompression, and the blocks can be
+read front to back from a stream without the trailer. Keys starting with '_'
+(digests, profiles, source spans) are not written.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union, BinaryIO
+from collections.abc import Mapping
+from array import array
+from datetime import datetime, date
+from itertools import accumulate
+import io
+import os
+import struct
+import sys
+import zlib
+
+from reqif_comparator import ComparisonEntry, LazyFieldDiff
+
+
+MAGIC = b'RQSN'
+FOOTER_MAGIC = b'RQSE'
+FORMAT_VERSION = 1
+
+# Uncompressed bytes collected before a block is compressed and written
+DEFAULT_BLOCK_SIZE = 128 * 1024
+
+RESULT_CATEGORIES = ('added', 'deleted', 'moved', 'content_modified', 'structural_only', 'unchanged')
+
+_HEADER = struct.Struct('<4sHH')
+_FOOTER = struct.Struct('<QQ4s')
+_FLOAT = struct.Struct('<d')
+
+# Value tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT_TAG, _STR, _LIST, _TUPLE, _DICT, _PAIRS, _SET, _BYTES, \
+    _DATETIME, _DATE, _ENTRY, _STR_DICT, _STR_LIST = range(17)
+
+
+def _write_varint(out: bytearray, value: int):
+    """Append an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned varint; returns (value, next position)"""
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_stream_varint(stream: BinaryIO) -> int:
+    """Read an unsigned varint from a file object"""
+    result = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            raise ValueError("Truncated result snapshot")
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def _pack_varints(values) -> bytes:
+    """Pack non-negative integers as consecutive varints"""
+    out = bytearray()
+    for value in values:
+        _write_varint(out, value)
+    return bytes(out)
+
+
+def _unpack_varints(data: bytes) -> List[int]:
+    """Inverse of _pack_varints"""
+    if not data or max(data) < 0x80:
+        return list(data)
+    values = []
+    pos = 0
+    while pos < len(data):
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def _array_bytes(values: array) -> bytes:
+    """Little-endian bytes of an unsigned int array"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _bytes_array(data: bytes) -> array:
+    """Inverse of _array_bytes"""
+    values = array('I')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class _Encoder:
+    """Value encoder with an append-only string table and shape table"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.string_index: Dict[str, int] = {}
+        self.shapes: List[Tuple[int, ...]] = []
+        self.shape_index: Dict[Tuple[str, ...], int] = {}
+        # Key tuple of a mapping -> (shape index, keys written)
+        self._mapping_plans: Dict[Tuple, Tuple[Optional[int], Tuple]] = {}
+        # First string/shape not yet written to a block
+        self.strings_written = 0
+        self.shapes_written = 0
+
+    def intern(self, text: str) -> int:
+        index = self.string_index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.string_index[text] = index
+            self.strings.append(text)
+        return index
+
+    def shape(self, keys: Tuple[str, ...]) -> int:
+        index = self.shape_index.get(keys)
+        if index is None:
+            index = len(self.shapes)
+            self.shape_index[keys] = index
+            self.shapes.append(tuple(self.intern(key) for key in keys))
+        return index
+
+    def encode(self, value: Any, out: bytearray):
+        """Append the tagged encoding of value"""
+        value_type = type(value)
+        if value_type is str:
+            data = value.encode('utf-8', 'surrogatepass')
+            out.append(_STR)
+            _write_varint(out, len(data))
+            out += data
+        elif value is None:
+            out.append(_NONE)
+        elif value_type is bool:
+            out.append(_TRUE if value else _FALSE)
+        elif value_type is int:
+            out.append(_INT)
+            _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif value_type is float:
+            out.append(_FLOAT_TAG)
+            out += _FLOAT.pack(value)
+        elif value_type is dict:
+            self._encode_mapping(value, out)
+        elif value_type is list or value_type is tuple:
+            if value_type is list and value and all(type(item) is str for item in value):
+                joined = '\x00'.join(value)
+                if joined.count('\x00') == len(value) - 1:
+                    data = joined.encode('utf-8', 'surrogatepass')
+                    out.append(_STR_LIST)
+                    _write_varint(out, len(value))
+                    _write_varint(out, len(data))
+                    out += data
+                    return
+            out.append(_LIST if value_type is list else _TUPLE)
+            _write_varint(out, len(value))
+            for item in value:
+                self.encode(item, out)
+        elif isinstance(value, ComparisonEntry):
+            self._encode_entry(value, out)
+        elif isinstance(value, Mapping):
+            self._encode_mapping(value, out)
+        elif isinstance(value, (set, frozenset)):
+            out.append(_SET)
+            items = sorted(value, key=str)
+            _write_varint(out, len(items))
+            for item in items:
+                self.encode(item, out)
+        elif isinstance(value, (bytes, bytearray)):
+            out.append(_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif isinstance(value, date):
+            data = value.isoformat().encode('ascii')
+            out.append(_DATETIME if isinstance(value, datetime) else _DATE)
+            out.append(len(data))
+            out += data
+        elif isinstance(value, int):
+            self.encode(int(value), out)
+        elif isinstance(value, float):
+            self.encode(float(value), out)
+        elif isinstance(value, (list, tuple)):
+            self.encode(list(value), out)
+        else:
+            # Same fallback as the JSON export's default=str
+            self.encode(str(value), out)
+
+    def _encode_mapping(self, value: Mapping, out: bytearray):
+        all_keys = tuple(value)
+        plan = self._mapping_plans.get(all_keys)
+        if plan is None:
+            plan = self._mapping_plans[all_keys] = self._plan_mapping(all_keys)
+        shape_index, keys = plan
+
+        encode = self.encode
+        if shape_index is None:
+            out.append(_PAIRS)
+            _write_varint(out, len(keys))
+            for key in keys:
+                encode(key, out)
+                encode(value[key], out)
+            return
+
+        # All-string dicts (attribute values) are one NUL-separated blob when no value contains NUL
+        values = [value[key] for key in keys]
+        if all(type(item) is str for item in values):
+            joined = '\x00'.join(values)
+            if joined.count('\x00') == max(len(values) - 1, 0):
+                data = joined.encode('utf-8', 'surrogatepass')
+                out.append(_STR_DICT)
+                _write_varint(out, shape_index)
+                _write_varint(out, len(data))
+                out += data
+                return
+
+        out.append(_DICT)
+        _write_varint(out, shape_index)
+        for item in values:
+            encode(item, out)
+
+    def _plan_mapping(self, all_keys: Tuple) -> Tuple[Optional[int], Tuple]:
+        """Shape index (None unless all keys are strings) and the keys that are written"""
+        keys = tuple(key for key in all_keys if not (type(key) is str and key[:1] == '_'))
+        if all(type(key) is str for key in keys):
+            return self.shape(keys), keys
+        return None, keys
+
+    def _encode_entry(self, entry: ComparisonEntry, out: bytearray):
+        # Detailed diffs are recreated lazily from 'changes' when the snapshot is read
+        comparison = {key: value for key, value in entry.comparison.items() if key != 'detailed_changes'}
+        out.append(_ENTRY)
+        self.encode(entry.old, out)
+        self.encode(entry.new, out)
+        self.encode(entry.delta, out)
+        self.encode(comparison, out)
+        out.append(_TRUE if 'detailed_changes' in entry.comparison else _FALSE)
+
+    def write_tables(self, out: bytearray, everything: bool = False):
+        """Append strings and shapes not yet written (all of them when everything is set)"""
+        string_start = 0 if everything else self.strings_written
+        shape_start = 0 if everything else self.shapes_written
+
+        _write_varint(out, len(self.strings) - string_start)
+        for text in self.strings[string_start:]:
+            data = text.encode('utf-8', 'surrogatepass')
+            _write_varint(out, len(data))
+            out += data
+
+        _write_varint(out, len(self.shapes) - shape_start)
+        for shape in self.shapes[shape_start:]:
+            _write_varint(out, len(shape))
+            for index in shape:
+                _write_varint(out, index)
+
+        if not everything:
+            self.strings_written = len(self.strings)
+            self.shapes_written = len(self.shapes)
+
+
+class _Decoder:
+    """Value decoder over the string and shape tables read so far"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.shapes: List[Tuple[str, ...]] = []
+
+    def read_tables(self, data: bytes, pos: int) -> int:
+        """Extend the tables from data; returns the position after them"""
+        count, pos = _read_varint(data, pos)
+        strings = self.strings
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            strings.append(data[pos:pos + length].decode('utf-8', 'surrogatepass'))
+            pos += length
+
+        count, pos = _read_varint(data, pos)
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            keys = []
+            for _ in range(length):
+                index, pos = _read_varint(data, pos)
+                keys.append(strings[index])
+            self.shapes.append(tuple(keys))
+        return pos
+
+    def decode(self, data: bytes, pos: int) -> Tuple[Any, int]:
+        """Decode one value; returns (value, next position)"""
+        tag = data[pos]
+        pos += 1
+        if tag == _STR:
+            length, pos = _read_varint(data, pos)
+            return data[pos:pos + length].decode('utf-8', 'surrogatepass'), pos + length
+        if tag == _STR_DICT:
+            index, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            keys = self.shapes[index]
+            if not keys:
+                return {}, pos + length
+            values = data[pos:pos + length].decode('utf-8', 'surrogatepass').split('\x00')
+            return dict(zip(keys, values)), pos + length
+        if tag == _DICT:
+            index, pos = _read_varint(data, pos)
+            result = {}
+            decode = self.decode
+            for key in self.shapes[index]:
+                # String values inline, everything else recursively
+                if data[pos] == _STR:
+                    length = data[pos + 1]
+                    if length < 0x80:
+                        pos += 2
+                    else:
+                        length, pos = _read_varint(data, pos + 1)
+                    result[key] = data[pos:pos + length].decode('utf-8', 'surrogatepass')
+                    pos += length
+                else:
+                    result[key], pos = decode(data, pos)
+            return result, pos
+        if tag == _STR_LIST:
+            count, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            return data[pos:pos + length].decode('utf-8', 'surrogatepass').split('\x00'), pos + length
+        if tag == _LIST or tag == _TUPLE or tag == _SET:
+            length, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(length):
+                item, pos = self.decode(data, pos)
+                items.append(item)
+            if tag == _TUPLE:
+                return tuple(items), pos
+            return (set(items) if tag == _SET else items), pos
+        if tag == _NONE:
+            return None, pos
+        if tag == _INT:
+            value, pos = _read_varint(data, pos)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1), pos
+        if tag == _FLOAT_TAG:
+            return _FLOAT.unpack_from(data, pos)[0], pos + 8
+        if tag == _TRUE or tag == _FALSE:
+            return tag == _TRUE, pos
+        if tag == _PAIRS:
+            length, pos = _read_varint(data, pos)
+            result = {}
+            for _ in range(length):
+                key, pos = self.decode(data, pos)
+                result[key], pos = self.decode(data, pos)
+            return result, pos
+        if tag == _BYTES:
+            length, pos = _read_varint(data, pos)
+            return bytes(data[pos:pos + length]), pos + length
+        if tag == _DATETIME or tag == _DATE:
+            length = data[pos]
+            text = data[pos + 1:pos + 1 + length].decode('ascii')
+            return (datetime.fromisoformat(text) if tag == _DATETIME else date.fromisoformat(text)), pos + 1 + length
+        if tag == _ENTRY:
+            old, pos = self.decode(data, pos)
+            new, pos = self.decode(data, pos)
+            delta, pos = self.decode(data, pos)
+            comparison, pos = self.decode(data, pos)
+            if data[pos] == _TRUE:
+                comparison['detailed_changes'] = _detailed_changes(comparison.get('changes', []))
+            return ComparisonEntry(old, new, delta, comparison), pos + 1
+        raise ValueError(f"Corrupt result snapshot (unknown value tag {tag})")
+
+
+def _detailed_changes(changes: List[Dict[str, Any]]) -> Dict[str, LazyFieldDiff]:
+    """Recreate the lazy per-field diffs of a content-modified entry"""
+    detailed = {}
+    for change in changes:
+        field = change.get('field', '')
+        if field:
+            detailed[field] = LazyFieldDiff(str(change.get('old_value', '') or ''),
+                                            str(change.get('new_value', '') or ''))
+    return detailed
+
+
+def _record_id(entry: Any) -> str:
+    """Requirement ID used to index a record"""
+    if isinstance(entry, Mapping):
+        req_id = entry.get('id')
+        return str(req_id) if req_id is not None else ''
+    return ''
+
+
+class SnapshotWriter:
+    """
+    Streaming writer for result snapshots
+
+    Records are encoded as they are added and written block by block, so
+    memory stays bounded by the block size plus one id and position per
+    record. add() has the ResultSink signature and can be passed directly as
+    the sink of StreamingComparator.compare_streams.
+    """
+
+    def __init__(self, target: Union[str, BinaryIO], block_size: int = DEFAULT_BLOCK_SIZE,
+                 compress_level: int = 3):
+        """
+        Args:
+            target: Output path or writable binary file object
+            block_size: Uncompressed bytes per compressed block
+            compress_level: zlib compression level
+        """
+        if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+            self._file = open(target, 'wb')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+
+        self.block_size = block_size
+        self.compress_level = compress_level
+
+        self._encoder = _Encoder()
+        self._records = bytearray()
+        self._offset = _HEADER.size
+        self._block_offsets: List[int] = []
+
+        self._ids: List[str] = []
+        # Block number and offset within the block's records, per record
+        self._record_blocks = array('I')
+        self._record_offsets = array('I')
+        self._membership: Dict[Tuple[int, int], List[int]] = {}
+        self._sections: Dict[str, Any] = {}
+        self._section_order: List[str] = []
+        self.closed = False
+
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.closed:
+            if exc_type is None:
+                self.close()
+            elif self._owns_file:
+                self._file.close()
+                self.closed = True
+
+    def __call__(self, category: str, entry: Any):
+        self.add(category, entry)
+
+    def add(self, category: str, entry: Any, section: str = ''):
+        """
+        Append one result record
+
+        Args:
+            category: Result category (added, deleted, content_modified, ...)
+            entry: Requirement dict or ComparisonEntry
+            section: Section name (e.g. the relative path of a compared file)
+        """
+        if section not in self._sections:
+            self.begin_section(section)
+
+        encoder = self._encoder
+        section_index = encoder.intern(section)
+        category_index = encoder.intern(category)
+
+        record_number = len(self._ids)
+        self._ids.append(_record_id(entry))
+        self._record_blocks.append(len(self._block_offsets))
+        self._record_offsets.append(len(self._records))
+        membership = self._membership.get((section_index, category_index))
+        if membership is None:
+            membership = self._membership[(section_index, category_index)] = []
+        membership.append(record_number)
+
+        records = self._records
+        _write_varint(records, section_index)
+        _write_varint(records, category_index)
+        encoder.encode(entry, records)
+
+        if len(records) >= self.block_size:
+            self._flush_block()
+
+    def begin_section(self, section: str, metadata: Optional[Mapping] = None):
+        """Declare a section (records keep their order within it) with optional metadata"""
+        if section not in self._sections:
+            self._section_order.append(section)
+        self._sections[section] = metadata if metadata is not None else self._sections.get(section)
+
+    def add_results(self, results: Mapping, section: str = '', metadata: Optional[Mapping] = None,
+                    categories: Iterable[str] = RESULT_CATEGORIES):
+        """
+        Write a compare_requirements result
+
+        Args:
+            results: Result dictionary with the category lists and statistics
+            section: Section name
+            metadata: Extra section metadata (defaults to every non-list entry
+                of results, e.g. statistics and file info)
+            categories: Categories whose entries are written (the statistics
+                still count all of them)
+        """
+        if metadata is None:
+            metadata = {key: value for key, value in results.items() if key not in RESULT_CATEGORIES}
+        self.begin_section(section, metadata)
+        for category in categories:
+            for entry in results.get(category) or []:
+                self.add(category, entry, section)
+
+    def _flush_block(self):
+        """Compress the pending records (with the table entries they introduced) into one block"""
+        if not self._records:
+            return
+        block = bytearray()
+        self._encoder.write_tables(block)
+        block += self._records
+        data = zlib.compress(bytes(block), self.compress_level)
+
+        prefix = bytearray()
+        _write_varint(prefix, len(data))
+        self._block_offsets.append(self._offset)
+        self._file.write(prefix)
+        self._file.write(data)
+        self._offset += len(prefix) + len(data)
+        self._records = bytearray()
+
+    def close(self, document: Any = None):
+        """
+        Write the remaining records, the trailer and the footer
+
+        Args:
+            document: Extra value stored in the trailer (e.g. folder statistics)
+        """
+        if self.closed:
+            return
+        self._flush_block()
+        self._file.write(b'\x00')
+        self._offset += 1
+
+        encoder = self._encoder
+        membership = []
+        for (section_index, category_index), numbers in self._membership.items():
+            deltas = bytearray()
+            previous = 0
+            for number in numbers:
+                _write_varint(deltas, number - previous)
+                previous = number
+            membership.append([section_index, category_index, bytes(deltas)])
+
+        block_offsets = [offset - previous for offset, previous in
+                         zip(self._block_offsets, [0] + self._block_offsets[:-1])]
+
+        trailer = {
+            'created': datetime.now().isoformat(),
+            'document': document,
+            'sections': [[name, self._sections[name]] for name in self._section_order],
+            'blocks': _pack_varints(block_offsets),
+            'ids': self._ids,
+            'record_blocks': _array_bytes(self._record_blocks),
+            'record_offsets': _array_bytes(self._record_offsets),
+            'membership': membership
+        }
+        body = bytearray()
+        encoder.encode(trailer, body)
+        tables = bytearray()
+        encoder.write_tables(tables, everything=True)
+        data = zlib.compress(bytes(tables + body), self.compress_level)
+
+        self._file.write(data)
+        self._file.write(_FOOTER.pack(self._offset, len(data), FOOTER_MAGIC))
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+        self.closed = True
+
+
+class SnapshotReader:
+    """
+    Random-access reader for result snapshots
+
+    Opening a snapshot reads only the footer and trailer; records are decoded
+    on demand, one block at a time.
+    """
+
+    def __init__(self, source: Union[str, BinaryIO]):
+        """
+        Args:
+            source: Snapshot path or seekable binary file object
+        """
+        if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+            self._file = open(source, 'rb')
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+
+        try:
+            self.version = _check_header(self._file.read(_HEADER.size))
+            self._file.seek(-_FOOTER.size, io.SEEK_END)
+            trailer_offset, trailer_length, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+            if magic != FOOTER_MAGIC:
+                raise ValueError("Result snapshot is incomplete (missing footer)")
+            self._file.seek(trailer_offset)
+            data = zlib.decompress(self._file.read(trailer_length))
+        except Exception:
+            self.close()
+            raise
+
+        self._decoder = _Decoder()
+        pos = self._decoder.read_tables(data, 0)
+        trailer, _ = self._decoder.decode(data, pos)
+
+        self.created = trailer.get('created')
+        self.document = trailer.get('document')
+        self._section_metadata = {name: metadata for name, metadata in trailer['sections']}
+        self.sections = [name for name, _ in trailer['sections']]
+        self._ids = trailer['ids']
+
+        self._block_offsets = list(accumulate(_unpack_varints(trailer['blocks'])))
+        self._record_blocks = _bytes_array(trailer['record_blocks'])
+        self._record_offsets = _bytes_array(trailer['record_offsets'])
+
+        strings = self._decoder.strings
+        self._membership: Dict[str, Dict[str, List[int]]] = {}
+        for section_index, category_index, deltas in trailer['membership']:
+            numbers = list(accumulate(_unpack_varints(deltas)))
+            self._membership.setdefault(strings[section_index], {})[strings[category_index]] = numbers
+
+        self._id_index: Optional[Dict[Tuple[str, str], int]] = None
+        self._record_sections: Optional[Dict[int, Tuple[str, str]]] = None
+        self._block_cache: Tuple[int, bytes, int] = (-1, b'', 0)
+
+    def __enter__(self) -> 'SnapshotReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self):
+        """Close the underlying file if this reader opened it"""
+        if self._owns_file and not self._file.closed:
+            self._file.close()
+
+    def section_metadata(self, section: str = '') -> Any:
+        """Metadata stored with a section (statistics, file info, ...)"""
+        return self._section_metadata.get(section)
+
+    def category_counts(self, section: str = '') -> Dict[str, int]:
+        """Number of records per category in a section"""
+        return {category: len(numbers) for category, numbers in self._membership.get(section, {}).items()}
+
+    def ids(self, section: str = '', category: Optional[str] = None) -> List[str]:
+        """Requirement IDs of a section, optionally limited to one category"""
+        categories = self._membership.get(section, {})
+        if category is not None:
+            return [self._ids[number] for number in categories.get(category, [])]
+        numbers = sorted(number for members in categories.values() for number in members)
+        return [self._ids[number] for number in numbers]
+
+    def get(self, req_id: str, section: str = '') -> Optional[Tuple[str, Any]]:
+        """
+        Look up one record by requirement ID
+
+        Args:
+            req_id: Requirement ID (the current ID for moved requirements)
+            section: Section name
+
+        Returns:
+            Tuple of (category, entry), or None if the ID is not in the section
+        """
+        if self._id_index is None:
+            self._build_id_index()
+        number = self._id_index.get((section, req_id))
+        if number is None:
+            return None
+        _, category, entry = self._read_record(number)
+        return category, entry
+
+    def iter_section(self, section: str = '', category: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield (category, entry) for the records of a section in written order"""
+        categories = self._membership.get(section, {})
+        if category is not None:
+            numbers = categories.get(category, [])
+        else:
+            numbers = sorted(number for members in categories.values() for number in members)
+        for number in numbers:
+            _, record_category, entry = self._read_record(number)
+            yield record_category, entry
+
+    def load_results(self, section: str = '') -> Dict[str, Any]:
+        """
+        Rebuild a compare_requirements result dictionary from a section
+
+        Returns:
+            Dictionary with the category lists plus the section metadata
+            (statistics, file info, ...)
+        """
+        results = {category: [] for category in RESULT_CATEGORIES}
+        for category, entry in self.iter_section(section):
+            results.setdefault(category, []).append(entry)
+        metadata = self._section_metadata.get(section)
+        if isinstance(metadata, dict):
+            results.update(metadata)
+        return results
+
+    def _build_id_index(self):
+        """(section, requirement ID) -> record number"""
+        index = {}
+        for section, categories in self._membership.items():
+            for numbers in categories.values():
+                for number in numbers:
+                    index[(section, self._ids[number])] = number
+        self._id_index = index
+
+    def _read_record(self, number: int) -> Tuple[str, str, Any]:
+        """Decode record number from its (cached) block"""
+        data, records_start = self._load_block(self._record_blocks[number])
+        offset = self._record_offsets[number]
+        decoder = self._decoder
+        pos = records_start + offset
+        section_index, pos = _read_varint(data, pos)
+        category_index, pos = _read_varint(data, pos)
+        entry, _ = decoder.decode(data, pos)
+        return decoder.strings[section_index], decoder.strings[category_index], entry
+
+    def _load_block(self, block: int) -> Tuple[bytes, int]:
+        """Decompressed block and the position where its records start"""
+        cached_block, data, records_start = self._block_cache
+        if cached_block == block:
+            return data, records_start
+
+        self._file.seek(self._block_offsets[block])
+        length = _read_stream_varint(self._file)
+        data = zlib.decompress(self._file.read(length))
+
+        # The trailer already holds the complete tables; skip the block's own entries
+        pos = _skip_tables(data)
+        self._block_cache = (block, data, pos)
+        return data, pos
+
+
+def _check_header(data: bytes) -> int:
+    """Validate the header; returns the format version"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a result snapshot (file too short)")
+    magic, version, _ = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a result snapshot")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Result snapshot version {version} is newer than supported ({FORMAT_VERSION})")
+    return version
+
+
+def _skip_tables(data: bytes) -> int:
+    """Position after the string and shape entries at the start of a block"""
+    count, pos = _read_varint(data, 0)
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        pos += length
+    count, pos = _read_varint(data, pos)
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        for _ in range(length):
+            _, pos = _read_varint(data, pos)
+    return pos
+
+
+def iter_snapshot(source: Union[str, BinaryIO]) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Stream all records front to back without the trailer
+
+    Works on non-seekable streams (pipes, sockets); section metadata and the
+    document are only available through SnapshotReader.
+
+    Args:
+        source: Snapshot path or readable binary file object
+
+    Yields:
+        (section, category, entry) in written order
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        with open(source, 'rb') as stream:
+            yield from iter_snapshot(stream)
+        return
+
+    _check_header(source.read(_HEADER.size))
+    decoder = _Decoder()
+    while True:
+        length = _read_stream_varint(source)
+        if not length:
+            return
+        data = zlib.decompress(source.read(length))
+        pos = decoder.read_tables(data, 0)
+        strings = decoder.strings
+        while pos < len(data):
+            section_index, pos = _read_varint(data, pos)
+            category_index, pos = _read_varint(data, pos)
+            entry, pos = decoder.decode(data, pos)
+            yield strings[section_index], strings[category_index], entry
+
+
+def save_results(path: str, results: Mapping, metadata: Optional[Mapping] = None):
+    """
+    Save a file comparison result (compare_requirements output)
+
+    Args:
+        path: Output snapshot path
+        results: Comparison result dictionary
+        metadata: Extra information stored in the document (file paths, export time)
+    """
+    with SnapshotWriter(path) as writer:
+        writer.add_results(results)
+        writer.close({'kind': 'file', 'metadata': dict(metadata or {})})
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """
+    Load a file comparison result saved with save_results
+
+    Returns:
+        Result dictionary as returned by compare_requirements, plus
+        'snapshot_metadata'
+    """
+    with SnapshotReader(path) as reader:
+        results = reader.load_results()
+        document = reader.document if isinstance(reader.document, dict) else {}
+        results['snapshot_metadata'] = document.get('metadata', {})
+        return results
+
+
+def save_folder_results(path: str, folder_results: Mapping, metadata: Optional[Mapping] = None):
+    """
+    Save a folder comparison result (FolderComparator.compare_folders output)
+
+    Every matched file pair becomes one section named after its relative path
+    in the original folder; folder-level statistics go into the document.
+    Results of a pipelined comparison carry no requirement lists; their
+    sections are copied from the comparison's detail snapshot instead.
+    When path is that detail snapshot it already is the folder snapshot and
+    is left as written; its metadata must then have been passed to
+    compare_folders as detail_metadata.
+
+    Args:
+        path: Output snapshot path
+        folder_results: Folder comparison result dictionary
+        metadata: Extra information stored in the document
+
+    Raises:
+        ValueError: path is the detail snapshot and does not hold metadata
+    """
+    file_results = folder_results.get('file_results') or {}
+    document = folder_document(folder_results, metadata)
+
+    detail_path = folder_results.get('detail_path')
+    if detail_path and os.path.exists(detail_path):
+        if os.path.abspath(detail_path) == os.path.abspath(path):
+            with SnapshotReader(path) as reader:
+                stored = reader.document.get('metadata') if isinstance(reader.document, dict) else None
+            if document['metadata'] and stored != document['metadata']:
+                raise ValueError(f"{path} is the detail snapshot of this comparison; pass the metadata "
+                                 f"to compare_folders as detail_metadata")
+            return
+        details = SnapshotReader(detail_path)
+    else:
+        details = None
+
+    with SnapshotWriter(path) as writer:
+        sections = []
+        for file_result in file_results.get('matched_files') or []:
+            if not file_result:
+                continue
+            if details is not None and file_result.get('detail_section') in details.sections:
+                file_result = details.load_results(file_result['detail_section'])
+            section = (file_result.get('file1_info') or {}).get('relative_path') or f'#{len(sections)}'
+            if section in sections:
+                section = f'{section}#{len(sections)}'
+            writer.add_results(file_result, section)
+            sections.append(section)
+        document['matched_sections'] = sections
+        writer.close(document)
+    if details is not None:
+        details.close()
+
+
+def folder_document(folder_results: Mapping, metadata: Optional[Mapping] = None) -> Dict[str, Any]:
+    """
+    Trailer document of a folder snapshot: the folder result without its matched file results
+
+    The caller adds 'matched_sections' (section names in matched file order)
+    before closing the writer with it.
+    """
+    file_results = folder_results.get('file_results') or {}
+    document = {key: value for key, value in folder_results.items() if key != 'file_results'}
+    document['file_results'] = {key: value for key, value in file_results.items() if key != 'matched_files'}
+    document['kind'] = 'folder'
+    document['metadata'] = dict(metadata or {})
+    return document
+
+
+def load_folder_results(path: str) -> Dict[str, Any]:
+    """
+    Load a folder comparison result saved with save_folder_results
+
+    Returns:
+        Folder result dictionary as returned by compare_folders, plus
+        'snapshot_metadata'; 'detail_path' points at the snapshot itself
+    """
+    with SnapshotReader(path) as reader:
+        document = dict(reader.document) if isinstance(reader.document, dict) else {}
+        if document.get('kind') != 'folder':
+            raise ValueError("Snapshot does not contain folder comparison results")
+
+        sections = document.pop('matched_sections', reader.sections)
+        file_results = dict(document.get('file_results') or {})
+        file_results['matched_files'] = [reader.load_results(section) for section in sections]
+
+        document.pop('kind', None)
+        document['snapshot_metadata'] = document.pop('metadata', {})
+        document['file_results'] = file_results
+        # Per-file drill-down (FolderComparator.load_file_details) reads this snapshot
+        document['detail_path'] = path
+        return document
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Result Snapshot - compact binary comparison results")
+
+    # results = ReqIFComparator().compare_requirements(old_reqs, new_reqs)
+    # save_results("comparison.rqsnap", results, {'file1': "old.reqif", 'file2': "new.reqif"})
+    # with SnapshotReader("comparison.rqsnap") as reader:
+    #     print(reader.category_counts())
+    #     print(reader.get("REQ-123"))
+    # results = load_results("comparison.rqsnap")
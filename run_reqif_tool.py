@@ -4,10 +4,19 @@ ReqIF Tool Suite - Native Launcher
 Fixed: Removed startup dialog, launches directly
 """
 
-import tkinter as tk
-from tkinter import messagebox
 import sys
 import os
+import json
+import argparse
+import contextlib
+
+try:
+    import tkinter as tk
+    from tkinter import messagebox
+except ImportError:
+    # Headless environments (CI) can still use the --compare options
+    tk = None
+    messagebox = None
 
 
 def check_dependencies():
@@ -84,8 +93,152 @@ def run_validation():
     return True
 
 
+def print_statistics(label: str, stats: dict, histogram_limit: int = 10):
+    """Print one statistics block with its field-change histogram"""
+    print(f"{label}:")
+    for key in ('added', 'deleted', 'moved', 'content_modified', 'structural_only', 'unchanged'):
+        print(f"  {key:<18} {stats.get(f'{key}_count', 0)}")
+    print(f"  {'content change':<18} {stats.get('content_change_percentage', 0.0)}%")
+    print(f"  {'total change':<18} {stats.get('total_change_percentage', 0.0)}%")
+    
+    histogram = stats.get('field_change_histogram', {})
+    if histogram:
+        print("  Most changed fields:")
+        for field, count in list(histogram.items())[:histogram_limit]:
+            print(f"    {count:>8}  {field}")
+
+
+def _run_comparison(args) -> tuple:
+    """Run the requested file or folder comparison; returns (results, stats, change %, JSON output)"""
+    rules = None
+    if args.rules:
+        from comparison_rules import ComparisonRules
+        rules = ComparisonRules.from_json_file(args.rules)
+    
+    if args.compare:
+        from reqif_parser import ReqIFParser
+        from reqif_comparator import ReqIFComparator
+        
+        file1_reqs = ReqIFParser().parse_file(args.compare[0])
+        file2_reqs = ReqIFParser().parse_file(args.compare[1])
+        comparator = ReqIFComparator()
+        comparator.set_rules(rules)
+        if args.stats_only:
+            results = comparator.compare_requirements(file1_reqs, file2_reqs, stats_only=True)
+        else:
+            # Pairs above the partition threshold are compared in worker processes
+            from partitioned_comparator import PartitionedComparator
+            partitioned = PartitionedComparator(processes=args.processes, comparator=comparator)
+            results = partitioned.compare_requirements(file1_reqs, file2_reqs)
+        stats = results['statistics']
+        change_percentage = stats.get('total_change_percentage', 0.0)
+        output = stats
+    else:
+        from folder_comparator import FolderComparator
+        
+        folder_comparator = FolderComparator(content_matching=args.match_content)
+        folder_comparator.set_comparison_rules(rules)
+        # Per-file details stream straight into the --snapshot file (bounded memory),
+        # which then is the folder snapshot, metadata included
+        results = folder_comparator.compare_folders(args.compare_folders[0], args.compare_folders[1],
+                                                    stats_only=args.stats_only, detail_path=args.snapshot,
+                                                    detail_metadata=_folder_metadata(args) if args.snapshot else None)
+        stats = results['aggregated_statistics']
+        change_percentage = stats.get('overall_change_percentage', 0.0)
+        output = {
+            'folder_statistics': results['folder_statistics'],
+            'aggregated_statistics': stats,
+            'files': {path: info.get('comparison_stats', {})
+                      for path, info in results['individual_file_statistics'].get('matched_files', {}).items()}
+        }
+    return results, stats, change_percentage, output
+
+
+def _save_snapshot(args, results: dict):
+    """Write file or folder results to the --snapshot path"""
+    from result_snapshot import save_results, save_folder_results
+    
+    if args.compare:
+        save_results(args.snapshot, results, {'file1': args.compare[0], 'file2': args.compare[1]})
+    else:
+        save_folder_results(args.snapshot, results, _folder_metadata(args))
+    print(f"Results saved to {args.snapshot}")
+
+
+def _folder_metadata(args) -> dict:
+    """Snapshot metadata of a --compare-folders run"""
+    return {'original_folder': args.compare_folders[0], 'modified_folder': args.compare_folders[1]}
+
+
+def run_headless(argv: list) -> int:
+    """
+    Compare files or folders without the GUI (for CI gating)
+    
+    Returns:
+        Process exit code: 0 ok, 1 change percentage above --fail-above, 2 error
+    """
+    parser = argparse.ArgumentParser(prog="run_reqif_tool.py", description="Headless ReqIF comparison")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--compare', nargs=2, metavar=('FILE1', 'FILE2'), help="Compare two ReqIF files")
+    group.add_argument('--compare-folders', nargs=2, metavar=('FOLDER1', 'FOLDER2'), help="Compare two folders")
+    parser.add_argument('--stats-only', action='store_true', help="Counts and histograms only (fast, low memory)")
+    parser.add_argument('--json', action='store_true', help="Print statistics as JSON")
+    parser.add_argument('--match-content', action='store_true',
+                        help="With --compare-folders: pair renamed/moved files by requirement-ID overlap")
+    parser.add_argument('--rules', metavar='RULES_JSON',
+                        help="Comparison rules (ignored attributes, normalisers); see comparison_rules.py")
+    parser.add_argument('--processes', type=int, metavar='N',
+                        help="With --compare: worker processes for pairs above the partition threshold "
+                             "(default from the threading config; 1 compares in-process)")
+    parser.add_argument('--snapshot', metavar='FILE',
+                        help="Save the full results as a result snapshot (.rqsnap) that the GUIs can load")
+    parser.add_argument('--fail-above', type=float, metavar='PERCENT',
+                        help="Exit with code 1 when the total change percentage exceeds PERCENT")
+    args = parser.parse_args(argv)
+    
+    # Progress chatter goes to stderr so stdout stays machine-readable
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            results, stats, change_percentage, output = _run_comparison(args)
+            if args.snapshot:
+                _save_snapshot(args, results)
+    except Exception as e:
+        print(f"❌ Comparison failed: {e}", file=sys.stderr)
+        return 2
+    
+    if args.json:
+        print(json.dumps(output, indent=2, default=str))
+    elif args.compare:
+        print_statistics("Comparison statistics", stats)
+    else:
+        folder_stats = results['folder_statistics']
+        print(f"Files: {folder_stats.get('total_matched_files', 0)} matched, "
+              f"{folder_stats.get('files_added', 0)} added, {folder_stats.get('files_deleted', 0)} deleted")
+        print_statistics("Aggregated statistics", {
+            'added_count': stats.get('total_requirements_added', 0),
+            'deleted_count': stats.get('total_requirements_deleted', 0),
+            'moved_count': stats.get('total_requirements_moved', 0),
+            'content_modified_count': stats.get('total_requirements_content_modified', 0),
+            'structural_only_count': stats.get('total_requirements_structural_only', 0),
+            'unchanged_count': stats.get('total_requirements_unchanged', 0),
+            'content_change_percentage': stats.get('content_change_percentage', 0.0),
+            'total_change_percentage': change_percentage,
+            'field_change_histogram': dict(sorted(stats.get('field_change_histogram', {}).items(),
+                                                  key=lambda item: (-item[1], item[0])))
+        })
+    
+    if args.fail_above is not None and change_percentage > args.fail_above:
+        print(f"❌ Total change {change_percentage}% exceeds {args.fail_above}%", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
     """Main launcher function - directly starts application"""
+    # Headless comparison for CI; never touches tkinter
+    if '--compare' in sys.argv or '--compare-folders' in sys.argv:
+        sys.exit(run_headless(sys.argv[1:]))
+    
     print("ReqIF Tool Suite - Starting...")
     
     # Handle command line arguments
@@ -101,6 +254,15 @@ def main():
             print("Options:")
             print("  --validate           Run validation first")
             print("  --help, -h           Show this help")
+            print("  --compare F1 F2      Compare two files without the GUI")
+            print("  --compare-folders D1 D2  Compare two folders without the GUI")
+            print("  --stats-only         With --compare*: counts and field histogram only")
+            print("  --json               With --compare*: print statistics as JSON")
+            print("  --match-content      With --compare-folders: pair renamed/moved files by requirement IDs")
+            print("  --rules FILE.json    With --compare*: ignore/normalisation rules")
+            print("  --snapshot FILE      With --compare*: save full results as a .rqsnap snapshot")
+            print("  --processes N        With --compare: worker processes for very large files")
+            print("  --fail-above PERCENT With --compare*: exit 1 above this total change")
             return
     
     # Import and run the main application directly
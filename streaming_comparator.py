@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Streaming Comparator Module
+Out-of-core comparison of two requirement streams: each side is sorted by ID
+with an external merge sort that spills sorted runs to temporary files, then
+the two sorted streams are merge-joined and categorised results are handed to
+a sink as they are produced.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Tuple
+from collections.abc import Mapping
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+
+from reqif_comparator import ReqIFComparator
+from reqif_parser import ReqIFParser
+
+
+# Rough fixed cost of one requirement dict with its nested dicts (bytes)
+REQUIREMENT_OVERHEAD = 1200
+
+ResultSink = Callable[[str, Mapping], None]
+
+
+def estimate_requirement_size(req: Dict[str, Any]) -> int:
+    """Cheap estimate of the memory a parsed requirement occupies (the shared '_datatypes' table is not its own)"""
+    size = REQUIREMENT_OVERHEAD
+    for key in ('attributes', 'raw_attributes'):
+        values = req.get(key)
+        if isinstance(values, dict):
+            for name, value in values.items():
+                # Keys and values are str; count both plus per-object overhead
+                size += len(name) + len(str(value)) + 100
+    return size
+
+
+class ExternalSorter:
+    """
+    Sort requirements by ID within a memory budget
+
+    Requirements are buffered until the estimated buffer size exceeds the
+    budget; the buffer is then sorted and written to a temporary run file as
+    a sequence of pickled (id, requirement) records. Runs are merged lazily
+    with heapq.merge, so the merge phase holds one record per run. Inputs
+    that fit the budget are sorted in memory without touching the disk.
+
+    The '_datatypes' table a parser shares between all requirements of a
+    file is kept in memory once instead of being pickled with every record;
+    records read back from a run refer to the same table again.
+    """
+
+    def __init__(self, memory_budget_bytes: int, temp_dir: Optional[str] = None):
+        self.memory_budget_bytes = max(int(memory_budget_bytes), 1)
+        self.temp_dir = temp_dir
+
+        self.stats = {'records': 0, 'skipped': 0, 'runs': 0, 'spilled_bytes': 0}
+        self._run_dir = None
+        self._run_paths = []
+        self._in_memory = []
+        # Shared '_datatypes' tables of spilled records and their id() -> index
+        self._datatype_tables = []
+        self._datatype_indexes = {}
+
+    def sort(self, requirements: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Consume all requirements and return an iterator of (id, requirement) in ID order
+
+        The input is fully consumed (and runs written) before this returns, so
+        two sorters can be filled one after the other without overlapping
+        their buffers. Equal IDs keep their input order.
+
+        Args:
+            requirements: Any iterable of requirement dictionaries
+
+        Returns:
+            Iterator over (id, requirement) tuples sorted by ID
+        """
+        buffer = []
+        buffered_bytes = 0
+
+        for req in requirements:
+            if not isinstance(req, dict) or not req.get('id'):
+                self.stats['skipped'] += 1
+                continue
+
+            self.stats['records'] += 1
+            buffer.append((str(req['id']), req))
+            buffered_bytes += estimate_requirement_size(req)
+
+            if buffered_bytes >= self.memory_budget_bytes:
+                self._spill(buffer)
+                buffer = []
+                buffered_bytes = 0
+
+        buffer.sort(key=_record_key)
+        if not self._run_paths:
+            self._in_memory = buffer
+            return iter(self._in_memory)
+
+        if buffer:
+            self._spill(buffer)
+        return self._merge_runs()
+
+    def _spill(self, buffer: List[Tuple[str, Dict[str, Any]]]):
+        """Write one sorted run to a temporary file"""
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix='reqif_sort_', dir=self.temp_dir)
+
+        buffer.sort(key=_record_key)
+        path = os.path.join(self._run_dir, f"run_{len(self._run_paths):05d}.pkl")
+        with open(path, 'wb') as f:
+            # One pickle per record so neither side's memo grows with the run
+            for req_id, req in buffer:
+                datatypes = req.pop('_datatypes', None)
+                table_index = -1 if datatypes is None else self._datatype_index(datatypes)
+                try:
+                    pickle.dump((req_id, req, table_index), f, protocol=pickle.HIGHEST_PROTOCOL)
+                finally:
+                    if datatypes is not None:
+                        req['_datatypes'] = datatypes
+
+        self._run_paths.append(path)
+        self.stats['runs'] += 1
+        self.stats['spilled_bytes'] += os.path.getsize(path)
+
+    def _datatype_index(self, datatypes: Dict[str, str]) -> int:
+        """Index of a shared '_datatypes' table, registering it on first use"""
+        table_index = self._datatype_indexes.get(id(datatypes))
+        if table_index is None:
+            table_index = self._datatype_indexes[id(datatypes)] = len(self._datatype_tables)
+            self._datatype_tables.append(datatypes)
+        return table_index
+
+    def _merge_runs(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Lazily merge all run files, removing them when exhausted"""
+        try:
+            yield from heapq.merge(*[_read_run(path, self._datatype_tables) for path in self._run_paths],
+                                   key=_record_key)
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Remove temporary run files"""
+        if self._run_dir is not None:
+            shutil.rmtree(self._run_dir, ignore_errors=True)
+            self._run_dir = None
+        self._run_paths = []
+        self._in_memory = []
+        self._datatype_tables = []
+        self._datatype_indexes = {}
+
+
+def _record_key(record: Tuple[str, Dict[str, Any]]) -> str:
+    """Sort key of an (id, requirement) record"""
+    return record[0]
+
+
+def _read_run(path: str, datatype_tables: List[Dict[str, str]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield the records of one run file in order, reattaching their shared '_datatypes' table"""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                req_id, req, table_index = pickle.load(f)
+            except EOFError:
+                return
+            if table_index >= 0:
+                req['_datatypes'] = datatype_tables[table_index]
+            yield req_id, req
+
+
+def _last_per_id(records: Iterator[Tuple[str, Dict[str, Any]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Collapse duplicate IDs, keeping the last occurrence like the in-memory comparator"""
+    pending = None
+    for record in records:
+        if pending is not None and pending[0] != record[0]:
+            yield pending
+        pending = record
+    if pending is not None:
+        yield pending
+
+
+class StreamingComparator:
+    """
+    Compare two requirement streams that do not fit in memory
+
+    Both streams are sorted by ID (ExternalSorter), then merge-joined: an ID
+    only on the left is deleted, only on the right is added, on both sides it
+    is classified by ReqIFComparator.classify_common_requirement. Every result
+    is passed to the sink as (category, entry) immediately and then dropped,
+    so peak memory is the sort budget plus whatever the sink keeps.
+
+    Moved detection needs all added and deleted requirements at once and is
+    therefore not performed; moved_count is always 0.
+    """
+
+    CATEGORIES = ('added', 'deleted', 'content_modified', 'structural_only', 'unchanged')
+
+    def __init__(self, comparator: Optional[ReqIFComparator] = None,
+                 memory_budget_mb: int = 512, temp_dir: Optional[str] = None):
+        self.comparator = comparator or ReqIFComparator()
+        self.memory_budget_mb = memory_budget_mb
+        self.temp_dir = temp_dir
+
+        self.last_run_stats = {}
+
+    def compare_streams(self, file1_reqs: Iterable[Dict[str, Any]], file2_reqs: Iterable[Dict[str, Any]],
+                        sink: Optional[ResultSink] = None) -> Dict[str, Any]:
+        """
+        Compare two requirement iterables, emitting results incrementally
+
+        Args:
+            file1_reqs: Requirements from the first file (original), any order
+            file2_reqs: Requirements from the second file (modified), any order
+            sink: Called as sink(category, entry) for every result; when None,
+                results are collected and returned like compare_requirements
+
+        Returns:
+            Dictionary with 'statistics' (and the result lists when no sink was given)
+        """
+        collected = None
+        if sink is None:
+            collected = {category: [] for category in self.CATEGORIES}
+            sink = lambda category, entry: collected[category].append(entry)
+
+        # Each side gets half the budget; the sorters fill one after the other
+        budget = self.memory_budget_mb * 1024 * 1024 // 2
+        sorter1 = ExternalSorter(budget, self.temp_dir)
+        sorter2 = ExternalSorter(budget, self.temp_dir)
+
+        try:
+            left = _last_per_id(sorter1.sort(file1_reqs))
+            right = _last_per_id(sorter2.sort(file2_reqs))
+            counts, added_fields, removed_fields, field_changes = self._merge_join(left, right, sink)
+        finally:
+            sorter1.cleanup()
+            sorter2.cleanup()
+
+        stats = self.comparator._build_statistics_from_counts(
+            sorter1.stats['records'] + sorter1.stats['skipped'],
+            sorter2.stats['records'] + sorter2.stats['skipped'],
+            counts, added_fields, removed_fields, field_changes)
+
+        self.last_run_stats = {
+            'memory_budget_mb': self.memory_budget_mb,
+            'file1_runs': sorter1.stats['runs'],
+            'file2_runs': sorter2.stats['runs'],
+            'spilled_bytes': sorter1.stats['spilled_bytes'] + sorter2.stats['spilled_bytes']
+        }
+
+        print(f"Streaming comparison: Added={counts['added']}, Deleted={counts['deleted']}, "
+              f"Content Modified={counts['content_modified']}, Structural Only={counts['structural_only']}, "
+              f"Unchanged={counts['unchanged']} ({self.last_run_stats['file1_runs']}+"
+              f"{self.last_run_stats['file2_runs']} spilled runs)")
+
+        result = {'statistics': stats}
+        if collected is not None:
+            result.update(collected)
+            result['moved'] = []
+        return result
+
+    def compare_files(self, file1_path: str, file2_path: str,
+                      sink: Optional[ResultSink] = None) -> Dict[str, Any]:
+        """
+        Stream-parse and compare two ReqIF files
+
+        Args:
+            file1_path: Path to the first ReqIF file (original)
+            file2_path: Path to the second ReqIF file (modified)
+            sink: Result callback, see compare_streams
+
+        Returns:
+            Same as compare_streams
+        """
+        return self.compare_streams(ReqIFParser().iter_requirements(file1_path),
+                                    ReqIFParser().iter_requirements(file2_path), sink)
+
+    def _merge_join(self, left: Iterator[Tuple[str, Dict[str, Any]]], right: Iterator[Tuple[str, Dict[str, Any]]],
+                    sink: ResultSink) -> Tuple[Dict[str, int], set, set, Dict[str, int]]:
+        """Walk both ID-sorted streams in lockstep and classify every ID"""
+        counts = {category: 0 for category in self.CATEGORIES}
+        added_fields, removed_fields = set(), set()
+        field_changes = {}
+
+        def emit(category, entry):
+            counts[category] += 1
+            sink(category, entry)
+
+        left_record = next(left, None)
+        right_record = next(right, None)
+
+        while left_record is not None or right_record is not None:
+            if right_record is None or (left_record is not None and left_record[0] < right_record[0]):
+                emit('deleted', left_record[1])
+                left_record = next(left, None)
+            elif left_record is None or right_record[0] < left_record[0]:
+                emit('added', right_record[1])
+                right_record = next(right, None)
+            else:
+                req_id, req1 = left_record
+                req2 = right_record[1]
+                try:
+                    category, entry, comparison_result = self.comparator.classify_common_requirement(req_id, req1, req2)
+                    if comparison_result:
+                        added_fields.update(comparison_result['added_fields'])
+                        removed_fields.update(comparison_result['removed_fields'])
+                        self.comparator._count_field_changes(field_changes, comparison_result)
+                except Exception as e:
+                    print(f"Error processing common requirement {req_id}: {e}")
+                    category, entry = 'unchanged', req2
+                emit(category, entry)
+                left_record = next(left, None)
+                right_record = next(right, None)
+
+        return counts, added_fields, removed_fields, field_changes
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Streaming Comparator - out-of-core comparison of large ReqIF baselines")
+
+    # comparator = StreamingComparator(memory_budget_mb=1024)
+    # stats = comparator.compare_files("baseline_a.reqif", "baseline_b.reqif",
+    #                                  sink=lambda category, entry: None)['statistics']
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Text Diff Module
+Word-level diff for long requirement texts: Myers' O(ND) algorithm on word
+tokens, with unique-token (patience) anchors to split long texts into small
+independent segments, and edit-cost / time cutoffs that degrade to a plain
+replacement of the unresolved segment instead of running away.
+"""
+
+from typing import List, Tuple, Optional
+import re
+import time
+
+
+# Words, runs of whitespace and single punctuation characters; joining the
+# tokens reproduces the text exactly
+_TOKEN_PATTERN = re.compile(r'\w+|\s+|[^\w\s]')
+
+# Largest edit distance (in tokens) Myers may explore for one segment
+DEFAULT_MAX_COST = 2000
+
+# Wall-clock budget for one diff (seconds)
+DEFAULT_TIMEOUT = 0.5
+
+# Above this many tokens per side the diff is computed on lines instead
+DEFAULT_MAX_TOKENS = 200000
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word, whitespace and punctuation tokens"""
+    return _TOKEN_PATTERN.findall(text) if text else []
+
+
+class _DiffState:
+    """Limits and bookkeeping shared by one diff computation"""
+
+    __slots__ = ('max_cost', 'deadline', 'complete', 'ops')
+
+    def __init__(self, max_cost: int, timeout: Optional[float]):
+        self.max_cost = max_cost
+        self.deadline = time.perf_counter() + timeout if timeout else None
+        self.complete = True
+        self.ops: List[Opcode] = []
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+
+def diff_tokens(a: List, b: List, max_cost: int = DEFAULT_MAX_COST,
+                timeout: Optional[float] = DEFAULT_TIMEOUT) -> Tuple[List[Opcode], bool]:
+    """
+    Diff two token sequences
+
+    Args:
+        a: Original tokens (any hashable values)
+        b: Modified tokens
+        max_cost: Maximum edit distance explored per segment
+        timeout: Seconds before remaining segments are reported as replacements
+
+    Returns:
+        Tuple of (opcodes, complete). Opcodes use SequenceMatcher's format
+        (tag, i1, i2, j1, j2) with tags equal/delete/insert/replace; complete
+        is False when a cutoff replaced a segment wholesale.
+    """
+    # Compare small ints instead of strings
+    ids = {}
+    a_ids = [ids.setdefault(token, len(ids)) for token in a]
+    b_ids = [ids.setdefault(token, len(ids)) for token in b]
+
+    state = _DiffState(max_cost, timeout)
+    _diff_range(a_ids, b_ids, 0, len(a_ids), 0, len(b_ids), state)
+    return _merge_opcodes(state.ops), state.complete
+
+
+def word_diff(text1: str, text2: str, max_cost: int = DEFAULT_MAX_COST,
+              timeout: Optional[float] = DEFAULT_TIMEOUT,
+              max_tokens: int = DEFAULT_MAX_TOKENS) -> List[Tuple[str, str]]:
+    """
+    Word-level diff of two texts as (operation, text) segments
+
+    Args:
+        text1: Original text
+        text2: Modified text
+        max_cost: Maximum edit distance explored per segment
+        timeout: Seconds before remaining segments are reported as replacements
+        max_tokens: Beyond this many tokens per side, diff whole lines instead
+
+    Returns:
+        List of ('equal' | 'delete' | 'insert', text) in reading order; joining
+        equal+delete gives text1, equal+insert gives text2
+    """
+    text1 = text1 or ''
+    text2 = text2 or ''
+
+    a = tokenize(text1)
+    b = tokenize(text2)
+    if len(a) > max_tokens or len(b) > max_tokens:
+        a = text1.splitlines(keepends=True)
+        b = text2.splitlines(keepends=True)
+
+    opcodes, _ = diff_tokens(a, b, max_cost, timeout)
+
+    segments = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            segments.append(('equal', ''.join(a[i1:i2])))
+        else:
+            if i2 > i1:
+                segments.append(('delete', ''.join(a[i1:i2])))
+            if j2 > j1:
+                segments.append(('insert', ''.join(b[j1:j2])))
+    return segments
+
+
+def word_diff_lines(text1: str, text2: str, **limits) -> List[str]:
+    """
+    Word diff rendered as text lines with [-deleted-] and {+inserted+} markers
+
+    Args:
+        text1: Original text
+        text2: Modified text
+        **limits: max_cost / timeout / max_tokens, see word_diff
+
+    Returns:
+        Header lines followed by the marked-up text split into lines (empty
+        list if both texts are empty or identical)
+    """
+    if text1 == text2 or (not text1 and not text2):
+        return []
+
+    parts = []
+    for operation, text in word_diff(text1, text2, **limits):
+        if operation == 'equal':
+            parts.append(text)
+        elif operation == 'delete':
+            parts.append(f"[-{text}-]")
+        else:
+            parts.append(f"{{+{text}+}}")
+
+    return ['--- Original', '+++ Modified'] + ''.join(parts).splitlines()
+
+
+def _diff_range(a: List[int], b: List[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int, state: _DiffState):
+    """Append opcodes for a[a_lo:a_hi] vs b[b_lo:b_hi]"""
+    # Common prefix and suffix never need the expensive algorithms
+    prefix_start = a_lo
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        a_lo += 1
+        b_lo += 1
+    if a_lo > prefix_start:
+        state.ops.append(('equal', prefix_start, a_lo, b_lo - (a_lo - prefix_start), b_lo))
+
+    suffix_length = 0
+    while a_hi - suffix_length > a_lo and b_hi - suffix_length > b_lo \
+            and a[a_hi - suffix_length - 1] == b[b_hi - suffix_length - 1]:
+        suffix_length += 1
+    a_mid, b_mid = a_hi - suffix_length, b_hi - suffix_length
+
+    if a_lo == a_mid or b_lo == b_mid:
+        if a_lo < a_mid or b_lo < b_mid:
+            state.ops.append(('delete' if b_lo == b_mid else 'insert', a_lo, a_mid, b_lo, b_mid))
+    else:
+        anchors = _unique_anchors(a, b, a_lo, a_mid, b_lo, b_mid)
+        if anchors:
+            # Tokens unique on both sides and in the same order split the problem
+            for anchor_a, anchor_b in anchors:
+                _diff_range(a, b, a_lo, anchor_a, b_lo, anchor_b, state)
+                state.ops.append(('equal', anchor_a, anchor_a + 1, anchor_b, anchor_b + 1))
+                a_lo, b_lo = anchor_a + 1, anchor_b + 1
+            _diff_range(a, b, a_lo, a_mid, b_lo, b_mid, state)
+        else:
+            _myers(a, b, a_lo, a_mid, b_lo, b_mid, state)
+
+    if suffix_length:
+        state.ops.append(('equal', a_mid, a_hi, b_mid, b_hi))
+
+
+def _unique_anchors(a: List[int], b: List[int], a_lo: int, a_hi: int,
+                    b_lo: int, b_hi: int) -> List[Tuple[int, int]]:
+    """Longest increasing run of tokens that occur exactly once in each range (patience diff)"""
+    counts = {}
+    for i in range(a_lo, a_hi):
+        entry = counts.get(a[i])
+        counts[a[i]] = [i, -1, 1, 0] if entry is None else [entry[0], -1, entry[2] + 1, 0]
+    for j in range(b_lo, b_hi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] = j
+            entry[3] += 1
+
+    pairs = [(entry[0], entry[1]) for entry in counts.values() if entry[2] == 1 and entry[3] == 1]
+    if not pairs:
+        return []
+    pairs.sort()
+
+    # Patience sorting: longest increasing subsequence of the b positions
+    tails = []          # b position ending the best run of each length
+    tail_index = []     # pair index of that tail
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if tails[middle] < j:
+                low = middle + 1
+            else:
+                high = middle
+        if low:
+            previous[index] = tail_index[low - 1]
+        if low == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[low] = j
+            tail_index[low] = index
+
+    anchors = []
+    index = tail_index[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _myers(a: List[int], b: List[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int, state: _DiffState):
+    """Greedy O(ND) shortest edit script; falls back to a replacement when a cutoff is hit"""
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    max_d = min(n + m, state.max_cost)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        if d % 64 == 0 and state.expired():
+            break
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                _backtrack(trace, n, m, d, a_lo, b_lo, state)
+                return
+
+    # Cutoff: report the whole segment as replaced
+    state.complete = False
+    state.ops.append(('replace', a_lo, a_hi, b_lo, b_hi))
+
+
+def _backtrack(trace: List[List[int]], n: int, m: int, d: int, a_lo: int, b_lo: int, state: _DiffState):
+    """Walk the stored V snapshots back from (n, m) and append the edit script"""
+    ops = []
+    x, y = n, m
+    for step in range(d, 0, -1):
+        snapshot = trace[step]          # V after step - 1, indices k + step + 1
+        k = x - y
+        base = step + 1
+        if k == -step or (k != step and snapshot[base + k - 1] < snapshot[base + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = snapshot[base + prev_k]
+        prev_y = prev_x - prev_k
+
+        # Diagonal after the edit
+        start_x = prev_x if prev_k == k + 1 else prev_x + 1
+        if x > start_x:
+            ops.append(('equal', a_lo + start_x, a_lo + x, b_lo + (start_x - k), b_lo + y))
+        if prev_k == k + 1:
+            ops.append(('insert', a_lo + prev_x, a_lo + prev_x, b_lo + prev_y, b_lo + prev_y + 1))
+        else:
+            ops.append(('delete', a_lo + prev_x, a_lo + prev_x + 1, b_lo + prev_y, b_lo + prev_y))
+        x, y = prev_x, prev_y
+
+    if x > 0:
+        ops.append(('equal', a_lo, a_lo + x, b_lo, b_lo + y))
+
+    ops.reverse()
+    state.ops.extend(ops)
+
+
+def _merge_opcodes(ops: List[Opcode]) -> List[Opcode]:
+    """Join adjacent opcodes of the same kind and pair deletes with inserts into replaces"""
+    merged = []
+    for tag, i1, i2, j1, j2 in ops:
+        if i1 == i2 and j1 == j2:
+            continue
+        if merged:
+            last_tag, li1, li2, lj1, lj2 = merged[-1]
+            if tag == 'equal' and last_tag == 'equal':
+                merged[-1] = ('equal', li1, i2, lj1, j2)
+                continue
+            if tag != 'equal' and last_tag != 'equal':
+                new_i1, new_j1 = li1, lj1
+                new_i2, new_j2 = i2, j2
+                if new_i1 == new_i2:
+                    new_tag = 'insert'
+                elif new_j1 == new_j2:
+                    new_tag = 'delete'
+                else:
+                    new_tag = 'replace'
+                merged[-1] = (new_tag, new_i1, new_i2, new_j1, new_j2)
+                continue
+        merged.append((tag, i1, i2, j1, j2))
+    return merged
+
+
+# Example usage
+if __name__ == "__main__":
+    old = "The system shall report a brake fault within 100 ms."
+    new = "The system shall report any brake or sensor fault within 50 ms."
+    for line in word_diff_lines(old, new):
+        print(line)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Three-Way Comparator Module
+Compares a base baseline with two independently edited copies ("ours" and
+"theirs") in a single join of the three ID maps, classifies every requirement
+and attribute, detects conflicts and builds a merge plan that
+ReqIFWriter.write_merge can emit.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections.abc import Mapping
+
+from reqif_comparator import ReqIFComparator
+from reqif_parser import ReqIFParser
+
+
+# Requirement and attribute statuses
+UNCHANGED = 'unchanged'
+OURS_ONLY = 'ours_only'
+THEIRS_ONLY = 'theirs_only'
+BOTH_SAME = 'both_same'
+MERGED = 'merged'
+CONFLICT = 'conflict'
+
+STATUSES = (UNCHANGED, OURS_ONLY, THEIRS_ONLY, BOTH_SAME, MERGED, CONFLICT)
+
+# Sentinel for an attribute or requirement that does not exist on one side
+_MISSING = object()
+
+
+def classify_values(base: Any, ours: Any, theirs: Any) -> str:
+    """Classify one attribute from its base, ours and theirs values (_MISSING when absent)"""
+    ours_changed = ours != base
+    theirs_changed = theirs != base
+    if not ours_changed and not theirs_changed:
+        return UNCHANGED
+    if not theirs_changed:
+        return OURS_ONLY
+    if not ours_changed:
+        return THEIRS_ONLY
+    return BOTH_SAME if ours == theirs else CONFLICT
+
+
+class ThreeWayComparator:
+    """
+    One-pass three-way comparison of base, ours and theirs requirement sets
+
+    Requirement digests decide the common cases (nothing changed, only one
+    side changed, both made the same change) without touching attributes.
+    Only requirements changed differently on both sides are compared per
+    attribute; they become 'merged' when the changed attributes do not
+    overlap and 'conflict' otherwise.
+    """
+
+    def __init__(self, comparator: Optional[ReqIFComparator] = None):
+        self.comparator = comparator or ReqIFComparator()
+
+    def compare_files(self, base_path: str, ours_path: str, theirs_path: str) -> Dict[str, Any]:
+        """
+        Parse and compare three ReqIF files
+
+        Args:
+            base_path: Common ancestor baseline
+            ours_path: Our edited copy
+            theirs_path: Their edited copy
+
+        Returns:
+            Same as compare_requirements
+        """
+        return self.compare_requirements(ReqIFParser().parse_file(base_path),
+                                         ReqIFParser().parse_file(ours_path),
+                                         ReqIFParser().parse_file(theirs_path))
+
+    def compare_requirements(self, base_reqs: List[Dict[str, Any]], ours_reqs: List[Dict[str, Any]],
+                             theirs_reqs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Classify every requirement of the three sets
+
+        Args:
+            base_reqs: Requirements of the common ancestor
+            ours_reqs: Requirements of our copy
+            theirs_reqs: Requirements of their copy
+
+        Returns:
+            Dictionary with one entry list per status (ours_only, theirs_only,
+            both_same, merged, conflict), 'unchanged' as a list of IDs,
+            'merge_plan' and 'statistics'. Each entry has 'id', 'status',
+            'change' (added/deleted/modified), 'attributes' (name -> status of
+            every changed attribute), 'conflicts' and the base/ours/theirs
+            requirements (None where absent).
+        """
+        base = self._index(base_reqs)
+        ours = self._index(ours_reqs)
+        theirs = self._index(theirs_reqs)
+
+        results = {status: [] for status in STATUSES}
+        merge_plan = {
+            'take_theirs': [],          # IDs written from theirs as a whole
+            'drop': [],                 # IDs in ours that the merge removes
+            'merge_attributes': {},     # ID -> attributes to take from theirs
+            'conflicts': {}             # ID -> conflicting attributes (or '*' for add/delete conflicts)
+        }
+        conflict_attributes = {}
+
+        # Base order first, then additions of ours and theirs
+        all_ids = list(base)
+        all_ids.extend(req_id for req_id in ours if req_id not in base)
+        all_ids.extend(req_id for req_id in theirs if req_id not in base and req_id not in ours)
+
+        for req_id in all_ids:
+            base_req = base.get(req_id)
+            ours_req = ours.get(req_id)
+            theirs_req = theirs.get(req_id)
+
+            try:
+                status, change, attributes = self._classify_requirement(base_req, ours_req, theirs_req)
+            except Exception as e:
+                print(f"Error classifying requirement {req_id}: {e}")
+                status, change, attributes = CONFLICT, 'modified', {}
+
+            if status == UNCHANGED:
+                results[UNCHANGED].append(req_id)
+                continue
+
+            conflicts = sorted(name for name, attr_status in attributes.items() if attr_status == CONFLICT)
+            if status == CONFLICT:
+                merge_plan['conflicts'][req_id] = conflicts or ['*']
+                for name in conflicts or ['*']:
+                    conflict_attributes[name] = conflict_attributes.get(name, 0) + 1
+            elif status == THEIRS_ONLY:
+                if theirs_req is None:
+                    merge_plan['drop'].append(req_id)
+                else:
+                    merge_plan['take_theirs'].append(req_id)
+            elif status == MERGED:
+                merge_plan['merge_attributes'][req_id] = sorted(
+                    name for name, attr_status in attributes.items() if attr_status == THEIRS_ONLY)
+
+            results[status].append({
+                'id': req_id,
+                'status': status,
+                'change': change,
+                'attributes': attributes,
+                'conflicts': conflicts,
+                'base': base_req,
+                'ours': ours_req,
+                'theirs': theirs_req
+            })
+
+        results['merge_plan'] = merge_plan
+        results['statistics'] = self._build_statistics(len(base), len(ours), len(theirs), results,
+                                                       conflict_attributes)
+
+        print("Three-way comparison: " +
+              ", ".join(f"{status}={results['statistics'][f'{status}_count']}" for status in STATUSES))
+        return results
+
+    def _index(self, requirements: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """ID -> requirement map, skipping invalid entries"""
+        return {req['id']: req for req in requirements or [] if isinstance(req, Mapping) and req.get('id')}
+
+    def _classify_requirement(self, base_req: Optional[Dict[str, Any]], ours_req: Optional[Dict[str, Any]],
+                              theirs_req: Optional[Dict[str, Any]]) -> Tuple[str, str, Dict[str, str]]:
+        """Return (status, change kind, changed attribute statuses) for one requirement"""
+        digest = self.comparator.get_requirement_digest
+        base_digest = digest(base_req) if base_req is not None else _MISSING
+        ours_digest = digest(ours_req) if ours_req is not None else _MISSING
+        theirs_digest = digest(theirs_req) if theirs_req is not None else _MISSING
+
+        status = classify_values(base_digest, ours_digest, theirs_digest)
+
+        if base_req is None:
+            change = 'added'
+        elif ours_req is None or theirs_req is None:
+            change = 'deleted'
+        else:
+            change = 'modified'
+
+        if status == UNCHANGED:
+            return status, change, {}
+
+        if status != CONFLICT:
+            # One side (or both, identically) changed: report the attributes it touched
+            changed_req = ours_req if status in (OURS_ONLY, BOTH_SAME) else theirs_req
+            attributes = {}
+            if base_req is not None and changed_req is not None:
+                for name, (old, new) in self._field_pairs(base_req, changed_req):
+                    if old != new:
+                        attributes[name] = status
+            return status, change, attributes
+
+        # Added on both sides differently, or deleted on one side and modified on the other
+        if base_req is None or ours_req is None or theirs_req is None:
+            return CONFLICT, change, {}
+
+        # Both sides modified differently: decide per attribute
+        base_values = self._field_values(base_req)
+        ours_values = self._field_values(ours_req)
+        theirs_values = self._field_values(theirs_req)
+
+        attributes = {}
+        for name in {**base_values, **ours_values, **theirs_values}:
+            attr_status = classify_values(base_values.get(name, _MISSING), ours_values.get(name, _MISSING),
+                                          theirs_values.get(name, _MISSING))
+            if attr_status != UNCHANGED:
+                attributes[name] = attr_status
+
+        # Top-level fields cannot be merged attribute-wise by the writer
+        for name, attr_status in attributes.items():
+            if attr_status == THEIRS_ONLY and not name.startswith('attribute.'):
+                attributes[name] = CONFLICT
+
+        if any(attr_status == CONFLICT for attr_status in attributes.values()):
+            return CONFLICT, change, attributes
+        return MERGED, change, attributes
+
+    def _field_values(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """Comparable values of a requirement (after the comparison rules) keyed like ReqIFComparator fields"""
+        fields, attributes = self.comparator.comparable_values(req)
+        values = {field: value for field, value in fields if field != 'id'}
+        for name, value in attributes:
+            values[f'attribute.{name}'] = value
+        return values
+
+    def _field_pairs(self, old_req: Dict[str, Any], new_req: Dict[str, Any]):
+        """Yield (field, (old value, new value)) over the union of both requirements' fields"""
+        old_values = self._field_values(old_req)
+        new_values = self._field_values(new_req)
+        for name in {**old_values, **new_values}:
+            yield name, (old_values.get(name, _MISSING), new_values.get(name, _MISSING))
+
+    def _build_statistics(self, total_base: int, total_ours: int, total_theirs: int,
+                          results: Dict[str, Any], conflict_attributes: Dict[str, int]) -> Dict[str, Any]:
+        """Counts per status plus the attributes that conflict most often"""
+        stats = {
+            'total_base': total_base,
+            'total_ours': total_ours,
+            'total_theirs': total_theirs
+        }
+        for status in STATUSES:
+            stats[f'{status}_count'] = len(results[status])
+
+        total = sum(stats[f'{status}_count'] for status in STATUSES)
+        stats['conflict_percentage'] = round(stats['conflict_count'] / max(total, 1) * 100, 2)
+        stats['conflict_attributes'] = dict(sorted(conflict_attributes.items(),
+                                                   key=lambda item: (-item[1], item[0])))
+        return stats
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Three-Way Comparator - base/ours/theirs comparison with conflict detection")
+
+    # results = ThreeWayComparator().compare_files("base.reqif", "ours.reqif", "theirs.reqif")
+    # print(results['statistics'])
+    # ReqIFWriter("ours.reqif").write_merge("merged.reqifz", results['merge_plan'], "theirs.reqif")
@@ -160,6 +160,8 @@ class ThreadingConfig:
         self.thread_timeout = 300  # 5 minutes timeout per thread
         self.fallback_to_sequential = True  # Auto-fallback on threading issues
         self.memory_limit_mb = 1024  # Memory limit per thread
+        self.compare_processes = max(1, cpu_count)  # Worker processes for partitioned comparison
+        self.partition_min_requirements = 100000  # Below this, compare in-process
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ThreadingConfig':
@@ -180,7 +182,9 @@ class ThreadingConfig:
             'max_files_per_thread': self.max_files_per_thread,
             'thread_timeout': self.thread_timeout,
             'fallback_to_sequential': self.fallback_to_sequential,
-            'memory_limit_mb': self.memory_limit_mb
+            'memory_limit_mb': self.memory_limit_mb,
+            'compare_processes': self.compare_processes,
+            'partition_min_requirements': self.partition_min_requirements
         }
 
 
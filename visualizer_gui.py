@@ -8,8 +8,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import csv
 import os
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Set
 
+from reqif_similarity import SimilarityIndex
+
 
 class VisualizerGUI:
     """
@@ -35,6 +38,13 @@ class VisualizerGUI:
         self.search_var = tk.StringVar()
         self.search_var.trace_add("write", self._on_search_change)
         
+        # Similarity index for "Find Similar", built on first use
+        self.similarity_index = None
+        
+        # Column sort state (None = file order)
+        self.sort_column = None
+        self.sort_reverse = False
+        
         # Dynamic field detection
         self.available_fields = self._detect_available_fields()
         self.visible_columns = self._determine_optimal_columns()
@@ -62,7 +72,7 @@ class VisualizerGUI:
             if isinstance(req, dict):
                 # Add main fields (excluding internal ones)
                 for field_name in req.keys():
-                    if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes']:
+                    if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes', 'typed_attributes']:
                         available_fields.add(field_name)
                 
                 # Add attribute fields with prefix
@@ -218,6 +228,10 @@ class VisualizerGUI:
                  font=('Arial', 11, 'bold'), relief='raised', bd=2,
                  padx=20, pady=6, cursor='hand2', bg='lightyellow').pack(side=tk.LEFT, padx=(0, 15))
         
+        tk.Button(left_buttons, text="🧬 Find Similar", command=self._find_similar,
+                 font=('Arial', 11, 'bold'), relief='raised', bd=2,
+                 padx=20, pady=6, cursor='hand2', bg='lavender').pack(side=tk.LEFT, padx=(0, 15))
+        
         tk.Button(left_buttons, text="📄 Export CSV", command=self._export_csv,
                  font=('Arial', 11, 'bold'), relief='raised', bd=2,
                  padx=20, pady=6, cursor='hand2', bg='lightgreen').pack(side=tk.LEFT, padx=(0, 15))
@@ -301,13 +315,15 @@ class VisualizerGUI:
         
         # Configure tree column
         tree_display_name = self._format_field_name(tree_column)
-        self.tree.heading('#0', text=tree_display_name, anchor=tk.W)
+        self.tree.heading('#0', text=tree_display_name, anchor=tk.W,
+                          command=lambda c=tree_column: self._sort_by_column(c))
         self.tree.column('#0', width=120, minwidth=80)
         
         # Configure other columns
         for col in other_columns:
             display_name = self._format_field_name(col)
-            self.tree.heading(col, text=display_name, anchor=tk.W)
+            self.tree.heading(col, text=display_name, anchor=tk.W,
+                              command=lambda c=col: self._sort_by_column(c))
             
             # Set column width based on field type and content
             if col.startswith('attr_'):
@@ -390,6 +406,52 @@ class VisualizerGUI:
             print(f"Error getting field value for {field_name}: {e}")
             return ''
     
+    def _sort_by_column(self, column: str):
+        """Sort displayed requirements by column, toggling direction on repeated clicks"""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        
+        self._apply_sort()
+        self._insert_requirements_data()
+        
+        direction = "descending" if self.sort_reverse else "ascending"
+        self.status_label.configure(text=f"Sorted by {self._format_field_name(column)} ({direction})", fg='darkgreen')
+    
+    def _apply_sort(self):
+        """Apply current sort to filtered requirements using native typed values where available"""
+        if not self.sort_column:
+            return
+        
+        column = self.sort_column
+        keyed = [(self._get_sort_key(req, column), req) for req in self.filtered_requirements]
+        
+        # Empty values always go last, regardless of direction
+        filled = [item for item in keyed if item[0] is not None]
+        empty = [item[1] for item in keyed if item[0] is None]
+        filled.sort(key=lambda item: item[0], reverse=self.sort_reverse)
+        
+        self.filtered_requirements = [item[1] for item in filled] + empty
+    
+    def _get_sort_key(self, req: Dict[str, Any], field_name: str):
+        """Build a sort key: typed numbers, then dates, then strings (None for empty values)"""
+        if field_name.startswith('attr_'):
+            attr_name = field_name[5:]
+            typed_attributes = req.get('typed_attributes')
+            if typed_attributes and attr_name in typed_attributes:
+                typed_value = typed_attributes[attr_name]
+                if isinstance(typed_value, datetime):
+                    return (1, typed_value.timestamp(), '')
+                # bool sorts as 0/1 alongside other numbers
+                return (0, float(typed_value), '')
+        
+        value = self._get_field_value(req, field_name).strip()
+        if not value:
+            return None
+        return (2, 0.0, value.lower())
+    
     def _calculate_statistics(self):
         """Calculate statistics about the requirements with dynamic field detection"""
         if not self.requirements:
@@ -499,6 +561,9 @@ class VisualizerGUI:
                 if search_text in searchable_text:
                     self.filtered_requirements.append(req)
         
+        # Keep the active column sort
+        self._apply_sort()
+        
         # Update display
         self._insert_requirements_data()
         self._update_filter_info()
@@ -526,6 +591,7 @@ class VisualizerGUI:
         # Recalculate optimal columns in case data changed
         self.visible_columns = self._determine_optimal_columns()
         self.stats = self._calculate_statistics()
+        self.similarity_index = None
         self.populate_data()
         self.status_label.configure(text="View refreshed", fg='darkgreen')
     
@@ -850,7 +916,7 @@ class VisualizerGUI:
                 if isinstance(req, dict):
                     # Add main fields
                     for field_name in req.keys():
-                        if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes']:
+                        if not field_name.startswith('_') and field_name not in ['content', 'raw_attributes', 'typed_attributes']:
                             all_fields.add(field_name)
                     
                     # Add attribute fields
@@ -899,62 +965,140 @@ class VisualizerGUI:
         else:
             self.selection_label.configure(text=f"{selected_count} requirements selected")
     
+    def _get_requirement_for_item(self, item_id) -> Optional[Dict[str, Any]]:
+        """Resolve a treeview item to its requirement via the req_<index> tag"""
+        tags = self.tree.item(item_id, 'tags')
+        for tag in tags:
+            if tag.startswith('req_'):
+                req_index = int(tag[4:])
+                if req_index < len(self.filtered_requirements):
+                    return self.filtered_requirements[req_index]
+        return None
+    
     def _show_requirement_details(self, item_id):
         """Show detailed requirement information with dynamic fields"""
         try:
-            # Get requirement index from tags
-            tags = self.tree.item(item_id, 'tags')
-            req_index = None
-            for tag in tags:
-                if tag.startswith('req_'):
-                    req_index = int(tag[4:])
-                    break
-            
-            if req_index is None or req_index >= len(self.filtered_requirements):
+            req = self._get_requirement_for_item(item_id)
+            if req is None:
                 messagebox.showerror("Error", "Could not find requirement data.")
                 return
             
-            # Get requirement data
-            req = self.filtered_requirements[req_index]
-            req_text = self.tree.item(item_id, 'text')
-            
-            # Create details window
-            details_window = tk.Toplevel(self.window)
-            details_window.title(f"Requirement Details - {req_text}")
-            details_window.geometry("750x650")
-            details_window.transient(self.window)
-            
-            main_frame = tk.Frame(details_window, padx=25, pady=25)
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Title - use best available display text
-            display_text = self._get_requirement_display_text(req)
-            tk.Label(main_frame, text=f"Requirement: {display_text}", 
-                    font=('Arial', 16, 'bold')).pack(anchor=tk.W, pady=(0, 20))
+            self._open_details_window(req, self.tree.item(item_id, 'text'))
             
-            # Details in scrollable text
-            text_frame = tk.Frame(main_frame)
-            text_frame.pack(fill=tk.BOTH, expand=True)
-            
-            details_text = tk.Text(text_frame, wrap=tk.WORD, font=('Arial', 11))
-            details_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            
-            scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=details_text.yview)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            details_text.configure(yscrollcommand=scrollbar.set)
-            
-            # Populate details with dynamic fields
-            self._populate_requirement_details(details_text, req)
+        except Exception as e:
+            messagebox.showerror("Details Error", f"Failed to show requirement details:\n{str(e)}")
+    
+    def _open_details_window(self, req: Dict[str, Any], req_text: str):
+        """Open a details window for a requirement"""
+        # Create details window
+        details_window = tk.Toplevel(self.window)
+        details_window.title(f"Requirement Details - {req_text}")
+        details_window.geometry("750x650")
+        details_window.transient(self.window)
+        
+        main_frame = tk.Frame(details_window, padx=25, pady=25)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title - use best available display text
+        display_text = self._get_requirement_display_text(req)
+        tk.Label(main_frame, text=f"Requirement: {display_text}", 
+                font=('Arial', 16, 'bold')).pack(anchor=tk.W, pady=(0, 20))
+        
+        # Details in scrollable text
+        text_frame = tk.Frame(main_frame)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        
+        details_text = tk.Text(text_frame, wrap=tk.WORD, font=('Arial', 11))
+        details_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=details_text.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        details_text.configure(yscrollcommand=scrollbar.set)
+        
+        # Populate details with dynamic fields
+        self._populate_requirement_details(details_text, req)
+        
+        details_text.configure(state=tk.DISABLED)
+        
+        # Close button
+        tk.Button(main_frame, text="Close", command=details_window.destroy,
+                 font=('Arial', 11), relief='raised', bd=2, padx=20, pady=6,
+                 cursor='hand2').pack(pady=(20, 0))
+    
+    def _find_similar(self):
+        """Show requirements most similar to the selected one (possible duplicates)"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showinfo("Find Similar", "Please select a requirement first.")
+            return
+        
+        try:
+            req = self._get_requirement_for_item(selection[0])
+            if req is None:
+                messagebox.showerror("Error", "Could not find requirement data.")
+                return
             
-            details_text.configure(state=tk.DISABLED)
+            # Index is built once over the full requirement set and reused
+            if self.similarity_index is None:
+                self.status_label.configure(text=f"Indexing {len(self.requirements)} requirements...", fg='blue')
+                self.window.update_idletasks()
+                self.similarity_index = SimilarityIndex(self.requirements)
             
-            # Close button
-            tk.Button(main_frame, text="Close", command=details_window.destroy,
-                     font=('Arial', 11), relief='raised', bd=2, padx=20, pady=6,
-                     cursor='hand2').pack(pady=(20, 0))
+            results = self.similarity_index.query(req, top_k=25, threshold=0.3)
+            self.status_label.configure(text=f"Found {len(results)} similar requirements", fg='darkgreen')
+            self._show_similar_results(req, results)
             
         except Exception as e:
-            messagebox.showerror("Details Error", f"Failed to show requirement details:\n{str(e)}")
+            messagebox.showerror("Find Similar Error", f"Failed to find similar requirements:\n{str(e)}")
+    
+    def _show_similar_results(self, req: Dict[str, Any], results: List):
+        """Display similarity query results in a separate window"""
+        results_window = tk.Toplevel(self.window)
+        results_window.title(f"Similar Requirements - {req.get('id', 'Unknown')}")
+        results_window.geometry("850x500")
+        results_window.transient(self.window)
+        
+        main_frame = tk.Frame(results_window, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(main_frame, text=f"Similar to: {self._get_requirement_display_text(req)}",
+                font=('Arial', 14, 'bold')).pack(anchor=tk.W, pady=(0, 15))
+        
+        if not results:
+            tk.Label(main_frame, text="No similar requirements found.",
+                    font=('Arial', 11)).pack(anchor=tk.W)
+        
+        tree_frame = tk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        results_tree = ttk.Treeview(tree_frame, columns=['similarity', 'preview'], show='tree headings')
+        results_tree.heading('#0', text='ID', anchor=tk.W)
+        results_tree.heading('similarity', text='Similarity', anchor=tk.W)
+        results_tree.heading('preview', text='Content', anchor=tk.W)
+        results_tree.column('#0', width=150, minwidth=80)
+        results_tree.column('similarity', width=90, minwidth=60)
+        results_tree.column('preview', width=550, minwidth=200)
+        results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=results_tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        results_tree.configure(yscrollcommand=scrollbar.set)
+        
+        for similar_req, score in results:
+            results_tree.insert('', 'end', text=similar_req.get('id', ''),
+                                values=[f"{score:.0%}", self._get_requirement_display_text(similar_req)])
+        
+        def open_selected(event):
+            selected = results_tree.selection()
+            if selected:
+                similar_req = results[results_tree.index(selected[0])][0]
+                self._open_details_window(similar_req, similar_req.get('id', 'Unknown'))
+        
+        results_tree.bind('<Double-1>', open_selected)
+        
+        tk.Button(main_frame, text="Close", command=results_window.destroy,
+                 font=('Arial', 11), relief='raised', bd=2, padx=20, pady=6,
+                 cursor='hand2').pack(pady=(15, 0))
     
     def _get_requirement_display_text(self, req: Dict[str, Any]) -> str:
         """Get best display text for requirement using dynamic fields"""
@@ -1000,7 +1144,7 @@ class VisualizerGUI:
                 return
             
             # Display regular fields (excluding internal ones)
-            excluded_fields = {'attributes', 'raw_attributes', 'content'}
+            excluded_fields = {'attributes', 'raw_attributes', 'typed_attributes', 'content'}
             regular_fields = []
             
             for field_name, field_value in requirement.items():